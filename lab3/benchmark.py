@@ -0,0 +1,979 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import io
+import multiprocessing
+import os
+import random
+import resource
+import shlex
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import server
+from managers.student_manager import StudentManager
+import models.student
+from models.student import Student
+from models.student_table import StudentTable
+from utils.group_store import GroupStore, format_student_line, parse_student_line
+from utils.journal import Journal
+from utils.columnar import ColumnarGroup, ColumnarGroupStore, text_to_columnar
+from utils import analytics, reorganize
+from utils.metrics import Metrics, metrics
+from utils.group_cache import GroupCache, group_cache
+
+FIRST_NAMES = ["John", "Sarah", "James", "Ava", "Mia", "Ethan", "Harper", "Alexander",
+               "Aiden", "Scarlett", "Matthew", "Zoe", "Emma", "David", "Olivia", "Noah"]
+LAST_NAMES = ["Smith", "Brown", "Martinez", "Walker", "Allen", "Scott", "Baker", "Carter",
+              "Roberts", "Campbell", "Edwards", "Sanchez", "Davis", "Johnson", "Hall", "King"]
+
+
+def student_name(index):
+    """Build a unique, letters-only student name for index."""
+    suffix = ''
+    while True:
+        index, letter = divmod(index, 26)
+        suffix += chr(ord('a') + letter)
+        if not index:
+            break
+    return f"{FIRST_NAMES[len(suffix) % len(FIRST_NAMES)]} {LAST_NAMES[len(suffix) % len(LAST_NAMES)]}{suffix}"
+
+def write_group(directory, group_name, size, seed=0, name_offset=0):
+    """
+    Write a group file with size generated students.
+
+    Names are student_name(name_offset + 1) onwards, so groups written
+    with different name_offset share only part of their names.
+
+    Returns:
+        str: Path to the group file
+    """
+    rng = random.Random(seed)
+    path = os.path.join(directory, f"{group_name}.txt")
+    with open(path, 'w') as file:
+        file.write(f"Students\nGroup: {group_name}\n\n")
+        file.writelines(format_student_line(index, float(rng.randint(0, 100)), student_name(name_offset + index))
+                        for index in range(1, size + 1))
+    return path
+
+def time_call(func, *args, **kwargs):
+    """
+    Call func once and measure its wall-clock time.
+
+    Returns:
+        tuple: (result, seconds)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def benchmark_store(sizes, operations):
+    """
+    Time GroupStore operations on groups of different sizes.
+
+    Args:
+        sizes (list): Number of students in the group
+        operations (int): Number of adds, duplicate checks and deletes to time
+    """
+    print("GroupStore benchmark (microseconds per operation)")
+    print("-" * 50)
+    print(f"{'Students':>10} {'Load, s':>8} {'Add':>8} {'Check':>8} {'Delete':>8}")
+
+    directory = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            path = write_group(directory, "bench", size)
+            store, load_time = time_call(GroupStore, path)
+
+            start = time.perf_counter()
+            for index in range(operations):
+                store.add(student_name(size + 1 + index), 50.0)
+            add_time = (time.perf_counter() - start) / operations
+
+            start = time.perf_counter()
+            for index in range(operations):
+                store.has_name(student_name(index * 7 % size + 1))
+            check_time = (time.perf_counter() - start) / operations
+
+            deletes = max(operations // 100, 1)
+            start = time.perf_counter()
+            for index in range(deletes):
+                store.delete(str(index + 1))
+            delete_time = (time.perf_counter() - start) / deletes
+
+            print(f"{size:>10} {load_time:>8.3f} {add_time * 1e6:>8.1f} "
+                  f"{check_time * 1e6:>8.1f} {delete_time * 1e6:>8.1f}")
+    finally:
+        shutil.rmtree(directory)
+
+def benchmark_columnar(sizes):
+    """
+    Compare the text and columnar formats on loading and sorting a group.
+
+    Args:
+        sizes (list): Number of students in the group
+    """
+    print("Columnar format benchmark (seconds)")
+    print("-" * 50)
+    print(f"{'Students':>10} {'Text load':>10} {'Col. load':>10} {'Map+sort':>10} {'Size ratio':>10}")
+
+    directory = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            text_path = write_group(directory, "bench", size)
+            columnar_path = text_to_columnar(text_path)
+
+            _, text_time = time_call(GroupStore, text_path)
+            _, columnar_time = time_call(ColumnarGroupStore, columnar_path)
+
+            start = time.perf_counter()
+            with ColumnarGroup(columnar_path) as group:
+                group.order_by_gpa()
+            sort_time = time.perf_counter() - start
+
+            ratio = os.path.getsize(columnar_path) / os.path.getsize(text_path)
+            print(f"{size:>10} {text_time:>10.3f} {columnar_time:>10.3f} "
+                  f"{sort_time:>10.3f} {ratio:>10.2f}")
+    finally:
+        shutil.rmtree(directory)
+
+def benchmark_sqlite(sizes, operations):
+    """
+    Compare the text and SQLite backends through the StudentManager API.
+
+    Setup is the first load of the group for text storage and the import of
+    the .txt file for SQLite storage. Add, check and delete are averaged
+    over operations calls; search and sort are single calls.
+
+    Args:
+        sizes (list): Number of students in the group
+        operations (int): Number of adds, duplicate checks and deletes to time
+    """
+    print("SQLite backend benchmark (add/check/delete in microseconds, rest in seconds)")
+    print("-" * 80)
+    print(f"{'Students':>10} {'Backend':>8} {'Setup':>8} {'Add':>8} {'Check':>8} "
+          f"{'Delete':>8} {'Search':>8} {'Sort':>8}")
+
+    for size in sizes:
+        for storage in ('text', 'sqlite'):
+            directory = tempfile.mkdtemp()
+            try:
+                write_group(directory, "bench", size)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    manager = StudentManager(directory, fast_start=True, storage=storage)
+                    file_manager = manager.file_manager
+                    file_manager.group_store("bench")
+                    setup_time = time.perf_counter() - start
+
+                    start = time.perf_counter()
+                    for index in range(operations):
+                        manager.add_student("bench", student_name(size + 1 + index), 50.0)
+                    add_time = (time.perf_counter() - start) / operations
+
+                    start = time.perf_counter()
+                    for index in range(operations):
+                        file_manager.has_duplicate_name("bench", student_name(index * 7 % size + 1))
+                    check_time = (time.perf_counter() - start) / operations
+
+                    deletes = max(operations // 100, 1)
+                    start = time.perf_counter()
+                    for index in range(deletes):
+                        manager.delete_student("bench", student_name(index * 13 % size + 1))
+                    delete_time = (time.perf_counter() - start) / deletes
+
+                    _, search_time = time_call(file_manager.search_in_file, "bench", "smith")
+                    _, sort_time = time_call(file_manager.sort_by_gpa, "bench")
+            finally:
+                shutil.rmtree(directory)
+
+            print(f"{size:>10} {storage:>8} {setup_time:>8.3f} {add_time * 1e6:>8.1f} "
+                  f"{check_time * 1e6:>8.1f} {delete_time * 1e6:>8.1f} "
+                  f"{search_time:>8.3f} {sort_time:>8.3f}")
+
+def benchmark_ranking(sizes, operations):
+    """
+    Time ranked queries on the maintained GPA index against sorting per query.
+
+    Every round adds one student and then asks for the top 10 and the
+    median, which is what an interactive ranked view does.
+
+    Args:
+        sizes (list): Number of students in the group
+        operations (int): Number of add + query rounds
+    """
+    print("GPA ranking benchmark (microseconds per add + top 10 + median)")
+    print("-" * 50)
+    print(f"{'Students':>10} {'Build, s':>10} {'Re-sort':>12} {'Index':>10}")
+
+    directory = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            store = GroupStore(write_group(directory, "bench", size))
+            _, build_time = time_call(store.top, 10)
+
+            rounds = max(operations // 100, 1)
+            start = time.perf_counter()
+            for index in range(rounds):
+                store.students[size + 1 + index] = (student_name(size + 1 + index), float(index % 101))
+                ranked = sorted(store.students.values(), key=lambda student: student[1], reverse=True)
+                top, median = ranked[:10], ranked[len(ranked) // 2]
+            resort_time = (time.perf_counter() - start) / rounds
+            store.load()
+            store.top(10)
+
+            start = time.perf_counter()
+            for index in range(operations):
+                store.add(student_name(size + 1 + index), float(index % 101))
+                store.top(10), store.percentile(50)
+            index_time = (time.perf_counter() - start) / operations
+
+            print(f"{size:>10} {build_time:>10.3f} {resort_time * 1e6:>12.1f} {index_time * 1e6:>10.1f}")
+    finally:
+        shutil.rmtree(directory)
+
+def benchmark_search(sizes, operations):
+    """
+    Compare name searches through the trigram index with the linear scan.
+
+    The scan is what search_in_file did before the index: lowercase every
+    line and test the pattern. Patterns are the name suffixes that make
+    generated names unique, so every query has a few matches.
+
+    Args:
+        sizes (list): Number of students in the group
+        operations (int): Number of searches to time per size
+    """
+    print("Name search benchmark (microseconds per search)")
+    print("-" * 50)
+    print(f"{'Students':>10} {'Build, s':>10} {'Scan':>12} {'Index':>10}")
+
+    directory = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            store = GroupStore(write_group(directory, "bench", size))
+            patterns = [student_name(index * 7919 % size).split()[1][-4:] for index in range(operations)]
+            _, build_time = time_call(store.search, "build")
+
+            scans = max(operations // 100, 1)
+            start = time.perf_counter()
+            for pattern in patterns[:scans]:
+                pattern = pattern.lower()
+                [line.strip() for line in store.lines() if pattern in line.lower()]
+            scan_time = (time.perf_counter() - start) / scans
+
+            start = time.perf_counter()
+            for pattern in patterns:
+                store.search(pattern)
+            index_time = (time.perf_counter() - start) / operations
+
+            print(f"{size:>10} {build_time:>10.3f} {scan_time * 1e6:>12.1f} {index_time * 1e6:>10.1f}")
+    finally:
+        shutil.rmtree(directory)
+
+def stress_worker(directory, storage, worker, count):
+    """Add count students from one process: half unique to the worker, half shared by all."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager = StudentManager(directory, fast_start=True, storage=storage)
+        for index in range(count):
+            if index % 2:
+                name = student_name(index // 2)  # Every worker tries these
+            else:
+                name = student_name(10_000_000 + worker * count + index)
+            manager.add_student("stress", name, float(index % 101))
+
+def stored_students(directory, storage):
+    """
+    Read every stored (id, name) entry of the stress group without deduplication.
+
+    For file storage these are the group file rows plus the journaled adds,
+    so an ID written twice shows up twice.
+    """
+    if storage == 'sqlite':
+        with contextlib.redirect_stdout(io.StringIO()):
+            store = StudentManager(directory, fast_start=True, storage=storage).file_manager.group_store("stress")
+        return [(student_id, name) for student_id, name, _ in store.rows()]
+
+    path = os.path.join(directory, "stress.txt")
+    with open(path) as file:
+        entries = [(parsed[0], parsed[2]) for parsed in map(parse_student_line, file) if parsed]
+    records, _ = Journal(f"{path}.wal").replay()
+    entries.extend((record[1], record[2]) for record in records if record[0] == '+')
+    return entries
+
+def benchmark_stress(workers, count, storage):
+    """
+    Let several processes add students to one group at the same time.
+
+    Checks that every ID and every name was stored once and that the
+    number of students matches the unique names attempted.
+
+    Args:
+        workers (int): Number of processes
+        count (int): Students each process tries to add
+        storage (str): 'text' or 'sqlite'
+    """
+    print(f"Stress test: {workers} processes x {count} adds, {storage} storage")
+    print("-" * 50)
+
+    directory = tempfile.mkdtemp()
+    try:
+        if storage == 'sqlite':
+            with contextlib.redirect_stdout(io.StringIO()):
+                StudentManager(directory, fast_start=True, storage=storage).create_group_file("stress")
+        else:
+            write_group(directory, "stress", 0)
+
+        processes = [multiprocessing.Process(target=stress_worker, args=(directory, storage, worker, count))
+                     for worker in range(workers)]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        entries = stored_students(directory, storage)
+        ids = [student_id for student_id, _ in entries]
+        names = [name.lower() for _, name in entries]
+        expected = workers * ((count + 1) // 2) + count // 2
+
+        print(f"{'Stored students:':<22} {len(entries)} (expected {expected})")
+        print(f"{'Duplicate IDs:':<22} {len(ids) - len(set(ids))}")
+        print(f"{'Duplicate names:':<22} {len(names) - len(set(names))}")
+        print(f"{'Throughput:':<22} {workers * count / elapsed:.0f} adds/s")
+        ok = len(entries) == expected and len(set(ids)) == len(ids) and len(set(names)) == len(names)
+        print(f"Result: {'OK' if ok else 'FAILED'}")
+    finally:
+        shutil.rmtree(directory)
+
+async def load_client(host, port, client, requests, groups, size, latencies):
+    """Send requests one at a time over one connection and record each round trip."""
+    reader, writer = await asyncio.open_connection(host, port, limit=2 ** 24)
+    rng = random.Random(client)
+    errors = 0
+    try:
+        for index in range(requests):
+            group = rng.choice(groups)
+            roll = rng.random()
+            if roll < 0.6:
+                request = {'op': 'search', 'group': group, 'pattern': student_name(rng.randrange(size))}
+            elif roll < 0.9:
+                request = {'op': 'add', 'group': group,
+                           'name': student_name(20_000_000 + client * requests + index), 'gpa': index % 101}
+            else:
+                request = {'op': 'delete', 'group': group, 'student': str(rng.randint(1, 1000))}
+            request['id'] = index
+
+            start = time.perf_counter()
+            writer.write(json.dumps(request).encode('utf-8') + b'\n')
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            # A delete of an already deleted ID is expected to fail
+            if not response['ok'] and request['op'] != 'delete':
+                errors += 1
+    finally:
+        writer.close()
+    return errors
+
+async def run_load(host, port, clients, requests, groups, size):
+    latencies = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(load_client(host, port, client, requests, groups, size, latencies)
+                                    for client in range(clients)))
+    return latencies, time.perf_counter() - start, sum(errors)
+
+def wait_for_port(host, port, timeout=10.0):
+    """Poll until something accepts connections on host:port."""
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            time.sleep(0.05)
+
+def benchmark_server(clients, requests, size, storage):
+    """
+    Load-test the JSON-lines server with many concurrent clients.
+
+    The server runs in its own process on a free local port. Every client
+    sends a mix of searches (60%), adds (30%) and deletes (10%) spread over
+    four groups, waiting for each response before sending the next request.
+
+    Args:
+        clients (int): Number of concurrent connections
+        requests (int): Requests sent by each client
+        size (int): Students per group at the start
+        storage (str): 'text' or 'sqlite'
+    """
+    print(f"Server load test: {clients} clients x {requests} requests, {storage} storage")
+    print("-" * 50)
+
+    directory = tempfile.mkdtemp()
+    groups = [f"load{index}" for index in range(4)]
+    for index, group in enumerate(groups):
+        write_group(directory, group, size, seed=index)
+
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    process = multiprocessing.Process(target=server.run, args=(directory, '127.0.0.1', port),
+                                      kwargs={'storage': storage, 'quiet': True})
+    process.start()
+    try:
+        wait_for_port('127.0.0.1', port)
+        latencies, elapsed, errors = asyncio.run(run_load('127.0.0.1', port, clients, requests, groups, size))
+    finally:
+        process.terminate()
+        process.join()
+        shutil.rmtree(directory)
+
+    latencies.sort()
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000
+
+    print(f"{'Requests:':<16} {len(latencies)}")
+    print(f"{'Errors:':<16} {errors}")
+    print(f"{'Throughput:':<16} {len(latencies) / elapsed:.0f} requests/s")
+    print(f"{'p50 latency:':<16} {percentile(0.50):.2f} ms")
+    print(f"{'p99 latency:':<16} {percentile(0.99):.2f} ms")
+    print(f"{'Max latency:':<16} {latencies[-1] * 1000:.2f} ms")
+
+def reorganize_worker(task, directory):
+    """Run one reorganization in a fresh process; returns (seconds, peak RSS in MiB)."""
+    paths = [os.path.join(directory, f"g{index}.txt") for index in range(4)]
+    start = time.perf_counter()
+    if task == 'merge':
+        reorganize.merge_groups(paths[:2], paths[0])
+    elif task == 'split':
+        reorganize.split_group(paths[0], reorganize.by_gpa({os.path.join(directory, "high.txt"): 80.0,
+                                                             os.path.join(directory, "middle.txt"): 50.0}))
+    elif task == 'rebalance':
+        reorganize.rebalance_groups(paths)
+    elif task == 'in-memory merge':
+        target, source = GroupStore(paths[0]), GroupStore(paths[1])
+        target.add_many([(name, gpa) for _, name, gpa in source.rows() if not target.has_name(name)])
+        target.sort_by_gpa()
+        os.remove(paths[1])
+    elapsed = time.perf_counter() - start
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def check_reorganize_errors(directory):
+    """Bad split bounds are reported through the log and leave the group as it was."""
+    write_group(directory, "g0", 10)
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager = StudentManager(directory, fast_start=True)
+        before = list(manager.file_manager.group_store("g0").rows())
+        assert manager.file_manager.split_group("g0", "gpa", {"high": "abc"}) is None
+    assert list(manager.file_manager.group_store("g0").rows()) == before
+    assert not os.path.exists(os.path.join(directory, "high.txt"))
+
+def benchmark_reorganize(sizes):
+    """
+    Time streaming merge, split and rebalance of large group files.
+
+    Every operation runs in a fresh process, so the peak RSS column is the
+    memory that operation needed. 'in-memory merge' loads both groups into
+    GroupStores for comparison. The merged groups share half their names.
+
+    Args:
+        sizes (list): Number of students per group
+    """
+    print("Group reorganization benchmark")
+    print("-" * 50)
+    print(f"{'Students':>10} {'Operation':>16} {'Time, s':>10} {'Peak RSS, MiB':>14}")
+
+    directory = tempfile.mkdtemp()
+    try:
+        check_reorganize_errors(directory)
+    finally:
+        shutil.rmtree(directory)
+
+    context = multiprocessing.get_context('spawn')
+    for size in sizes:
+        for task in ('merge', 'in-memory merge', 'split', 'rebalance'):
+            directory = tempfile.mkdtemp()
+            try:
+                for index in range(4):
+                    write_group(directory, f"g{index}", size // (1 if index < 2 else 4),
+                                seed=index, name_offset=index * size // 2)
+                with context.Pool(1) as pool:
+                    elapsed, peak = pool.apply(reorganize_worker, (task, directory))
+                print(f"{size:>10} {task:>16} {elapsed:>10.2f} {peak:>14.0f}")
+            finally:
+                shutil.rmtree(directory)
+
+def manager_workload(manager, operations):
+    """Add, search and delete students in the bench group; returns the elapsed seconds."""
+    start = time.perf_counter()
+    for index in range(operations):
+        name = student_name(30_000_000 + index)
+        manager.add_student("bench", name, float(index % 101))
+        manager.file_manager.search_in_file("bench", name)
+        manager.delete_student("bench", name)
+    return time.perf_counter() - start
+
+def benchmark_metrics(sizes, operations, prometheus_path=None):
+    """
+    Measure the cost of the metrics layer and show what it records.
+
+    Times an empty decorated function with metrics disabled and enabled,
+    then an add + search + delete workload through StudentManager both
+    ways, and prints the report of the last enabled run.
+
+    Args:
+        sizes (list): Number of students in the group
+        operations (int): Add + search + delete rounds per run
+        prometheus_path (str, optional): Also write the Prometheus text file here
+    """
+    print("Instrumentation overhead benchmark")
+    print("-" * 50)
+
+    registry = Metrics()
+    noop = lambda: None
+    timed_noop = registry.timed("noop")(noop)
+    calls = 200_000
+    _, plain = time_call(lambda: [noop() for _ in range(calls)])
+    _, disabled = time_call(lambda: [timed_noop() for _ in range(calls)])
+    registry.enable()
+    _, enabled = time_call(lambda: [timed_noop() for _ in range(calls)])
+    print(f"{'Decorator, disabled:':<24} {(disabled - plain) / calls * 1e9:>8.0f} ns per call")
+    print(f"{'Decorator, enabled:':<24} {(enabled - plain) / calls * 1e9:>8.0f} ns per call")
+    print()
+    print(f"{'Students':>10} {'Disabled, s':>12} {'Enabled, s':>12} {'Overhead':>10}")
+
+    directory = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            timings = []
+            for enabled in (False, True):
+                write_group(directory, "bench", size)
+                metrics.reset()
+                metrics.enabled = enabled
+                with contextlib.redirect_stdout(io.StringIO()):
+                    manager = StudentManager(directory, fast_start=True)
+                    timings.append(manager_workload(manager, operations))
+            print(f"{size:>10} {timings[0]:>12.3f} {timings[1]:>12.3f} "
+                  f"{(timings[1] / timings[0] - 1) * 100:>9.1f}%")
+    finally:
+        metrics.disable()
+        shutil.rmtree(directory)
+
+    print()
+    print(metrics.report())
+    if prometheus_path:
+        metrics.write_prometheus(prometheus_path)
+        print(f"Prometheus metrics written to {prometheus_path}")
+
+def traced_bytes(build):
+    """Return what build() returns and the bytes it still holds afterwards, measured with tracemalloc."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+def dict_layout(rows):
+    """The layout GroupStore used before StudentTable: a dict of tuples plus a name index."""
+    students, names = {}, {}
+    for student_id, name, gpa in rows:
+        students[student_id] = (name, gpa)
+        names.setdefault(name.lower(), []).append(student_id)
+    return students, names
+
+def benchmark_memory(sizes):
+    """
+    Compare bytes per student of the group layouts.
+
+    'dict + index' is the dict of (name, gpa) tuples with a lowercase name
+    index that GroupStore kept before; 'Student objects' is a list of
+    __slots__ Student instances; 'StudentTable' is the array-backed table
+    GroupStore keeps now. Load time is GroupStore reading a text group.
+
+    Args:
+        sizes (list): Number of students
+    """
+    print("Memory per student (bytes)")
+    print("-" * 50)
+    print(f"{'Students':>10} {'dict + index':>14} {'Student objects':>16} {'StudentTable':>13} {'Load, s':>8}")
+
+    directory = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            rng = random.Random(size)
+            rows = lambda: ((index, student_name(index), float(rng.randint(0, 100))) for index in range(1, size + 1))
+            _, dict_bytes = traced_bytes(lambda: dict_layout(rows()))
+            _, object_bytes = traced_bytes(lambda: [Student(name, gpa, student_id) for student_id, name, gpa in rows()])
+            _, table_bytes = traced_bytes(lambda: StudentTable(rows()))
+            _, load_time = time_call(GroupStore, write_group(directory, "bench", size))
+            print(f"{size:>10} {dict_bytes / size:>14.0f} {object_bytes / size:>16.0f} "
+                  f"{table_bytes / size:>13.0f} {load_time:>8.2f}")
+    finally:
+        shutil.rmtree(directory)
+
+JSONL_GPAS = [[85.5, 90, "70", None, True], [85.5, [50], 90], [[50], [60]], [[50, 60]], [{}, 85.5]]
+
+def check_validate_batch():
+    """validate_batch gives the same error as validate_student_data for every row, with and without NumPy."""
+    for gpas in JSONL_GPAS:
+        names = ["John Smith"] * len(gpas)
+        expected = [Student.validate_student_data(name, gpa)[1] for name, gpa in zip(names, gpas)]
+        numpy_module = models.student.numpy
+        try:
+            assert Student.validate_batch(names, gpas) == expected, gpas
+            models.student.numpy = None
+            assert Student.validate_batch(names, gpas) == expected, gpas
+        finally:
+            models.student.numpy = numpy_module
+
+def benchmark_validate(sizes):
+    """
+    Compare validate_student_data in a loop against Student.validate_batch.
+
+    Every thousandth row has a bad name and every thousandth a bad GPA,
+    GPAs are strings as read from a CSV file. The batch results are also
+    checked against the loop for GPAs as they may come from a JSONL file.
+
+    Args:
+        sizes (list): Number of rows to validate
+    """
+    check_validate_batch()
+    print("Validation benchmark (seconds)")
+    print("-" * 50)
+    print(f"{'Rows':>10} {'Loop':>8} {'Batch':>8} {'No NumPy':>9} {'Speedup':>8}")
+
+    for size in sizes:
+        names = [student_name(index) if index % 1000 != 7 else "Bad Name1" for index in range(size)]
+        gpas = [str(index % 101) if index % 1000 != 3 else "abc" for index in range(size)]
+
+        loop, loop_time = time_call(lambda: [Student.validate_student_data(name, gpa)[1]
+                                             for name, gpa in zip(names, gpas)])
+        batch, batch_time = time_call(Student.validate_batch, names, gpas)
+        numpy_module, models.student.numpy = models.student.numpy, None
+        try:
+            plain, plain_time = time_call(Student.validate_batch, names, gpas)
+        finally:
+            models.student.numpy = numpy_module
+        assert loop == batch == plain
+        print(f"{size:>10} {loop_time:>8.3f} {batch_time:>8.3f} {plain_time:>9.3f} {loop_time / batch_time:>7.1f}x")
+
+def benchmark_stats(sizes):
+    """
+    Time GroupAnalytics on a loaded group: NumPy, plain Python and a cache hit.
+
+    Args:
+        sizes (list): Number of students in the group
+    """
+    print("Statistics benchmark (milliseconds)")
+    print("-" * 50)
+    print(f"{'Students':>10} {'NumPy':>10} {'Python':>10} {'Cached':>10}")
+
+    directory = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            write_group(directory, "bench", size)
+            with contextlib.redirect_stdout(io.StringIO()):
+                manager = StudentManager(directory, fast_start=True)
+            manager.file_manager.group_store("bench")  # Load outside the timings
+
+            _, numpy_time = time_call(analytics.GroupAnalytics(manager.file_manager).group_stats, "bench")
+            numpy_module, analytics.numpy = analytics.numpy, None
+            try:
+                engine = analytics.GroupAnalytics(manager.file_manager)
+                _, python_time = time_call(engine.group_stats, "bench")
+            finally:
+                analytics.numpy = numpy_module
+            _, cached_time = time_call(engine.group_stats, "bench")
+            print(f"{size:>10} {numpy_time * 1000:>10.2f} {python_time * 1000:>10.2f} {cached_time * 1000:>10.3f}")
+    finally:
+        shutil.rmtree(directory)
+
+def benchmark_import(sizes):
+    """
+    Compare add_student in a loop against import_students from a CSV file.
+
+    Args:
+        sizes (list): Number of students to import
+    """
+    print("Bulk import benchmark")
+    print("-" * 50)
+    print(f"{'Students':>10} {'Loop, s':>10} {'Import, s':>10}")
+
+    directory = tempfile.mkdtemp()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = StudentManager(directory, fast_start=True)
+        for size in sizes:
+            csv_path = os.path.join(directory, "students.csv")
+            with open(csv_path, 'w') as file:
+                file.write("name,gpa\n")
+                file.writelines(f"{student_name(index)},{index % 101}\n" for index in range(size))
+
+            write_group(directory, "loop", 0)
+            write_group(directory, "bulk", 0)
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                for index in range(size):
+                    manager.add_student("loop", student_name(index), index % 101)
+                loop_time = time.perf_counter() - start
+                _, import_time = time_call(manager.import_students, "bulk", csv_path)
+
+            print(f"{size:>10} {loop_time:>10.3f} {import_time:>10.3f}")
+    finally:
+        shutil.rmtree(directory)
+
+def cli_commands(count, size):
+    """Script lines mixing adds, searches and deletes against the group "bench"."""
+    lines = []
+    for index in range(count):
+        name = student_name(size + index)
+        lines.append(f'add bench "{name}" {index % 101}')
+        lines.append(f'search bench "{name}"')
+        lines.append(f'delete bench "{name}"')
+    return lines[:count]
+
+def benchmark_cli(sizes, commands, invocations):
+    """
+    Compare one cli.py process per command against a single batch process.
+
+    Args:
+        sizes (list): Number of students in the group
+        commands (int): Commands in the batch script
+        invocations (int): Commands run as separate processes, extrapolated
+    """
+    print("CLI benchmark (milliseconds per command)")
+    print("-" * 50)
+    print(f"{'Students':>10} {'Process':>10} {'Batch':>10} {'Speedup':>10}")
+
+    cli_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+    directory = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            write_group(directory, "bench", size)
+            base = [sys.executable, cli_path, '--quiet', '--directory', directory]
+
+            start = time.perf_counter()
+            for line in cli_commands(invocations, size):
+                subprocess.run(base + shlex.split(line), stdout=subprocess.DEVNULL, check=False)
+            process_time = (time.perf_counter() - start) / invocations
+
+            script_path = os.path.join(directory, "script.txt")
+            with open(script_path, 'w') as file:
+                file.write('\n'.join(cli_commands(commands, size)) + '\n')
+            start = time.perf_counter()
+            subprocess.run(base + ['batch', script_path], stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, check=False)
+            batch_time = (time.perf_counter() - start) / commands
+
+            print(f"{size:>10} {process_time * 1000:>10.2f} {batch_time * 1000:>10.3f} "
+                  f"{process_time / batch_time:>9.0f}x")
+    finally:
+        shutil.rmtree(directory)
+
+def benchmark_cache(sizes, operations, groups):
+    """
+    Compare FileManager reads through the group cache against parsing per read.
+
+    Every round runs has_duplicate_name, search_in_file and show_group_file
+    on one of several groups. The uncached column parses the group file
+    for every round, as the reads did before stores were kept.
+
+    Args:
+        sizes (list): Number of students per group
+        operations (int): Read rounds to time per size
+        groups (int): Number of groups the rounds cycle through; the
+                      budgeted run only fits half of them
+    """
+    print("Group cache benchmark (milliseconds per read round)")
+    print("-" * 50)
+    print(f"{'Students':>10} {'Parse':>10} {'Cached':>10} {'Budget':>10} {'Hit ratio':>10} {'Evictions':>10}")
+
+    directory = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            for group in range(groups):
+                write_group(directory, f"g{group}", size, seed=group)
+            with contextlib.redirect_stdout(io.StringIO()):
+                manager = StudentManager(directory, fast_start=True)
+            file_manager = manager.file_manager
+            names = [f"g{group}" for group in range(groups)]
+
+            def read_round(index):
+                group = names[index % groups]
+                file_manager.has_duplicate_name(group, "John Smith")
+                file_manager.search_in_file(group, "Smith")
+                file_manager.show_group_file(group)
+
+            rounds = max(1, min(operations, 20_000_000 // size // 10))
+            start = time.perf_counter()
+            for index in range(rounds):
+                store = GroupStore(os.path.join(directory, f"{names[index % groups]}.txt"))
+                store.has_name("John Smith")
+                store.search("Smith")
+                ''.join(store.lines())
+            parse_time = (time.perf_counter() - start) / rounds
+
+            group_cache.clear()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for index in range(groups):
+                    read_round(index)  # Load outside the timings
+                _, cached_time = time_call(lambda: [read_round(index) for index in range(operations)])
+
+                # Half of the groups fit the budget, so cycling through all
+                # of them evicts on nearly every round
+                group_cache.max_bytes = group_cache.stats()['bytes'] // 2
+                before = group_cache.stats()
+                _, budget_time = time_call(lambda: [read_round(index) for index in range(rounds)])
+                after = group_cache.stats()
+                group_cache.max_bytes = GroupCache.DEFAULT_MAX_BYTES
+            gets = sum(after[field] - before[field] for field in ('hits', 'misses', 'reloads'))
+            print(f"{size:>10} {parse_time * 1000:>10.2f} {cached_time / operations * 1000:>10.3f} "
+                  f"{budget_time / rounds * 1000:>10.2f} {(after['hits'] - before['hits']) / gets:>10.2f} "
+                  f"{after['evictions'] - before['evictions']:>10}")
+    finally:
+        group_cache.clear()
+        shutil.rmtree(directory)
+
+def benchmark_startup(groups, runs):
+    """
+    Time StudentManager construction with and without fast start.
+
+    Args:
+        groups (int): Number of group files in the working directory
+        runs (int): Number of fast start constructions to time
+    """
+    print("Startup benchmark (milliseconds)")
+    print("-" * 50)
+
+    directory = tempfile.mkdtemp()
+    try:
+        for index in range(groups):
+            write_group(directory, f"group{index}", 10, seed=index)
+
+        timings = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(runs):
+                _, seconds = time_call(StudentManager, directory, fast_start=True)
+                timings.append(seconds * 1000)
+            manager, default_time = time_call(StudentManager, directory)
+            _, count_time = time_call(manager.count_group_files, refresh=True)
+
+        timings.sort()
+        print(f"{'Group files:':<28} {groups}")
+        print(f"{'Default start:':<28} {default_time * 1000:.1f}")
+        print(f"{'Fast start, median:':<28} {timings[len(timings) // 2]:.3f}")
+        print(f"{'Fast start, max:':<28} {timings[-1]:.3f}")
+        print(f"{'Deferred file count:':<28} {count_time * 1000:.3f}")
+        print(f"Fast start under 50 ms: {'yes' if timings[-1] < 50 else 'no'}")
+    finally:
+        shutil.rmtree(directory)
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Number of students per group")
+
+    parser = argparse.ArgumentParser(description="Benchmarks for the lab3 student manager")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    store = commands.add_parser('store', parents=[common],
+                                help="GroupStore add/duplicate check/delete")
+    store.add_argument('--operations', type=int, default=1000,
+                       help="Number of operations to time per size")
+    commands.add_parser('import', parents=[common],
+                        help="add_student loop against import_students")
+    commands.add_parser('columnar', parents=[common],
+                        help="Text against columnar group files")
+    ranking = commands.add_parser('ranking', parents=[common],
+                                  help="Maintained GPA index against sorting per query")
+    ranking.add_argument('--operations', type=int, default=1000,
+                         help="Number of add + query rounds to time per size")
+    search = commands.add_parser('search', parents=[common],
+                                 help="Trigram name index against the linear scan")
+    search.add_argument('--operations', type=int, default=1000,
+                        help="Number of searches to time per size")
+    sqlite = commands.add_parser('sqlite', parents=[common],
+                                 help="Text against SQLite storage")
+    sqlite.add_argument('--operations', type=int, default=1000,
+                        help="Number of operations to time per size")
+    startup = commands.add_parser('startup', help="StudentManager construction time")
+    startup.add_argument('--groups', type=int, default=1000,
+                         help="Number of group files in the working directory")
+    startup.add_argument('--runs', type=int, default=100,
+                         help="Number of fast start constructions to time")
+    stress = commands.add_parser('stress', help="Concurrent add_student from many processes")
+    stress.add_argument('--workers', type=int, default=8, help="Number of processes")
+    stress.add_argument('--count', type=int, default=500, help="Students each process tries to add")
+    stress.add_argument('--storage', choices=['text', 'sqlite'], default='text')
+    reorganize_command = commands.add_parser('reorganize', help="Streaming merge, split and rebalance")
+    reorganize_command.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000],
+                                    help="Number of students per group")
+    commands.add_parser('stats', parents=[common], help="GroupAnalytics with and without NumPy")
+    commands.add_parser('validate', parents=[common], help="Row-by-row against batch validation")
+    memory = commands.add_parser('memory', help="Bytes per student of the group layouts")
+    memory.add_argument('--sizes', type=int, nargs='+', default=[10000, 1000000],
+                        help="Number of students")
+    metrics_command = commands.add_parser('metrics', parents=[common], help="Cost of the metrics layer")
+    metrics_command.add_argument('--operations', type=int, default=1000,
+                                 help="Add + search + delete rounds per size")
+    metrics_command.add_argument('--prometheus', help="Write the recorded metrics to this file")
+    cli = commands.add_parser('cli', parents=[common], help="cli.py per command against batch mode")
+    cli.add_argument('--commands', type=int, default=5000, help="Commands in the batch script")
+    cli.add_argument('--invocations', type=int, default=30,
+                     help="Commands run as separate processes")
+    cache = commands.add_parser('cache', parents=[common], help="FileManager reads through the group cache")
+    cache.add_argument('--operations', type=int, default=1000, help="Read rounds to time per size")
+    cache.add_argument('--groups', type=int, default=4, help="Groups the read rounds cycle through")
+    load = commands.add_parser('server', help="Latency of the JSON-lines server under concurrent clients")
+    load.add_argument('--clients', type=int, default=50, help="Number of concurrent connections")
+    load.add_argument('--requests', type=int, default=200, help="Requests sent by each client")
+    load.add_argument('--size', type=int, default=10000, help="Students per group at the start")
+    load.add_argument('--storage', choices=['text', 'sqlite'], default='text')
+    args = parser.parse_args()
+
+    if args.command == 'store':
+        benchmark_store(args.sizes, args.operations)
+    elif args.command == 'import':
+        benchmark_import(args.sizes)
+    elif args.command == 'columnar':
+        benchmark_columnar(args.sizes)
+    elif args.command == 'ranking':
+        benchmark_ranking(args.sizes, args.operations)
+    elif args.command == 'search':
+        benchmark_search(args.sizes, args.operations)
+    elif args.command == 'sqlite':
+        benchmark_sqlite(args.sizes, args.operations)
+    elif args.command == 'stress':
+        benchmark_stress(args.workers, args.count, args.storage)
+    elif args.command == 'reorganize':
+        benchmark_reorganize(args.sizes)
+    elif args.command == 'stats':
+        benchmark_stats(args.sizes)
+    elif args.command == 'validate':
+        benchmark_validate(args.sizes)
+    elif args.command == 'memory':
+        benchmark_memory(args.sizes)
+    elif args.command == 'metrics':
+        benchmark_metrics(args.sizes, args.operations, args.prometheus)
+    elif args.command == 'cli':
+        benchmark_cli(args.sizes, args.commands, args.invocations)
+    elif args.command == 'cache':
+        benchmark_cache(args.sizes, args.operations, args.groups)
+    elif args.command == 'server':
+        benchmark_server(args.clients, args.requests, args.size, args.storage)
+    elif args.command == 'startup':
+        benchmark_startup(args.groups, args.runs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import argparse
+import contextlib
+import io
+import json
+import shlex
+import sys
+import time
+from typing import Iterable, Optional
+
+from managers.student_manager import StudentManager
+from utils.analytics import GroupAnalytics
+from utils.group_cache import group_cache
+from utils.student_io import file_format_of, write_students
+
+def open_manager(directory: str, storage: str) -> StudentManager:
+    """Create a StudentManager without the interactive startup output."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return StudentManager(directory, fast_start=True, storage=storage)
+
+def _require_group(manager: StudentManager, group_name: str) -> bool:
+    """Check that a group exists; group_exists reports a missing one."""
+    return manager.file_manager.group_exists(group_name)
+
+def command_create(manager: StudentManager, args) -> int:
+    """Create the given groups; existing groups are left as they are."""
+    manager.create_group_file(*args.groups)
+    return 0
+
+def command_add(manager: StudentManager, args) -> int:
+    """Add one student to a group."""
+    return 0 if manager.add_student(args.group, args.name, args.gpa) else 1
+
+def command_delete(manager: StudentManager, args) -> int:
+    """Delete a student by ID or name."""
+    return 0 if manager.delete_student(args.group, args.student) else 1
+
+def command_search(manager: StudentManager, args) -> int:
+    """Print the students of a group matching a pattern, exit code 1 if none do (like grep)."""
+    if not _require_group(manager, args.group):
+        return 1
+    results = manager.file_manager.search_in_file(args.group, args.pattern)
+    for line in results:
+        print(line.rstrip('\n'))
+    return 0 if results else 1
+
+def command_sort(manager: StudentManager, args) -> int:
+    """Sort a group by GPA, highest first."""
+    return 0 if manager.file_manager.sort_by_gpa(args.group) else 1
+
+def command_show(manager: StudentManager, args) -> int:
+    """Print a group in the group file format."""
+    if not _require_group(manager, args.group):
+        return 1
+    try:
+        sys.stdout.writelines(manager.file_manager.group_store(args.group).lines())
+    except OSError as e:
+        manager.log.print(f"Error reading file: {str(e)}", "err")
+        return 1
+    return 0
+
+def command_import(manager: StudentManager, args) -> int:
+    """Import students from a CSV or JSONL file; exit code 1 if none were added."""
+    summary = manager.import_students(args.group, args.path)
+    return 0 if summary['added'] else 1
+
+def command_export(manager: StudentManager, args) -> int:
+    """Write the students of a group to a CSV or JSONL file, or to stdout with '-'."""
+    if not _require_group(manager, args.group):
+        return 1
+    try:
+        file_format = args.format or ('csv' if args.path == '-' else file_format_of(args.path))
+        rows = manager.file_manager.group_store(args.group).rows()
+        if args.path == '-':
+            count = write_students(sys.stdout, rows, file_format)
+        else:
+            with open(args.path, 'w', newline='', encoding='utf-8') as file:
+                count = write_students(file, rows, file_format)
+    except (OSError, ValueError) as e:
+        manager.log.print(f"Error exporting students: {str(e)}", "err")
+        return 1
+    if args.path != '-':  # Keep stdout clean for the exported data
+        manager.log.print(f"Exported {count} student(s) from group {args.group}", "succ")
+    return 0
+
+def command_stats(manager: StudentManager, args) -> int:
+    """Print GPA statistics of the given groups (all groups by default)."""
+    known = set(manager.file_manager.group_names())
+    missing = [group for group in args.groups if group not in known]
+    if missing:
+        print(f"Unknown group(s): {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    analytics = GroupAnalytics(manager.file_manager)
+    groups = args.groups or sorted(known)
+    if args.json:
+        result = {'groups': {group: analytics.group_stats(group).as_dict() for group in groups},
+                  'overall': analytics.overall_stats(groups).as_dict()}
+        print(json.dumps(result, indent=2))
+    else:
+        print(analytics.report(groups))
+    return 0
+
+def run_batch(manager: StudentManager, lines: Iterable[str], stop_on_error: bool = False) -> int:
+    """
+    Run script lines as CLI commands against one manager.
+
+    Every line holds one command as it would follow the global options on
+    the command line, e.g. `add 121 "John Smith" 85.5`; blank lines and
+    # comments are skipped. All commands share the manager, so each group
+    is loaded once and later commands only check it for outside changes.
+
+    ----------------------------------------
+
+    Args:
+        manager (StudentManager): Manager to run the commands with
+        lines (Iterable[str]): Script lines
+        stop_on_error (bool, optional): Stop at the first failing command
+
+    Returns:
+        int: Number of commands that failed, including unparsable lines
+
+    Examples:
+        >>> run_batch(manager, ["create 121", "add 121 'John Smith' 85.5", "sort 121"])
+        0
+    """
+    parser = build_command_parser()
+    failed = 0
+    for line_number, line in enumerate(lines, 1):
+        try:
+            tokens = shlex.split(line, comments=True)
+            if not tokens:
+                continue
+            args = parser.parse_args(tokens)
+            status = args.handler(manager, args)
+        except SystemExit as e:  # argparse reports the error itself
+            status = e.code
+        except ValueError as e:  # shlex: unbalanced quotes
+            print(f"❌ Error: {e}", file=sys.stderr)
+            status = 1
+        if status:
+            print(f"Line {line_number} failed: {line.strip()}", file=sys.stderr)
+            failed += 1
+            if stop_on_error:
+                print(f"Stopped at line {line_number}", file=sys.stderr)
+                break
+    return failed
+
+def command_batch(manager: StudentManager, args) -> int:
+    """Run a script of commands, from a file or stdin with '-'; exit code 1 if any failed."""
+    start = time.perf_counter()
+    if args.script == '-':
+        lines = list(sys.stdin)
+    else:
+        try:
+            with open(args.script, 'r', encoding='utf-8') as file:
+                lines = file.readlines()
+        except OSError as e:
+            manager.log.print(f"Error reading script: {str(e)}", "err")
+            return 1
+    failed = run_batch(manager, lines, args.stop_on_error)
+    seconds = time.perf_counter() - start
+    cache = group_cache.stats()
+    print(f"Batch finished in {seconds:.2f} s, {failed} command(s) failed "
+          f"(group cache: {cache['hits']} hits, {cache['misses'] + cache['reloads']} loads)", file=sys.stderr)
+    return 1 if failed else 0
+
+def _add_commands(commands, batch: bool = True):
+    """Add the subcommands to an argparse subparsers object; batch=False leaves out 'batch'."""
+    create = commands.add_parser('create', help="Create groups")
+    create.add_argument('groups', nargs='+')
+    create.set_defaults(handler=command_create)
+
+    add = commands.add_parser('add', help="Add a student to a group")
+    add.add_argument('group')
+    add.add_argument('name')
+    add.add_argument('gpa')
+    add.set_defaults(handler=command_add)
+
+    delete = commands.add_parser('delete', help="Delete a student by ID or name")
+    delete.add_argument('group')
+    delete.add_argument('student', help="Student ID or full name")
+    delete.set_defaults(handler=command_delete)
+
+    search = commands.add_parser('search', help="Search students of a group")
+    search.add_argument('group')
+    search.add_argument('pattern')
+    search.set_defaults(handler=command_search)
+
+    sort = commands.add_parser('sort', help="Sort a group by GPA")
+    sort.add_argument('group')
+    sort.set_defaults(handler=command_sort)
+
+    show = commands.add_parser('show', help="Print a group")
+    show.add_argument('group')
+    show.set_defaults(handler=command_show)
+
+    import_ = commands.add_parser('import', help="Import students from a .csv or .jsonl file")
+    import_.add_argument('group')
+    import_.add_argument('path')
+    import_.set_defaults(handler=command_import)
+
+    export = commands.add_parser('export', help="Export a group to a .csv or .jsonl file")
+    export.add_argument('group')
+    export.add_argument('path', help="Output file, '-' for stdout")
+    export.add_argument('--format', choices=['csv', 'jsonl'], help="Output format, by extension by default")
+    export.set_defaults(handler=command_export)
+
+    stats = commands.add_parser('stats', help="GPA statistics per group and across groups")
+    stats.add_argument('groups', nargs='*', help="Groups to include, all groups if none are given")
+    stats.add_argument('--json', action='store_true', help="Print the statistics as JSON")
+    stats.set_defaults(handler=command_stats)
+
+    if batch:
+        script = commands.add_parser('batch', help="Run commands from a script, one per line")
+        script.add_argument('script', nargs='?', default='-', help="Script file, stdin by default")
+        script.add_argument('--stop-on-error', action='store_true', help="Stop at the first failing command")
+        script.set_defaults(handler=command_batch)
+
+def build_command_parser() -> argparse.ArgumentParser:
+    """Parser of a single batch script line: the commands without global options or 'batch'."""
+    parser = argparse.ArgumentParser(prog="batch", add_help=False)
+    _add_commands(parser.add_subparsers(dest='command', required=True), batch=False)
+    return parser
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Command line interface for the lab3 student manager")
+    parser.add_argument('--directory', default="groups", help="Directory with the group files")
+    parser.add_argument('--storage', choices=['text', 'columnar', 'sqlite'], default='text')
+    parser.add_argument('--quiet', '-q', action='store_true', help="Only report errors and warnings")
+    _add_commands(parser.add_subparsers(dest='command', required=True))
+    return parser
+
+def main(argv: Optional[list] = None) -> int:
+    args = build_parser().parse_args(argv)
+    manager = open_manager(args.directory, args.storage)
+    manager.log.quiet = args.quiet
+    return args.handler(manager, args)
+
+if __name__ == "__main__":
+    sys.exit(main())
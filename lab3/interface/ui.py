@@ -1,5 +1,7 @@
 import os
 from managers.student_manager import StudentManager
+from utils.query import QueryEngine, StudentQuery
+from utils.analytics import GroupAnalytics
 
 class UserInterface:
     """Class to handle user interface for student management system.
@@ -11,6 +13,7 @@ class UserInterface:
 
     Attributes:
         student_manager (StudentManager): Handles core functionality of student management
+        analytics (GroupAnalytics): GPA statistics, cached between menu calls
 
     Methods:
         show_menu(): Displays main menu and handles navigation
@@ -24,6 +27,8 @@ class UserInterface:
         4. 📁 Search files
         5. 🔍 Search student in group
         6. 📊 Sort students by GPA
+        7. 🌐 Search students in all groups
+        8. 📈 Group statistics
         0. 🚪 Exit
 
     Examples:
@@ -35,6 +40,7 @@ class UserInterface:
     """
     def __init__(self, student_manager: StudentManager):
         self.student_manager = student_manager
+        self.analytics = GroupAnalytics(student_manager.file_manager)
 
     def show_menu(self):
         """Display the main menu interface.
@@ -64,7 +70,6 @@ class UserInterface:
               ... other menu options...
             .・。.・゜✭・.・✫・゜・。.・゜✭・.・
         """
-        self.student_manager.log.print("Main Menu", "setup")
         menu_options = [
             "📖 1. Read student data from group",
             "✏️  2. Add student to group",
@@ -72,16 +77,20 @@ class UserInterface:
             "📁 4. Search files",
             "🔍 5. Search student in group",
             "📊 6. Sort students by GPA",
+            "🌐 7. Search students in all groups",
+            "📈 8. Group statistics",
             "🚪 0. Exit"
         ]
 
-        os.system('cls')
-        print("\nLab 3 by Buliukin Volodimir | Group: KN-24 | Variant: 3")
-        print("\n.・。.・゜✭・.・✫・゜・。.・゜✭・.・")
-        for option in menu_options:
-            print(f"  ✧ {option}")
-        print(".・。.・゜✭・.・✫・゜・。.・゜✭・.・ ")
-        self.handle_menu_choice()
+        while True:
+            self.student_manager.log.print("Main Menu", "setup")
+            os.system('cls')
+            print("\nLab 3 by Buliukin Volodimir | Group: KN-24 | Variant: 3")
+            print("\n.・。.・゜✭・.・✫・゜・。.・゜✭・.・")
+            for option in menu_options:
+                print(f"  ✧ {option}")
+            print(".・。.・゜✭・.・✫・゜・。.・゜✭・.・ ")
+            self.handle_menu_choice()
 
     def handle_menu_choice(self, choice=None):
         """Process user's menu selection and execute corresponding operation.
@@ -93,106 +102,133 @@ class UserInterface:
 
         Args:
             choice (str, optional): Menu option number. Defaults to None.
-                                  Valid choices are "0" through "6".
+                                  Valid choices are "0" through "8".
 
         Side Effects:
             - Executes selected operation
-            - Handles navigation between menus
+            - Repeats it for as long as the user asks to, then returns to show_menu
             - Shows error messages for invalid inputs
 
         Raises:
             ValueError: If input values are invalid
         """
-        try:
-            if choice is None:
-                choice = input(f"\n✨ Enter your choice (0-6): ")
-            if choice == "0":
-                self.student_manager.log.print("Exiting program...", "exit")
-                exit()
-            elif choice == "1":
-                os.system('cls')
-                group = input("Enter group number: ")
+        if choice is None:
+            choice = input(f"\n✨ Enter your choice (0-8): ")
+        # Repeats loop here and show_menu loops over choices, so long
+        # sessions don't grow the call stack
+        while True:
+            try:
+                if choice == "0":
+                    self.student_manager.log.print("Exiting program...", "exit")
+                    exit()
+                elif choice == "1":
+                    os.system('cls')
+                    group = input("Enter group number: ")
                 
-                self.student_manager.file_manager.show_group_file(group)
+                    self.student_manager.file_manager.show_group_file(group)
 
-                if self.ask_to_continue() == True:
-                    self.handle_menu_choice("1")
-                else: self.show_menu()
-            elif choice == "2":
-                os.system('cls')
-                
-                group = input("Enter group number: ")
-                self.student_manager.file_manager.show_group_file(group)
-                name = input("Enter student name: ")
-                gpa = float(input("Enter student GPA: "))
-
-                self.student_manager.add_student(group, name, gpa)
-                if self.ask_to_continue():
-                    self.handle_menu_choice()
-                self.show_menu()
-            elif choice == "3":
-                os.system('cls')
-
-                group = input("Enter group number: ")
-                self.student_manager.file_manager.show_group_file(group)
-                self.student_manager.log.print("Enter student ID or name to delete:", "search")
-                name = input("")
-                self.student_manager.delete_student(group, name)
-                if self.ask_to_continue():
-                    self.handle_menu_choice("3")
-                self.show_menu()
-            elif choice == "4":
-                os.system('cls')
-                pattern = input("Enter search pattern (or press Enter for all files): ")
-                try:
-                    files = self.student_manager.file_manager.search_files(pattern)
-                except Exception as e:
-                    self.student_manager.log.print(f"Error searching files: {str(e)}", "err")
-                    files = []
-                if files:
-                    print("\nFound files:")
-                    for file in files:
-                        print(f"📄 {file}")
-                else:
-                    self.student_manager.log.print("No files found", "warn")
+                elif choice == "2":
+                    os.system('cls')
                 
-                if self.ask_to_continue():
-                    self.handle_menu_choice("4")
-                self.show_menu()
-
-            elif choice == "5":
-                os.system('cls')
-                group = input("Enter group number: ")
-                search_term = input("Enter search term: ")
-                results = self.student_manager.file_manager.search_in_file(group, search_term)
+                    group = input("Enter group number: ")
+                    self.student_manager.file_manager.show_group_file(group)
+                    name = input("Enter student name: ")
+                    gpa = float(input("Enter student GPA: "))
+
+                    self.student_manager.add_student(group, name, gpa)
+                elif choice == "3":
+                    os.system('cls')
+
+                    group = input("Enter group number: ")
+                    self.student_manager.file_manager.show_group_file(group)
+                    self.student_manager.log.print("Enter student ID or name to delete:", "search")
+                    name = input("")
+                    self.student_manager.delete_student(group, name)
+                elif choice == "4":
+                    os.system('cls')
+                    pattern = input("Enter search pattern (or press Enter for all files): ")
+                    try:
+                        files = self.student_manager.file_manager.search_files(pattern)
+                    except Exception as e:
+                        self.student_manager.log.print(f"Error searching files: {str(e)}", "err")
+                        files = []
+                    if files:
+                        print("\nFound files:")
+                        for file in files:
+                            print(f"📄 {file}")
+                    else:
+                        self.student_manager.log.print("No files found", "warn")
+
+                elif choice == "5":
+                    os.system('cls')
+                    group = input("Enter group number: ")
+                    search_term = input("Enter search term: ")
+                    results = self.student_manager.file_manager.search_in_file(group, search_term)
                 
-                if results:
-                    print("\nSearch results:")
-                    for result in results:
-                        print(f"➜ {result}")
-                else:
-                    self.student_manager.log.print("No matches found", "warn")
+                    if results:
+                        print("\nSearch results:")
+                        for result in results:
+                            print(f"➜ {result}")
+                    else:
+                        self.student_manager.log.print("No matches found", "warn")
                 
-                if self.ask_to_continue():
-                    self.handle_menu_choice("5")
-                self.show_menu()
-
-            elif choice == "6":
-                os.system('cls')
-                group = input("Enter group number: ")
-                if self.student_manager.file_manager.sort_by_gpa(group):
-                    self.student_manager.file_manager.show_group_file(group)
+
+                elif choice == "6":
+                    os.system('cls')
+                    group = input("Enter group number: ")
+                    if self.student_manager.file_manager.sort_by_gpa(group):
+                        self.student_manager.file_manager.show_group_file(group)
                 
-                if self.ask_to_continue():
-                    self.handle_menu_choice("6")
-                self.show_menu()
-            else:
-                self.student_manager.log.print("Invalid choice! Please try again.", "warning")
-                self.show_menu()
-
-        except ValueError as e:
-            self.student_manager.log.print(f"Invalid input: {str(e)}", "err")
-            self.show_menu()
+
+                elif choice == "7":
+                    os.system('cls')
+                    print("Press Enter to skip any condition")
+                    name = input("Name contains: ").strip()
+                    regex = input("Name matches regex: ").strip()
+                    min_gpa = input("Minimum GPA: ").strip()
+                    max_gpa = input("Maximum GPA: ").strip()
+                    groups = input("Groups (comma separated): ").strip()
+                    top = input("Show only top N by GPA: ").strip()
+
+                    query = StudentQuery(
+                        name=name or None,
+                        regex=regex or None,
+                        min_gpa=float(min_gpa) if min_gpa else None,
+                        max_gpa=float(max_gpa) if max_gpa else None,
+                        groups=[group.strip() for group in groups.split(',') if group.strip()] if groups else None,
+                        top=int(top) if top else None,
+                    )
+                    found = 0
+                    for group, student_id, student_name, gpa in QueryEngine(self.student_manager.file_manager).run(query):
+                        if not found:
+                            print("\nSearch results:")
+                        found += 1
+                        print(f"➜ Group {group} | {student_id}. \t |{gpa} \t | {student_name}")
+
+                    if found:
+                        self.student_manager.log.print(f"Found {found} student(s)", "succ")
+                    else:
+                        self.student_manager.log.print("No matches found", "warn")
+
+
+                elif choice == "8":
+                    os.system('cls')
+                    groups = input("Groups (comma separated, Enter for all): ").strip()
+                    group_names = [group.strip() for group in groups.split(',') if group.strip()] if groups else None
+
+                    print()
+                    print(self.analytics.report(group_names))
+
+                else:
+                    self.student_manager.log.print("Invalid choice! Please try again.", "warning")
+                    return
+
+            except ValueError as e:
+                self.student_manager.log.print(f"Invalid input: {str(e)}", "err")
+                return
+
+            if not self.ask_to_continue():
+                return
 
     @staticmethod # Static method to ask user if they want to continue
     def ask_to_continue() -> bool:
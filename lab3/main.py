@@ -7,7 +7,6 @@ def main():
     manager = StudentManager()
     manager.create_group_file("121", "122", "123")
     ui = UserInterface(manager)
-    add = manager.add_student
     
     # students = [
     #     # Group 121
@@ -51,8 +50,8 @@ def main():
     #     ("123", "Chloe Rogers", str(random.randint(1, 100))),
     # ]
     #  
-    # for student_data in students:
-    #     add(*student_data)
+    # for group in ("121", "122", "123"):
+    #     manager.add_students(group, [(name, gpa) for g, name, gpa in students if g == group])
 
     ui.show_menu()
 
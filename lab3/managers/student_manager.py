@@ -1,7 +1,10 @@
 import os
 import time
+from typing import Dict, Iterable, Tuple
 from utils.logger import Logger
 from utils.file_manager import FileManager
+from utils.student_io import read_students
+from utils.metrics import metrics
 from models.student import Student
 
 class StudentManager:
@@ -15,11 +18,15 @@ class StudentManager:
     Attributes:
         log (Logger): Logger instance for recording operations and errors
         file_manager (FileManager): Manages file operations for student groups
+        fast_start (bool): Skips the startup delays and the group file count
 
     Methods:
         _setup_logging(): Initializes logging and verifies working directory permissions
+        count_group_files(): Counts the group files in the working directory
         create_group_file(*group_names): Creates new group files for given group names
         add_student(group_name, student_name, gpa): Adds a student to specified group
+        add_students(group_name, students): Adds a batch of students with one write
+        import_students(group_name, path): Adds students from a CSV or JSONL file
         delete_student(group_name, identifier): Removes a student from group
 
     Examples:
@@ -27,17 +34,32 @@ class StudentManager:
         >>> manager.create_group_file("Group1", "Group2")
         >>> manager.add_student("Group1", "John Doe", 85.5)
         >>> manager.delete_student("Group1", "1")  # Delete by ID
+        >>> scripted = StudentManager("groups", fast_start=True)  # No startup delays
 
     Note:
         - Group files are stored as .txt files in the specified directory
         - Student entries include ID, GPA and name
         - Duplicate student names are not allowed within the same group
+        - storage="columnar" keeps groups in the binary format of utils.columnar,
+          storage="sqlite" keeps all groups in one SQLite database
+        - Use fast_start=True for scripts and benchmarks, the delays only
+          matter for the interactive menu
+        - Adding, deleting and the FileManager calls behind them are
+          measured by utils.metrics once metrics.enable() is called
     """
-    def __init__(self, directory: str = "groups"):
+    STARTUP_DELAY = 0.5
+
+    def __init__(self, directory: str = "groups", fast_start: bool = False, storage: str = "text"):
         self.log = Logger()
-        self.file_manager = FileManager(directory, self.log)
+        self.fast_start = fast_start
+        self.file_manager = FileManager(directory, self.log, storage)
+        self._group_file_count = None
         self._setup_logging()
 
+    def _pause(self):
+        if not self.fast_start:
+            time.sleep(self.STARTUP_DELAY)
+
     def _setup_logging(self):
         """Initialize and configure logging for the Student Manager.
 
@@ -50,30 +72,49 @@ class StudentManager:
             - Announces initialization
             - Verifies working directory path
             - Checks directory permissions
-            - Counts existing group files
-            - Adds delays between operations
+            - Counts existing group files (skipped in fast start mode)
+            - Adds delays between operations (skipped in fast start mode)
 
         Note:
             Each log message has a 0.5 second delay for better readability
         """
         self.log.print("Initializing Student Manager", "setup")
-        time.sleep(0.5)
+        self._pause()
         self.log.print(f"Working directory: {os.path.abspath(self.file_manager.directory)}", "folder")
-        time.sleep(0.5)
+        self._pause()
         
         # Check write permissions
         if os.access(self.file_manager.directory, os.W_OK):
             self.log.print("Write permissions verified", "check")
         else:
             self.log.print("No write permissions in directory", "warn")
-        time.sleep(0.5)
+        self._pause()
             
-        # count for existing files
-        existing_files = len([f for f in os.listdir(self.file_manager.directory) if f.endswith('.txt')])
-        self.log.print(f"Found {existing_files} existing group file(s)", "exists")
-        time.sleep(0.5)
+        # count for existing files, deferred until asked for in fast start mode
+        if not self.fast_start:
+            self.log.print(f"Found {self.count_group_files()} existing group file(s)", "exists")
+            self._pause()
         self.log.print("Setup complete", "succ")
 
+    def count_group_files(self, refresh: bool = False) -> int:
+        """
+        Count the group files in the working directory.
+
+        The directory is listed on the first call only; the cached result is
+        dropped whenever create_group_file runs.
+
+        ----------------------------------------
+
+        Args:
+            refresh (bool): List the directory again instead of using the cached count
+
+        Returns:
+            int: Number of group files in the configured storage format
+        """
+        if self._group_file_count is None or refresh:
+            self._group_file_count = len(self.file_manager.group_names())
+        return self._group_file_count
+
     def create_group_file(self, *group_names: str):
         """Create group files for the specified group names.
 
@@ -96,12 +137,15 @@ class StudentManager:
         self.log.print("Creating group files...", "folder")
         for group_name in group_names:
             self.file_manager.create_group_file(group_name)
+        self._group_file_count = None
 
-    def add_student(self, group_name: str, student_name: str, gpa: float = 0.0):
+    @metrics.timed()
+    def add_student(self, group_name: str, student_name: str, gpa: float = 0.0) -> bool:
         """Add a student to the specified group.
 
         This method adds a new student entry to the specified group file with
-        an automatically assigned ID.
+        an automatically assigned ID. Duplicate checks and the next ID come
+        from the group's in-memory store, so the file is not rescanned.
 
         ----------------------------------------
 
@@ -110,6 +154,9 @@ class StudentManager:
             student_name (str): The name of the student
             gpa (float, optional): Student's GPA. Defaults to 0.0
 
+        Returns:
+            bool: True if the student was added, False otherwise
+
         Side Effects:
             - Modifies group file content
             - Logs operation status
@@ -128,33 +175,113 @@ class StudentManager:
             ❌ Error: Group 999 does not exist
         """
         if not self.file_manager.group_exists(group_name):
-            return
-        
-        if self.file_manager.has_duplicate_name(group_name, student_name):
-            self.log.print(f"Student with name '{student_name}' already exists in group {group_name}", "warn")
-            return
+            return False
         
         valid, message = Student.validate_student_data(student_name, gpa)
         if not valid:
             self.log.print(message, "err")
-            return
+            return False
 
-        student_id = 1
         try:
-            group_path = os.path.join(self.file_manager.directory, f"{group_name}.txt")
-            with open(group_path, 'r') as file:
-                for line in file:
-                    if line.strip() and line[0].isdigit():
-                        current_id = int(line.split('.')[0])
-                        student_id = max(student_id, current_id + 1)
-
-            with open(group_path, 'a') as file:
-                file.write(f"{student_id}. \t |{gpa} \t | {student_name}\n")
+            store = self.file_manager.group_store(group_name)
+            # Check and add under one lock, so concurrent workers can't both add the name
+            with store.transaction():
+                if store.has_name(student_name):
+                    self.log.print(f"Student with name '{student_name}' already exists in group {group_name}", "warn")
+                    return False
+                store.add(student_name.strip(), float(gpa))
             self.log.print(f"Added student '{student_name}' to group {group_name}", "succ")
+            return True
         except Exception as e:
             self.log.print(f"Error adding student: {str(e)}", "err")
+            return False
+
+    @metrics.timed()
+    def add_students(self, group_name: str, students: Iterable[Tuple[str, float]]) -> Dict[str, int]:
+        """Add a batch of students to the specified group.
+
+        The batch is validated first with one Student.validate_batch call,
+        duplicates are checked against the group's name index (and within
+        the batch itself), IDs are assigned in one pass and all new entries
+        are appended with a single write. The duplicate check and the write
+        run in one store transaction, so other processes adding to the group
+        can't slip in between.
+
+        ----------------------------------------
+
+        Args:
+            group_name (str): The group to add the students to
+            students (Iterable[Tuple[str, float]]): (name, gpa) pairs
+
+        Returns:
+            Dict[str, int]: Number of 'added', 'duplicate' and 'invalid' entries
 
-    def delete_student(self, group_name: str, student_identifier: str):
+        Side Effects:
+            - Appends to the group file
+            - Logs a single summary line
+
+        Examples:
+            >>> manager.add_students("121", [("John Smith", 85.5), ("Emma Davis", 90.0)])
+            ✅ Added 2 student(s) to group 121 (0 duplicate, 0 invalid)
+            {'added': 2, 'duplicate': 0, 'invalid': 0}
+        """
+        summary = {'added': 0, 'duplicate': 0, 'invalid': 0}
+        if not self.file_manager.group_exists(group_name):
+            return summary
+
+        try:
+            store = self.file_manager.group_store(group_name)
+            names, gpas = [], []
+            for name, gpa in students:
+                names.append(str(name).strip())
+                gpas.append(gpa)
+            errors = Student.validate_batch(names, gpas)
+            candidates = [(name, float(gpa)) for name, gpa, error in zip(names, gpas, errors)
+                          if not error and name]
+            summary['invalid'] = len(names) - len(candidates)
+
+            with store.transaction():
+                batch = []
+                seen = set()
+                for name, gpa in candidates:
+                    key = name.lower()
+                    if key in seen or store.has_name(name):
+                        summary['duplicate'] += 1
+                        continue
+                    seen.add(key)
+                    batch.append((name, gpa))
+                summary['added'] = len(store.add_many(batch))
+            self.log.print(f"Added {summary['added']} student(s) to group {group_name} "
+                           f"({summary['duplicate']} duplicate, {summary['invalid']} invalid)", "succ")
+        except Exception as e:
+            self.log.print(f"Error adding students: {str(e)}", "err")
+        return summary
+
+    def import_students(self, group_name: str, path: str) -> Dict[str, int]:
+        """Import students into a group from a CSV or JSONL file.
+
+        ----------------------------------------
+
+        Args:
+            group_name (str): The group to import into
+            path (str): .csv file with "name" and "gpa" columns, or .jsonl file
+                        with {"name": ..., "gpa": ...} objects
+
+        Returns:
+            Dict[str, int]: Summary as returned by add_students
+
+        Examples:
+            >>> manager.import_students("121", "new_students.csv")
+            ✅ Added 1000 student(s) to group 121 (3 duplicate, 1 invalid)
+        """
+        try:
+            return self.add_students(group_name, read_students(path))
+        except (OSError, ValueError) as e:
+            self.log.print(f"Error importing students: {str(e)}", "err")
+            return {'added': 0, 'duplicate': 0, 'invalid': 0}
+
+    @metrics.timed()
+    def delete_student(self, group_name: str, student_identifier: str) -> bool:
         """Delete a student from the specified group.
 
         This method removes a student entry from the group file based on
@@ -166,50 +293,29 @@ class StudentManager:
             group_name (str): The group to delete from
             student_identifier (str): Student's ID or name
 
+        Returns:
+            bool: True if a student was deleted, False otherwise
+
         Side Effects:
             - Modifies group file content
             - Logs operation status
 
         Note:
-            - Can delete by ID (e.g., "1") or name
-            - Case-sensitive name matching
+            - Can delete by ID (e.g., "1") or full name
+            - Case-insensitive name matching through the store's name index
         """
         if not self.file_manager.group_exists(group_name):
-            return
+            return False
             
         try:
-            group_path = os.path.join(self.file_manager.directory, f"{group_name}.txt")
-            with open(group_path, 'r') as file:
-                lines = file.readlines()
-
-            found = False
-            new_lines = []
-            for line in lines:
-                if not line.strip():
-                    new_lines.append(line)
-                    continue
-                
-                if not line[0].isdigit():
-                    new_lines.append(line)
-                    continue
-                    
-                # Check if line matches either ID or name
-                student_id = line.split('.')[0].strip()
-                student_entry = line.split('.', 1)[1].strip()
-                
-                if student_identifier == student_id or student_identifier in student_entry:
-                    found = True
-                    continue
-                new_lines.append(line)
-
-            if not found:
+            deleted = self.file_manager.group_store(group_name).delete(student_identifier)
+            if not deleted:
                 self.log.print(f"Student with identifier '{student_identifier}' not found in group {group_name}", "err")
-                return
-           
-            with open(group_path, 'w') as file:
-                file.writelines(new_lines)
+                return False
 
             self.log.print(f"Deleted student with identifier '{student_identifier}' from group {group_name}", "succ")
+            return True
             
         except Exception as e:
             self.log.print(f"Error deleting student: {str(e)}", "err")
+            return False
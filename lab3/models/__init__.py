@@ -1,3 +1,4 @@
 from .student import Student
+from .student_table import StudentTable
 
-__all__ = ['Student']
\ No newline at end of file
+__all__ = ['Student', 'StudentTable']
\ No newline at end of file
@@ -1,4 +1,64 @@
-from typing import Tuple
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:  # Batch validation checks GPAs in a plain loop instead
+    numpy = None
+
+NAME_ERROR = "Student name should contain only letters and spaces"
+RANGE_ERROR = "GPA must be between 0.0 and 100.0"
+NUMBER_ERROR = "GPA must be a valid number"
+
+# Names are checked NAME_CHUNK at a time with one isalpha() call
+NAME_CHUNK = 64
+
+def _valid_name(name: str) -> bool:
+    # Same as every character being a letter or whitespace: str.split()
+    # splits on exactly the characters isspace() accepts
+    letters = ''.join(name.split())
+    return not letters or letters.isalpha()
+
+def _collect_invalid(names: Sequence[str], start: int, end: int, invalid: List[int]):
+    # A failing range is halved until the bad names are found, so a bad
+    # name costs a few joins instead of a recheck of the whole chunk
+    letters = ''.join(names[start:end]).replace(' ', '')
+    if not letters or letters.isalpha() or _valid_name(letters):
+        return
+    if end - start == 1:
+        invalid.append(start)
+        return
+    middle = (start + end) // 2
+    _collect_invalid(names, start, middle, invalid)
+    _collect_invalid(names, middle, end, invalid)
+
+def _invalid_names(names: Sequence[str]) -> List[int]:
+    invalid = []
+    for start in range(0, len(names), NAME_CHUNK):
+        _collect_invalid(names, start, min(start + NAME_CHUNK, len(names)), invalid)
+    return invalid
+
+def _gpa_errors(gpas: Sequence) -> List[str]:
+    if numpy is not None:
+        try:
+            values = numpy.asarray(gpas, dtype=numpy.float64)
+        except (TypeError, ValueError):
+            values = None
+        # Nested values like [50] give more dimensions instead of failing;
+        # float() rejects them, so they go through the loop below
+        if values is not None and values.ndim == 1 and values.shape[0] == len(gpas):
+            errors = [''] * len(values)
+            for index in numpy.flatnonzero(~((values >= 0.0) & (values <= 100.0))).tolist():
+                # NaN may also come from None, which is not a number at all
+                errors[index] = Student.validate_student_data('', gpas[index])[1]
+            return errors
+
+    errors = []
+    for gpa in gpas:
+        try:
+            errors.append('' if 0.0 <= float(gpa) <= 100.0 else RANGE_ERROR)
+        except (TypeError, ValueError):
+            errors.append(NUMBER_ERROR)
+    return errors
 
 class Student:
     """
@@ -6,10 +66,12 @@ class Student:
     
     A class representing a student with a name and Grade Point Average (GPA).
     This class stores and manages student information including their full name
-    and academic performance measured by GPA.
+    and academic performance measured by GPA. Instances use __slots__, so they
+    carry no per-object __dict__.
     Attributes:
         name (str): The full name of the student. Must contain only letters and spaces.
         gpa (float): The Grade Point Average of the student. Must be between 0.0 and 100.0.
+        student_id (int): ID of the student in its group, None if not stored yet.
     Methods:
         validate_student_data(name: str, gpa: float) -> Tuple[bool, str]:
             Static method that validates the student data before creation.
@@ -24,19 +86,61 @@ class Student:
         (True, '')
         >>> Student.validate_student_data("John123", 85.5)
         (False, 'Student name should contain only letters and spaces')
+        >>> Student.validate_batch(["John Smith", "John123", "Emma Davis"], [95.5, 85.5, "abc"])
+        ['', 'Student name should contain only letters and spaces', 'GPA must be a valid number']
     """
-    def __init__(self, name: str, gpa: float):
+    __slots__ = ('name', 'gpa', 'student_id')
+
+    def __init__(self, name: str, gpa: float, student_id: Optional[int] = None):
         self.name = name
         self.gpa = gpa
+        self.student_id = student_id
+
+    def __repr__(self) -> str:
+        return f"Student({self.name!r}, {self.gpa!r}, {self.student_id!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Student):
+            return NotImplemented
+        return (self.name, self.gpa, self.student_id) == (other.name, other.gpa, other.student_id)
 
     @staticmethod # static method to validate student data
     def validate_student_data(name: str, gpa: float) -> Tuple[bool, str]:
         if not all(c.isalpha() or c.isspace() for c in name):
-            return False, "Student name should contain only letters and spaces"
+            return False, NAME_ERROR
         try:
             gpa = float(gpa)
             if not (0.0 <= gpa <= 100.0):
-                return False, "GPA must be between 0.0 and 100.0"
-        except ValueError:
-            return False, "GPA must be a valid number"
-        return True, ""
\ No newline at end of file
+                return False, RANGE_ERROR
+        except (TypeError, ValueError):
+            return False, NUMBER_ERROR
+        return True, ""
+
+    @staticmethod
+    def validate_batch(names: Iterable[str], gpas: Iterable) -> List[str]:
+        """
+        Validate columns of names and GPAs in one pass.
+
+        Gives the same verdict as validate_student_data for every row, but
+        names are checked NAME_CHUNK at a time with a single isalpha() call
+        and GPAs are converted and range-checked as one NumPy array (a
+        plain loop without NumPy).
+
+        Args:
+            names (Iterable[str]): Student names
+            gpas (Iterable): GPAs as numbers or strings, same length as names
+
+        Returns:
+            List[str]: Error message per row, '' for valid rows
+
+        Raises:
+            ValueError: If the columns differ in length
+        """
+        names = names if isinstance(names, list) else list(names)
+        gpas = gpas if isinstance(gpas, list) else list(gpas)
+        if len(names) != len(gpas):
+            raise ValueError("names and gpas must have the same length")
+        errors = _gpa_errors(gpas)
+        for index in _invalid_names(names):
+            errors[index] = NAME_ERROR
+        return errors
\ No newline at end of file
@@ -0,0 +1,238 @@
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from models.student import Student
+
+EMPTY = 0
+DELETED = 0xFFFFFFFF
+
+class StudentTable(MutableMapping):
+    """Compact column store of a group: student ID to (name, gpa), in insertion order.
+
+    Instead of a dict of tuples with a str, a float and an int object per
+    student, every student takes one row of typed arrays:
+
+        ids    array('I')  student ID, 0 for a deleted row
+        gpas   array('d')  GPA
+        starts array('Q')  offset of the name in the UTF-8 name pool
+        pool   bytearray   all names, encoded one after another
+
+    IDs map to rows through a dense array('I') indexed by ID (row + 1,
+    0 if absent), with a dict only for IDs far beyond the group size.
+    Names are found through an open-addressing hash table of rows keyed by
+    the lowercased name, so case-insensitive lookups need no second dict.
+    All of that is roughly 40 bytes per student plus the name itself.
+
+    Deleting leaves an empty row behind; once more than half of the rows
+    are empty the table is rebuilt. The table is a MutableMapping, so it
+    can be used like the dict it replaces.
+
+    ----------------------------------------
+
+    Methods:
+        add(student_id, name, gpa): Appends a student, replacing one with the same ID
+        pop(student_id): Removes a student and returns (name, gpa)
+        ids_named(name): IDs of the students with this name, any case
+        has_name(name): Whether a student has this name, any case
+        rows(): Yields (id, name, gpa) in insertion order
+        student(student_id): The entry as a Student object
+        nbytes(): Bytes held by the arrays and the name pool
+
+    Examples:
+        >>> table = StudentTable([(1, "John Smith", 85.5), (2, "Emma Davis", 90.0)])
+        >>> table[2]
+        ('Emma Davis', 90.0)
+        >>> table.ids_named("JOHN SMITH")
+        [1]
+    """
+    SPARSE_GAP = 1024
+
+    def __init__(self, rows: Iterable[Tuple[int, str, float]] = ()):
+        self._clear()
+        for student_id, name, gpa in rows:
+            self._append(student_id, name, gpa)
+        self._rebuild_names()
+
+    def _clear(self):
+        self.ids = array('I')
+        self.gpas = array('d')
+        self.starts = array('Q', [0])
+        self.pool = bytearray()
+        self._positions = array('I')
+        self._sparse: Dict[int, int] = {}
+        self._buckets = array('I', bytes(4 * 8))
+        self._used = 0  # Buckets holding a row or a deleted marker
+        self._live = 0
+
+    # Rows
+
+    def _append(self, student_id: int, name: str, gpa: float) -> int:
+        if student_id < 1:
+            raise ValueError("Student IDs start at 1")
+        if self._row(student_id) is not None:
+            self.pop(student_id)
+        row = len(self.ids)
+        self.ids.append(student_id)
+        self.gpas.append(gpa)
+        self.pool += name.encode('utf-8')
+        self.starts.append(len(self.pool))
+        self._set_row(student_id, row)
+        self._live += 1
+        return row
+
+    def _name(self, row: int) -> str:
+        return self.pool[self.starts[row]:self.starts[row + 1]].decode('utf-8')
+
+    def _row(self, student_id: int) -> Optional[int]:
+        positions = self._positions
+        if 0 < student_id < len(positions):
+            row = positions[student_id]
+            return row - 1 if row else None
+        return self._sparse.get(student_id)
+
+    def _set_row(self, student_id: int, row: Optional[int]):
+        positions = self._positions
+        if student_id >= len(positions) and student_id < 2 * len(self.ids) + self.SPARSE_GAP:
+            positions.frombytes(bytes(4 * (student_id + 1 - len(positions) + len(positions) // 2)))
+            for sparse_id in [key for key in self._sparse if key < len(positions)]:
+                positions[sparse_id] = self._sparse.pop(sparse_id) + 1
+        if student_id < len(positions):
+            positions[student_id] = 0 if row is None else row + 1
+        elif row is None:
+            self._sparse.pop(student_id, None)
+        else:
+            self._sparse[student_id] = row
+
+    def _compact(self):
+        rows = list(self.rows())
+        self._clear()
+        for student_id, name, gpa in rows:
+            self._append(student_id, name, gpa)
+        self._rebuild_names()
+
+    # Name hash table: buckets hold row + 1, EMPTY or DELETED
+
+    def _rebuild_names(self):
+        size = 8
+        while size < 2 * self._live + 2:
+            size *= 2
+        self._buckets = array('I', bytes(4 * size))
+        self._used = 0
+        for row, student_id in enumerate(self.ids):
+            if student_id:
+                self._link_name(row)
+
+    def _link_name(self, row: int):
+        buckets = self._buckets
+        mask = len(buckets) - 1
+        index = hash(self._name(row).lower()) & mask
+        while buckets[index] != EMPTY and buckets[index] != DELETED:
+            index = (index + 1) & mask
+        if buckets[index] == EMPTY:
+            self._used += 1
+        buckets[index] = row + 1
+
+    def _unlink_name(self, row: int):
+        buckets = self._buckets
+        mask = len(buckets) - 1
+        index = hash(self._name(row).lower()) & mask
+        while buckets[index] != EMPTY:
+            if buckets[index] == row + 1:
+                buckets[index] = DELETED
+                return
+            index = (index + 1) & mask
+
+    def _rows_named(self, key: str) -> Iterator[int]:
+        buckets = self._buckets
+        mask = len(buckets) - 1
+        index = hash(key) & mask
+        while True:
+            bucket = buckets[index]
+            if bucket == EMPTY:
+                return
+            if bucket != DELETED and self._name(bucket - 1).lower() == key:
+                yield bucket - 1
+            index = (index + 1) & mask
+
+    # Public interface
+
+    def add(self, student_id: int, name: str, gpa: float):
+        """Append a student; an existing entry with the same ID is replaced."""
+        row = self._append(student_id, name, gpa)
+        if 2 * (self._used + 1) > len(self._buckets):
+            self._rebuild_names()
+        else:
+            self._link_name(row)
+
+    def pop(self, student_id: int, *default):
+        """Remove a student and return (name, gpa)."""
+        row = self._row(student_id)
+        if row is None:
+            if default:
+                return default[0]
+            raise KeyError(student_id)
+        entry = (self._name(row), self.gpas[row])
+        self._unlink_name(row)
+        self._set_row(student_id, None)
+        self.ids[row] = 0
+        self._live -= 1
+        if len(self.ids) > 2 * self._live + 1024:
+            self._compact()
+        return entry
+
+    def ids_named(self, name: str) -> List[int]:
+        """Return the IDs of students with this name, ignoring case, in insertion order."""
+        return [self.ids[row] for row in sorted(self._rows_named(name.lower()))]
+
+    def has_name(self, name: str) -> bool:
+        """Return True if a student has this name, ignoring case."""
+        return next(self._rows_named(name.lower()), None) is not None
+
+    def rows(self) -> Iterator[Tuple[int, str, float]]:
+        """Yield (id, name, gpa) entries in insertion order."""
+        ids, gpas = self.ids, self.gpas
+        for row in range(len(ids)):
+            if ids[row]:
+                yield ids[row], self._name(row), gpas[row]
+
+    def student(self, student_id: int) -> Student:
+        """Return the entry of student_id as a Student."""
+        name, gpa = self[student_id]
+        return Student(name, gpa, student_id)
+
+    def nbytes(self) -> int:
+        """Bytes held by the arrays and the name pool, without Python object headers."""
+        arrays = (self.ids, self.gpas, self.starts, self._positions, self._buckets)
+        return sum(len(column) * column.itemsize for column in arrays) + len(self.pool)
+
+    # MutableMapping
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, student_id) -> bool:
+        return isinstance(student_id, int) and self._row(student_id) is not None
+
+    def __getitem__(self, student_id: int) -> Tuple[str, float]:
+        row = self._row(student_id) if isinstance(student_id, int) else None
+        if row is None:
+            raise KeyError(student_id)
+        return self._name(row), self.gpas[row]
+
+    def __setitem__(self, student_id: int, entry: Tuple[str, float]):
+        self.add(student_id, *entry)
+
+    def __delitem__(self, student_id: int):
+        self.pop(student_id)
+
+    def __iter__(self) -> Iterator[int]:
+        return (student_id for student_id in self.ids if student_id)
+
+    def items(self):
+        return ((student_id, (name, gpa)) for student_id, name, gpa in self.rows())
+
+    def values(self):
+        return ((name, gpa) for _, name, gpa in self.rows())
+
+    def __repr__(self) -> str:
+        return f"StudentTable({len(self)} students)"
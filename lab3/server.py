@@ -0,0 +1,236 @@
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from managers.student_manager import StudentManager
+from models.student import Student
+
+MAX_BATCH = 256
+
+class RequestError(Exception):
+    """Error reported back to the client instead of closing the connection."""
+
+class StudentServer:
+    """Asyncio JSON-lines server in front of one warm StudentManager.
+
+    Every request is one JSON object per line and gets one JSON line back,
+    matched by "id"; clients may pipeline requests, so responses can come
+    back in a different order.
+
+    Requests for the same group are queued and run in batches: one worker
+    task per group takes everything that queued up while the previous
+    batch ran and executes it in the thread pool under a single store
+    transaction. Different groups run in parallel, and a store is never
+    used by two threads at once.
+
+    ----------------------------------------
+
+    Requests:
+        {"id": 1, "op": "add", "group": "121", "name": "John Smith", "gpa": 85.5}
+        {"id": 2, "op": "delete", "group": "121", "student": "John Smith"}
+        {"id": 3, "op": "search", "group": "121", "pattern": "smith"}
+        {"id": 4, "op": "sort", "group": "121"}
+        {"id": 5, "op": "show", "group": "121"}
+        {"id": 6, "op": "groups"}
+
+    Responses:
+        {"id": 1, "ok": true, "result": 13}
+        {"id": 2, "ok": false, "error": "Student 'John Smith' not found"}
+
+    Examples:
+        >>> server = StudentServer(StudentManager("groups", fast_start=True))
+        >>> asyncio.run(server.serve(port=8765))
+    """
+    def __init__(self, manager: StudentManager, workers: int = 4):
+        self.manager = manager
+        self.file_manager = manager.file_manager
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: List[asyncio.Task] = []
+        self.handlers = {
+            'add': self._add,
+            'delete': self._delete,
+            'search': self._search,
+            'sort': self._sort,
+            'show': self._show,
+        }
+
+    # Operations, run in the thread pool under the group's transaction
+
+    @staticmethod
+    def _add(store, request):
+        name = str(request.get('name', '')).strip()
+        gpa = request.get('gpa')
+        valid, message = Student.validate_student_data(name, gpa)
+        if not valid or not name:
+            raise RequestError(message or "Student name is required")
+        if store.has_name(name):
+            raise RequestError(f"Student '{name}' already exists")
+        return store.add(name, float(gpa))
+
+    @staticmethod
+    def _delete(store, request):
+        identifier = str(request.get('student', ''))
+        deleted = store.delete(identifier)
+        if not deleted:
+            raise RequestError(f"Student '{identifier}' not found")
+        return [list(entry) for entry in deleted]
+
+    @staticmethod
+    def _search(store, request):
+        return store.search(str(request.get('pattern', '')))
+
+    @staticmethod
+    def _sort(store, request):
+        store.sort_by_gpa()
+        return len(store)
+
+    @staticmethod
+    def _show(store, request):
+        return [line.rstrip('\n') for line in store.lines()]
+
+    def _run_batch(self, group_name: str, batch: List[dict]) -> List[dict]:
+        """Run a batch of requests for one group; called in the thread pool."""
+        if not self.file_manager._has_group(group_name):
+            return [self._error(request, f"Group {group_name} does not exist") for request in batch]
+
+        store = self.file_manager.group_store(group_name)
+        responses = []
+        with store.transaction():
+            for request in batch:
+                try:
+                    result = self.handlers[request['op']](store, request)
+                    responses.append({'id': request.get('id'), 'ok': True, 'result': result})
+                except RequestError as e:
+                    responses.append(self._error(request, str(e)))
+                except Exception as e:
+                    # Only this request failed; earlier ones are committed and keep their answers
+                    responses.append(self._error(request, f"Internal error: {e}"))
+        return responses
+
+    @staticmethod
+    def _error(request, message: str) -> dict:
+        return {'id': request.get('id') if isinstance(request, dict) else None, 'ok': False, 'error': message}
+
+    # Request routing
+
+    async def _group_worker(self, group_name: str, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await queue.get()]
+            while not queue.empty() and len(pending) < MAX_BATCH:
+                pending.append(queue.get_nowait())
+
+            requests = [request for request, _ in pending]
+            try:
+                responses = await loop.run_in_executor(self.executor, self._run_batch, group_name, requests)
+            except Exception as e:  # Loading or locking the group failed, no request ran
+                responses = [self._error(request, f"Internal error: {e}") for request in requests]
+            for (_, future), response in zip(pending, responses):
+                if not future.done():
+                    future.set_result(response)
+
+    async def handle(self, request) -> dict:
+        """Answer one decoded request."""
+        if not isinstance(request, dict):
+            return self._error(request, "Request must be a JSON object")
+        op = request.get('op')
+        if op == 'groups':
+            loop = asyncio.get_running_loop()
+            names = await loop.run_in_executor(self.executor, self.file_manager.group_names)
+            return {'id': request.get('id'), 'ok': True, 'result': sorted(names)}
+        if op not in self.handlers:
+            return self._error(request, f"Unknown operation '{op}'")
+        if not isinstance(request.get('group'), str):
+            return self._error(request, "Field 'group' is required")
+
+        group_name = request['group']
+        queue = self._queues.get(group_name)
+        if queue is None:
+            queue = self._queues[group_name] = asyncio.Queue()
+            self._workers.append(asyncio.create_task(self._group_worker(group_name, queue)))
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((request, future))
+        return await future
+
+    async def _answer(self, line: bytes, writer: asyncio.StreamWriter):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            response = self._error(None, f"Invalid JSON: {e}")
+        else:
+            response = await self.handle(request)
+        writer.write(json.dumps(response).encode('utf-8') + b'\n')
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                task = asyncio.create_task(self._answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                await writer.drain()
+            if tasks:
+                await asyncio.wait(tasks)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8765, unix_path: Optional[str] = None,
+                    ready: Optional[asyncio.Event] = None):
+        """
+        Accept clients until cancelled.
+
+        ----------------------------------------
+
+        Args:
+            host (str): TCP address to listen on
+            port (int): TCP port to listen on
+            unix_path (str, optional): Listen on this Unix socket instead of TCP
+            ready (asyncio.Event, optional): Set once the server is listening
+        """
+        if unix_path:
+            server = await asyncio.start_unix_server(self._client, path=unix_path)
+        else:
+            server = await asyncio.start_server(self._client, host, port)
+        self.manager.log.print(f"Listening on {unix_path or f'{host}:{port}'}", "setup")
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for worker in self._workers:
+                worker.cancel()
+            self.executor.shutdown(wait=True)
+
+def run(directory: str, host: str, port: int, unix_path: str = None, storage: str = 'text',
+        workers: int = 4, quiet: bool = False):
+    """Build a manager for directory and serve it; used by main() and the load test."""
+    with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+        manager = StudentManager(directory, fast_start=True, storage=storage)
+        server = StudentServer(manager, workers)
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(server.serve(host, port, unix_path))
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON-lines server for the lab3 student manager")
+    parser.add_argument('--directory', default="groups", help="Directory with the group files")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="Listen on a Unix socket at this path instead of TCP")
+    parser.add_argument('--storage', choices=['text', 'columnar', 'sqlite'], default='text')
+    parser.add_argument('--workers', type=int, default=4, help="Threads for file I/O")
+    args = parser.parse_args()
+    run(args.directory, args.host, args.port, args.unix, args.storage, args.workers)
+
+if __name__ == "__main__":
+    main()
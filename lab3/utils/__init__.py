@@ -1,4 +1,13 @@
 from .logger import Logger
 from .file_manager import FileManager
+from .group_store import GroupStore
+from .columnar import ColumnarGroup, ColumnarGroupStore
+from .sqlite_store import SqliteDatabase, SqliteGroupStore
+from .query import QueryEngine, StudentQuery
+from .metrics import Metrics, metrics
+from .group_cache import GroupCache, group_cache
+from .analytics import GroupAnalytics, GpaStats
 
-__all__ = ['Logger', 'FileManager']
\ No newline at end of file
+__all__ = ['Logger', 'FileManager', 'GroupStore', 'ColumnarGroup', 'ColumnarGroupStore',
+           'SqliteDatabase', 'SqliteGroupStore', 'QueryEngine', 'StudentQuery',
+           'Metrics', 'metrics', 'GroupCache', 'group_cache', 'GroupAnalytics', 'GpaStats']
\ No newline at end of file
@@ -0,0 +1,237 @@
+import math
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from models.student_table import StudentTable
+from utils.file_manager import FileManager
+from utils.metrics import metrics
+
+try:
+    import numpy
+except ImportError:  # Statistics are computed in plain Python instead
+    numpy = None
+
+PERCENTILES = (10, 25, 50, 75, 90, 99)
+HISTOGRAM_BINS = 10  # 0-10, 10-20, ..., 90-100 (the last bin includes 100)
+
+class GpaStats:
+    """GPA statistics of one group or of several groups together.
+
+    ----------------------------------------
+
+    Attributes:
+        count (int): Number of students
+        mean (float): Mean GPA, None for an empty group
+        stddev (float): Population standard deviation, None for an empty group
+        minimum (float): Lowest GPA, None for an empty group
+        maximum (float): Highest GPA, None for an empty group
+        percentiles (Dict[int, float]): GPA at each of PERCENTILES, linearly
+                                        interpolated like numpy.percentile
+        histogram (List[int]): Students per 10-point GPA bin
+        median (float): The 50th percentile
+    """
+    __slots__ = ('count', 'mean', 'stddev', 'minimum', 'maximum', 'percentiles', 'histogram')
+
+    def __init__(self, count: int = 0, mean: float = None, stddev: float = None, minimum: float = None,
+                 maximum: float = None, percentiles: Dict[int, float] = None, histogram: List[int] = None):
+        self.count = count
+        self.mean = mean
+        self.stddev = stddev
+        self.minimum = minimum
+        self.maximum = maximum
+        self.percentiles = percentiles or {}
+        self.histogram = histogram or [0] * HISTOGRAM_BINS
+
+    @property
+    def median(self) -> Optional[float]:
+        return self.percentiles.get(50)
+
+    def as_dict(self) -> dict:
+        return {'count': self.count, 'mean': self.mean, 'median': self.median, 'stddev': self.stddev,
+                'min': self.minimum, 'max': self.maximum,
+                'percentiles': {str(percent): value for percent, value in self.percentiles.items()},
+                'histogram': self.histogram}
+
+def _percentile(ordered: Sequence[float], percent: float) -> float:
+    # Linear interpolation between closest ranks, numpy's default method
+    position = (len(ordered) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def compute_stats(gpas) -> GpaStats:
+    """
+    Compute GpaStats of a GPA column.
+
+    With NumPy the column is reduced as one float64 array; without it one
+    pass collects count, mean and variance (Welford), extremes and the
+    histogram, and a sort gives the percentiles.
+
+    ----------------------------------------
+
+    Args:
+        gpas: GPAs as a NumPy array or any sequence of floats
+
+    Returns:
+        GpaStats: Statistics of the column
+    """
+    if numpy is not None:
+        values = numpy.asarray(gpas, dtype=numpy.float64)
+        if not len(values):
+            return GpaStats()
+        histogram, _ = numpy.histogram(values, bins=HISTOGRAM_BINS, range=(0.0, 100.0))
+        percentiles = numpy.percentile(values, PERCENTILES)
+        return GpaStats(len(values), float(values.mean()), float(values.std()), float(values.min()),
+                        float(values.max()), dict(zip(PERCENTILES, percentiles.tolist())), histogram.tolist())
+
+    count, mean, squares = 0, 0.0, 0.0
+    histogram = [0] * HISTOGRAM_BINS
+    for gpa in gpas:
+        count += 1
+        delta = gpa - mean
+        mean += delta / count
+        squares += delta * (gpa - mean)
+        histogram[min(max(int(gpa // 10), 0), HISTOGRAM_BINS - 1)] += 1
+    if not count:
+        return GpaStats()
+    ordered = sorted(gpas)
+    return GpaStats(count, mean, math.sqrt(squares / count), ordered[0], ordered[-1],
+                    {percent: _percentile(ordered, percent) for percent in PERCENTILES}, histogram)
+
+def gpa_column(store):
+    """
+    Return the GPAs of a group store as one column.
+
+    A StudentTable hands out its GPA array directly (without the rows of
+    deleted students); other stores are read row by row.
+    """
+    table = getattr(store, 'students', None)
+    if isinstance(table, StudentTable):
+        if numpy is not None:
+            ids = numpy.frombuffer(table.ids, dtype=numpy.uint32)
+            return numpy.frombuffer(table.gpas, dtype=numpy.float64)[ids != 0]
+        return [gpa for student_id, gpa in zip(table.ids, table.gpas) if student_id]
+    return [gpa for _, _, gpa in store.rows()]
+
+class GroupAnalytics:
+    """Read-only GPA statistics per group and across groups.
+
+    The GPA column and statistics of a group are cached together with the
+    size and modification time of its files (group file and journal, or
+    the SQLite database); as long as those don't change, repeated queries
+    neither reload nor rescan the group. Nothing is ever written.
+
+    ----------------------------------------
+
+    Attributes:
+        file_manager (FileManager): Source of the group stores
+
+    Methods:
+        group_stats(group_name): Statistics of one group
+        overall_stats(group_names): Statistics of several groups together
+        report(group_names): Table of per-group and overall statistics
+
+    Examples:
+        >>> analytics = GroupAnalytics(manager.file_manager)
+        >>> analytics.group_stats("121").median
+        72.5
+        >>> print(analytics.report())
+    """
+    def __init__(self, file_manager: FileManager):
+        self.file_manager = file_manager
+        self._cache: Dict[str, Tuple[tuple, GpaStats, object]] = {}
+
+    def _version(self, group_name: str) -> tuple:
+        """(inode, mtime, size) of every file the group is stored in; None for a missing file."""
+        if self.file_manager.storage == 'sqlite':
+            path = os.path.join(self.file_manager.directory, self.file_manager.DATABASE_NAME)
+            paths = (path, f"{path}-wal")
+        else:
+            path = self.file_manager.group_path(group_name)
+            paths = (path, f"{path}.wal")
+        version = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                version.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
+
+    def _column(self, group_name: str) -> Tuple[GpaStats, object]:
+        version = self._version(group_name)
+        cached = self._cache.get(group_name)
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+        column = gpa_column(self.file_manager.group_store(group_name))
+        stats = compute_stats(column)
+        self._cache[group_name] = (version, stats, column)
+        return stats, column
+
+    def _group_names(self, group_names: Optional[Iterable[str]]) -> List[str]:
+        if group_names is None:
+            return sorted(self.file_manager.group_names())
+        return [group for group in group_names if self.file_manager.group_exists(group)]
+
+    @metrics.timed()
+    def group_stats(self, group_name: str) -> Optional[GpaStats]:
+        """
+        Return the statistics of one group.
+
+        ----------------------------------------
+
+        Args:
+            group_name (str): The group to describe
+
+        Returns:
+            Optional[GpaStats]: Statistics, None if the group does not exist
+        """
+        if not self.file_manager.group_exists(group_name):
+            return None
+        return self._column(group_name)[0]
+
+    @metrics.timed()
+    def overall_stats(self, group_names: Iterable[str] = None) -> GpaStats:
+        """Return the statistics of the given groups (all groups by default) taken together."""
+        columns = [self._column(group)[1] for group in self._group_names(group_names)]
+        if numpy is not None:
+            return compute_stats(numpy.concatenate(columns) if columns else [])
+        return compute_stats([gpa for column in columns for gpa in column])
+
+    def report(self, group_names: Iterable[str] = None) -> str:
+        """
+        Format per-group and overall statistics as a table with a histogram.
+
+        ----------------------------------------
+
+        Args:
+            group_names (Iterable[str], optional): Groups to include, all by default
+
+        Returns:
+            str: The report, ready to print
+        """
+        groups = self._group_names(group_names)
+        header = (f"{'Group':<12} {'Students':>9} {'Mean':>7} {'Median':>7} {'StdDev':>7} "
+                  f"{'Min':>6} {'Max':>6} {'P10':>6} {'P90':>6}")
+        lines = [header, "-" * len(header)]
+
+        def row(label: str, stats: GpaStats) -> str:
+            if not stats.count:
+                return f"{label:<12} {0:>9}"
+            return (f"{label:<12} {stats.count:>9} {stats.mean:>7.2f} {stats.median:>7.2f} "
+                    f"{stats.stddev:>7.2f} {stats.minimum:>6.1f} {stats.maximum:>6.1f} "
+                    f"{stats.percentiles[10]:>6.1f} {stats.percentiles[90]:>6.1f}")
+
+        for group in groups:
+            lines.append(row(group, self._column(group)[0]))
+        overall = self.overall_stats(groups)
+        lines.append("-" * len(header))
+        lines.append(row("All groups", overall))
+
+        if overall.count:
+            lines.append("")
+            lines.append("GPA distribution:")
+            widest = max(overall.histogram)
+            for index, count in enumerate(overall.histogram):
+                bar = '█' * round(40 * count / widest) if widest else ''
+                lines.append(f"  {index * 10:>3}-{index * 10 + 10:<3} {bar} {count}")
+        return '\n'.join(lines)
@@ -0,0 +1,272 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Tuple
+from utils.group_store import GroupStore
+from utils.journal import Journal
+from utils.metrics import metrics
+
+MAGIC = b'GRPC'
+VERSION = 1
+EXTENSION = '.grp'
+
+# magic, version, flags, student count, header size, names size
+FILE_HEADER = struct.Struct('<4sHHIIQ')
+
+def _padding(size: int) -> int:
+    return -size % 8
+
+def write_columnar(path: str, header: List[str], rows: Iterable[Tuple[int, float, str]]):
+    """
+    Write a group in the binary columnar format.
+
+    Layout (little-endian, every section 8-byte aligned):
+    file header | header text | GPAs (float64) | name offsets (uint64, count + 1)
+    | IDs (uint32) | UTF-8 names, concatenated
+
+    ----------------------------------------
+
+    Args:
+        path (str): Output file path
+        header (List[str]): Non-student lines of the group, with newlines
+        rows (Iterable[Tuple[int, float, str]]): (id, gpa, name) entries in file order
+    """
+    ids, gpas, offsets = array('I'), array('d'), array('Q', [0])
+    names = bytearray()
+    for student_id, gpa, name in rows:
+        ids.append(student_id)
+        gpas.append(gpa)
+        names += name.encode('utf-8')
+        offsets.append(len(names))
+    if sys.byteorder != 'little':
+        for column in (ids, gpas, offsets):
+            column.byteswap()
+
+    header_text = ''.join(header).encode('utf-8')
+    ids_bytes = ids.tobytes()
+    with open(path, 'wb') as file:
+        file.write(FILE_HEADER.pack(MAGIC, VERSION, 0, len(ids), len(header_text), len(names)))
+        file.write(header_text + b'\0' * _padding(len(header_text)))
+        file.write(gpas.tobytes())
+        file.write(offsets.tobytes())
+        file.write(ids_bytes + b'\0' * _padding(len(ids_bytes)))
+        file.write(names)
+
+class ColumnarGroup:
+    """Read-only, memory-mapped view of a columnar group file.
+
+    IDs, GPAs and name offsets are exposed as memoryviews straight over the
+    mapped file, so opening a group costs the same for ten students and for
+    ten million; only the names that are actually asked for get decoded.
+
+    ----------------------------------------
+
+    Attributes:
+        path (str): Path to the group file
+        header (List[str]): Non-student lines of the group
+        ids (memoryview): Student IDs, format 'I'
+        gpas (memoryview): Student GPAs, format 'd'
+
+    Methods:
+        name(index): Decodes the name of the student at position index
+        row(index): Returns (id, gpa, name) at position index
+        rows(): Yields all (id, gpa, name) entries in file order
+        names(): Decodes all names
+        order_by_gpa(descending): Positions of the students sorted by GPA
+        close(): Unmaps the file
+
+    Examples:
+        >>> with ColumnarGroup("groups/121.grp") as group:
+        ...     best = group.row(group.order_by_gpa()[0])
+
+    Raises:
+        ValueError: If the file is not a columnar group file
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._views: List[memoryview] = []
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _view(self, start: int, size: int, fmt: str = 'B') -> memoryview:
+        view = self._buffer[start:start + size]
+        if fmt != 'B':
+            view = view.cast(fmt)
+        self._views.append(view)
+        return view
+
+    def _parse(self):
+        self._buffer = memoryview(self._map)
+        if len(self._buffer) < FILE_HEADER.size:
+            raise ValueError(f"{self.path} is not a columnar group file")
+        magic, version, _, count, header_size, names_size = FILE_HEADER.unpack_from(self._buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a columnar group file")
+
+        position = FILE_HEADER.size
+        self.header = str(self._buffer[position:position + header_size], 'utf-8').splitlines(keepends=True)
+        position += header_size + _padding(header_size)
+        sections = [('gpas', 8 * count, 'd'), ('_offsets', 8 * (count + 1), 'Q'), ('ids', 4 * count, 'I')]
+        for attribute, size, fmt in sections:
+            if sys.byteorder == 'little':
+                setattr(self, attribute, self._view(position, size, fmt))
+            else:
+                column = array(fmt, self._buffer[position:position + size])
+                column.byteswap()
+                setattr(self, attribute, column)
+            position += size + _padding(size)
+        self._names = self._view(position, names_size)
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def name(self, index: int) -> str:
+        """Decode the name of the student at position index."""
+        return str(self._names[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+
+    def row(self, index: int) -> Tuple[int, float, str]:
+        """Return (id, gpa, name) of the student at position index."""
+        return self.ids[index], self.gpas[index], self.name(index)
+
+    def names(self) -> List[str]:
+        """Decode all names at once."""
+        blob = bytes(self._names)
+        offsets = self._offsets.tolist()
+        return [blob[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+    def rows(self) -> Iterator[Tuple[int, float, str]]:
+        """Yield (id, gpa, name) entries in file order."""
+        return zip(self.ids.tolist(), self.gpas.tolist(), self.names())
+
+    def order_by_gpa(self, descending: bool = True) -> List[int]:
+        """
+        Sort student positions by GPA without decoding any names.
+
+        ----------------------------------------
+
+        Args:
+            descending (bool): Highest GPA first. Defaults to True
+
+        Returns:
+            List[int]: Positions, stable for equal GPAs
+        """
+        gpas = self.gpas.tolist()
+        return sorted(range(len(gpas)), key=gpas.__getitem__, reverse=descending)
+
+    def close(self):
+        """Release the column views and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if getattr(self, '_buffer', None) is not None:
+            self._buffer.release()
+            self._buffer = None
+        if not self._map.closed:
+            self._map.close()
+
+class ColumnarGroupStore(GroupStore):
+    """GroupStore kept in the binary columnar format.
+
+    Loading decodes whole columns instead of parsing text lines. Adds and
+    deletes go to the same text journal as for text groups, so they stay
+    cheap; compaction rewrites the columnar file.
+    """
+    def _read(self):
+        size = os.path.getsize(self.path)
+        metrics.record_io(read=size, opened=1)
+        if size == 0:
+            return [], []
+        with ColumnarGroup(self.path) as group:
+            return group.header, list(group.rows())
+
+    def _write(self, path: str):
+        write_columnar(path, self.header, ((student_id, gpa, name)
+                                           for student_id, name, gpa in self.students.rows()))
+        if metrics.enabled:
+            metrics.record_io(written=os.path.getsize(path), opened=1)
+
+def read_text_group(path: str) -> Tuple[List[str], List[Tuple[int, float, str]]]:
+    """
+    Split a text group into header lines and (id, gpa, name) rows.
+
+    The group is loaded through GroupStore, so students that are still in
+    its journal (<path>.wal) and not yet compacted into the file are included.
+    """
+    store = GroupStore(path)
+    return store.header, [(student_id, gpa, name) for student_id, name, gpa in store.rows()]
+
+def text_to_columnar(text_path: str, columnar_path: str = None) -> str:
+    """
+    Convert a .txt group file to the columnar format.
+
+    ----------------------------------------
+
+    Args:
+        text_path (str): Existing text group file
+        columnar_path (str, optional): Output path. Defaults to text_path with a .grp extension
+
+    Returns:
+        str: Path of the columnar file
+    """
+    columnar_path = columnar_path or os.path.splitext(text_path)[0] + EXTENSION
+    header, rows = read_text_group(text_path)
+    temp_path = f"{columnar_path}.tmp"
+    write_columnar(temp_path, header, rows)
+    os.replace(temp_path, columnar_path)
+    Journal(f"{columnar_path}.wal").clear()  # A stale journal would replay over the new file
+    return columnar_path
+
+def columnar_to_text(columnar_path: str, text_path: str = None) -> str:
+    """
+    Convert a columnar group file back to the .txt format.
+
+    Students still in the journal of the columnar group are included.
+    The round trip keeps header lines, IDs, GPAs and names. GPAs are
+    written the way the manager writes them, so a legacy "|49" comes back
+    as "|49.0"; files written by the manager are reproduced byte for byte.
+
+    ----------------------------------------
+
+    Args:
+        columnar_path (str): Existing columnar group file
+        text_path (str, optional): Output path. Defaults to columnar_path with a .txt extension
+
+    Returns:
+        str: Path of the text file
+    """
+    text_path = text_path or os.path.splitext(columnar_path)[0] + '.txt'
+    temp_path = f"{text_path}.tmp"
+    store = ColumnarGroupStore(columnar_path)
+    with open(temp_path, 'w') as file:
+        file.writelines(store.lines())
+    os.replace(temp_path, text_path)
+    Journal(f"{text_path}.wal").clear()
+    return text_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert group files between text and columnar formats")
+    parser.add_argument('direction', choices=['to-columnar', 'to-text'])
+    parser.add_argument('paths', nargs='+', help="Group files to convert")
+    args = parser.parse_args()
+
+    convert = text_to_columnar if args.direction == 'to-columnar' else columnar_to_text
+    for path in args.paths:
+        print(f"{path} -> {convert(path)}")
+
+if __name__ == "__main__":
+    main()
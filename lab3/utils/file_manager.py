@@ -1,6 +1,12 @@
 import os
-from typing import List
+from typing import Dict, List, Optional
 from utils.logger import Logger
+from utils.group_store import GroupStore
+from utils.columnar import ColumnarGroupStore, EXTENSION as COLUMNAR_EXTENSION, write_columnar
+from utils.sqlite_store import SqliteDatabase
+from utils.group_cache import group_cache
+from utils import reorganize
+from utils.metrics import metrics
 
 class FileManager:
     """Class to manage file operations for student groups.
@@ -13,20 +19,35 @@ class FileManager:
     Args:
         directory (str): The base directory path where group files are stored.
         log (Logger): Logger instance for recording operations and errors.
+        storage (str): Group storage, 'text' (.txt), 'columnar' (.grp) or
+                       'sqlite' (all groups in groups.db).
 
     Methods:
         _ensure_directory_exists(): `Creates the directory if it doesn't exist.`
         create_group_file(group_name: str): `Creates a new file for a student group.`
+        group_path(group_name: str) -> str: `Returns the path of a group file.`
+        group_names() -> List[str]: `Lists the groups in the directory.`
         group_exists(group_name: str) -> bool: `Checks if a group file exists.`
+        group_store(group_name: str) -> GroupStore: `Returns the in-memory store of a group file.`
         has_duplicate_name(group_name: str, student_name: str) -> bool: `Checks for duplicate student names in a group.`
         show_group_file(group_name: str) -> bool: `Displays the contents of a group file.`
         sort_by_gpa(group_name: str) -> bool: `Sorts students in a group by their GPA.`
+        merge_groups(group_names, target, order) -> dict: `Merges groups into one.`
+        split_group(group_name, by, bounds) -> dict: `Splits a group by GPA band or name range.`
+        rebalance_groups(group_names) -> dict: `Evens out the sizes of groups.`
 
     Note:
         File Format:
             Each group file is a text file with the following structure:
             - Header with group information
             - Student entries in format: "index. | gpa | name"
+            Columnar group files hold the same data in binary columns,
+            see utils.columnar. With SQLite storage all groups live in one
+            database, see utils.sqlite_store; existing .txt groups are
+            imported when the database is created.
+        Loaded groups are kept in the process-wide utils.group_cache,
+        shared by every FileManager and checked against the file's size
+        and modification time on each use.
 
     Examples:
         >>> file_manager = FileManager("./groups", logger)
@@ -38,10 +59,39 @@ class FileManager:
         OSError: If there are issues with file/directory operations
         Exception: For general errors during file operations
     """
-    def __init__(self, directory: str, logger: Logger):
+    STORAGE_FORMATS = {
+        'text': ('.txt', GroupStore),
+        'columnar': (COLUMNAR_EXTENSION, ColumnarGroupStore),
+        'sqlite': ('.db', None),
+    }
+    DATABASE_NAME = "groups.db"
+
+    def __init__(self, directory: str, logger: Logger, storage: str = 'text'):
+        if storage not in self.STORAGE_FORMATS:
+            raise ValueError(f"Unknown storage format '{storage}'")
         self.directory = directory
         self.log = logger
+        self.storage = storage
+        self.extension, self._store_class = self.STORAGE_FORMATS[storage]
         self._ensure_directory_exists()
+        self._database = self._open_database() if storage == 'sqlite' else None
+
+    def _open_database(self) -> SqliteDatabase:
+        """
+        Opens the SQLite database, importing the text groups when it is new.
+
+        Returns:
+            SqliteDatabase: Open database in the working directory
+        """
+        path = os.path.join(self.directory, self.DATABASE_NAME)
+        is_new = not os.path.exists(path)
+        database = SqliteDatabase(path)
+        if is_new:
+            text_files = sorted(f for f in os.listdir(self.directory) if f.endswith('.txt'))
+            for file_name in text_files:
+                database.import_text_group(os.path.join(self.directory, file_name))
+            self.log.print(f"Imported {len(text_files)} text group(s) into {self.DATABASE_NAME}", "setup")
+        return database
 
     def _ensure_directory_exists(self):
         """
@@ -87,6 +137,26 @@ class FileManager:
         """
 
         self.log.print(f"Creating group file for '{group_name}'...", "folder")
+        if self._database is not None:
+            if self._database.create_group(group_name):
+                self.log.print(f"Group '{group_name}' added to the database", "succ")
+            return
+
+        group_path = self.group_path(group_name)
+        if os.path.exists(group_path):
+            return
+        header = ["Students\n", f"Group: {group_name}\n", "\n"]
+        try:
+            if self.storage == 'columnar':
+                write_columnar(group_path, header, [])
+            else:
+                with open(group_path, 'x') as file:
+                    file.writelines(header)
+            self.log.print(f"Group file '{group_name}' created", "succ")
+        except FileExistsError:
+            pass  # Created by another process in the meantime
+        except OSError as e:
+            self.log.print(f"Error creating group file: {str(e)}", "err")
 
     def search_files(self, pattern: str) -> List[str]:
         """
@@ -101,14 +171,33 @@ class FileManager:
             pattern (str): The search pattern to match file names
 
         Returns:
-            List[str]: A list of matching file names
+            List[str]: A list of matching file names (group names with SQLite storage)
         """
 
         self.log.print(f"Searching for files with pattern '{pattern}'...", "search")
-        files = [f for f in os.listdir(self.directory) if pattern in f]
+        if self._database is not None:
+            files = [name for name in self._database.group_names() if pattern in name]
+        else:
+            files = [f for f in os.listdir(self.directory)
+                     if pattern in f and not f.endswith(('.wal', '.tmp', '.lock'))]
         self.log.print(f"Found {len(files)} files matching '{pattern}'", "succ")
         return files
 
+    def group_path(self, group_name: str) -> str:
+        """Returns the path of the group file in the configured storage format."""
+        return os.path.join(self.directory, f"{group_name}{self.extension}")
+
+    def group_names(self) -> List[str]:
+        """Lists the groups in the directory in the configured storage format."""
+        if self._database is not None:
+            return self._database.group_names()
+        return [os.path.splitext(f)[0] for f in os.listdir(self.directory) if f.endswith(self.extension)]
+
+    def _has_group(self, group_name: str) -> bool:
+        if self._database is not None:
+            return self._database.has_group(group_name)
+        return os.path.exists(self.group_path(group_name))
+
     def group_exists(self, group_name: str) -> bool:
         """
         Checks if a group file exists.
@@ -123,17 +212,42 @@ class FileManager:
         Returns:
             bool: True if the group file exists, False otherwise
         """
-        group_path = os.path.join(self.directory, f"{group_name}.txt")
-        exists = os.path.exists(group_path)
+        exists = self._has_group(group_name)
         if not exists:
             self.log.print(f"Group {group_name} does not exist", "err")
         return exists
     
+    @metrics.timed()
+    def group_store(self, group_name: str) -> GroupStore:
+        """
+        Returns the in-memory store of a group file.
+
+        The file is parsed on first use and kept in the shared group cache;
+        later calls only check whether the file was changed on disk in the
+        meantime. Rarely used groups are dropped from the cache once the
+        loaded groups exceed its memory budget.
+
+        ----------------------------------------
+
+        Args:
+            group_name (str): The name of the group
+
+        Returns:
+            GroupStore: Loaded store for the group
+
+        Raises:
+            OSError: If the group file cannot be read
+        """
+        if self._database is not None:
+            return self._database.group(group_name)
+
+        return group_cache.get(self.group_path(group_name), self._store_class)
+
     def has_duplicate_name(self, group_name: str, student_name: str) -> bool:
         """
         Checks for duplicate student names in a group.
 
-        Searches through the specified group file for any matching student names.
+        Looks the name up in the case-insensitive name index of the group store.
 
         ----------------------------------------
 
@@ -147,24 +261,16 @@ class FileManager:
         Raises:
             Exception: If there are errors reading the file
         """
-        group_path = os.path.join(self.directory, f"{group_name}.txt")
-        
-        if not os.path.exists(group_path):
+        if not self._has_group(group_name):
             return False
             
         try:
-            with open(group_path, 'r') as file:
-                for line in file:
-                    if line.strip() and line[0].isdigit():
-                        # Split the line to get the student name
-                        existing_name = line.split('.')[1].split('\t')[0].strip()
-                        if existing_name.lower() == student_name.lower():
-                            return True
-            return False
+            return self.group_store(group_name).has_name(student_name)
         except Exception as e:
             self.log.print(f"Error checking for duplicates: {str(e)}", "err")
             return False
         
+    @metrics.timed()
     def search_in_file(self, group_name: str, pattern: str) -> List[str]:
         """
         Searches for a pattern in a group file.
@@ -181,19 +287,16 @@ class FileManager:
         Returns:
             List[str]: A list of matching lines from the file
         """
-        group_path = os.path.join(self.directory, f"{group_name}.txt")
-        
-        if not os.path.exists(group_path):
+        if not self._has_group(group_name):
             return []
             
         try:
-            with open(group_path, 'r') as file:
-                lines = [line.strip() for line in file if pattern.lower() in line.lower()]
-            return lines
+            return self.group_store(group_name).search(pattern)
         except Exception as e:
             self.log.print(f"Error searching in file: {str(e)}", "err")
             return []
         
+    @metrics.timed()
     def show_group_file(self, group_name: str) -> bool:
         """
         Displays the contents of a group file.
@@ -216,25 +319,25 @@ class FileManager:
             return False
             
         self.log.print(f"Reading group file '{group_name}'...", "search")
-        group_path = os.path.join(self.directory, f"{group_name}.txt")
-            
         try:
-            with open(group_path, 'r') as file:
-                print("\nFile contents:")
-                print("-" * 40)
-                print(file.read().strip())
-                print("-" * 40 + "\n")
+            content = ''.join(self.group_store(group_name).lines())
+            print("\nFile contents:")
+            print("-" * 40)
+            print(content.strip())
+            print("-" * 40 + "\n")
             return True
         except Exception as e:
             self.log.print(f"Error reading file: {str(e)}", "err")
             return False
 
+    @metrics.timed()
     def sort_by_gpa(self, group_name: str) -> bool:
         """
         Sorts students in a group by their GPA.
 
-        Reads the group file, sorts students by GPA in descending order,
-        and writes the sorted data back to the file.
+        Writes the group back in descending GPA order. The order comes
+        from the group store's maintained GPA ranking, so nothing is
+        re-sorted, and student IDs are kept as they are.
 
         ----------------------------------------
 
@@ -245,8 +348,7 @@ class FileManager:
             bool: True if sorting was successful, False otherwise
 
         Side Effects:
-            - Modifies the group file content
-            - Updates student IDs according to new order
+            - Modifies the group file content (order of entries only)
             - Logs operation status
 
         Note:
@@ -260,57 +362,149 @@ class FileManager:
             >>> # 1. |85.5 | John Smith
             >>> # 2. |90.0 | Emma Davis
             >>> # File contents after:
-            >>> # 1. |90.0 | Emma Davis
-            >>> # 2. |85.5 | John Smith
+            >>> # 2. |90.0 | Emma Davis
+            >>> # 1. |85.5 | John Smith
         """
-        group_path = os.path.join(self.directory, f"{group_name}.txt")
-        
-        if not os.path.exists(group_path):
+        if not self._has_group(group_name):
             self.log.print(f"Group {group_name} does not exist", "err")
             return False
             
         try:
-            with open(group_path, 'r') as file:
-                lines = file.readlines()
-
-            header = []
-            students = []
-            for line in lines:
-                if line.strip() and line[0].isdigit():
-                    try:
-                        # Split line: "1. \t |85.5 \t | John Smith"
-                        id_part = line.split('.')[0].strip()  # "1"
-                        rest = line.split('|')  # [" 1. \t ", "85.5 \t ", " John Smith\n"]
-                        
-                        if len(rest) >= 2:
-                            gpa_str = rest[1].strip()  # "85.5"
-                            name = rest[2].strip()  # "John Smith"
-                            
-                            try:
-                                gpa = float(gpa_str)
-                                students.append((int(id_part), name, gpa))
-                            except ValueError:
-                                self.log.print(f"Uncorrect Value GPA in line: {line.strip()}", "warn")
-                    except IndexError:
-                        self.log.print(f"Uncorrect line format: {line.strip()}", "warn")
-                else:
-                    header.append(line)
-            
-            if not students:
+            store = self.group_store(group_name)
+            if not len(store):
                 self.log.print("No student records found for sorting", "warn")
                 return False
-                
-            # Sort students by GPA in descending order
-            students.sort(key=lambda x: x[2], reverse=True)
-            
-            with open(group_path, 'w') as file: # Write sorted data back to file
-                file.writelines(header)
-                for index, (_, name, gpa) in enumerate(students, 1): # Start index from 1
-                    file.write(f"{index}. \t |{gpa:.1f} \t | {name}\n") # Format GPA to one decimal place
-            
+
+            store.sort_by_gpa()
             self.log.print(f"Group file '{group_name}' sorted by GPA", "succ")
             return True
             
         except Exception as e:
             self.log.print(f"Error sorting by GPA: {str(e)}", "err")
-            return False
\ No newline at end of file
+            return False
+
+    def _reorganizable(self, group_names: List[str]) -> bool:
+        """Checks that bulk group operations can run on the given groups."""
+        if self.storage != 'text':
+            self.log.print("Merging, splitting and rebalancing need text storage", "err")
+            return False
+        return all(self.group_exists(group_name) for group_name in group_names)
+
+    def _forget(self, group_names: List[str]):
+        """Drops cached stores of groups that were removed or replaced."""
+        for group_name in group_names:
+            group_cache.discard(self.group_path(group_name))
+
+    def merge_groups(self, group_names: List[str], target: str, order: str = 'gpa') -> Optional[dict]:
+        """
+        Merges groups into one group file.
+
+        The group files are streamed through a k-way merge instead of being
+        loaded; students are renumbered in output order and a name found in
+        several groups is kept once (see utils.reorganize.merge_groups).
+
+        ----------------------------------------
+
+        Args:
+            group_names (List[str]): The groups to merge
+            target (str): The merged group, one of group_names or a new group
+            order (str): 'gpa' for highest GPA first, 'source' to keep the groups' order
+
+        Returns:
+            Optional[dict]: {'students': count, 'duplicates': dropped (name, gpa) rows},
+            None if the merge failed
+
+        Side Effects:
+            - Writes the target group file atomically
+            - Removes the other merged group files
+
+        Examples:
+            >>> file_manager.merge_groups(["121", "122"], "121")
+            {'students': 57, 'duplicates': [('Emma Davis', 49.0)]}
+        """
+        if not self._reorganizable(group_names):
+            return None
+        try:
+            summary = reorganize.merge_groups([self.group_path(name) for name in group_names],
+                                              self.group_path(target), order)
+        except (OSError, ValueError) as e:
+            self.log.print(f"Error merging groups: {str(e)}", "err")
+            return None
+        finally:
+            self._forget(group_names + [target])
+        self.log.print(f"Merged {len(group_names)} group(s) into '{target}': {summary['students']} student(s), "
+                       f"{len(summary['duplicates'])} duplicate(s) dropped", "succ")
+        return summary
+
+    def split_group(self, group_name: str, by: str, bounds: Dict[str, object]) -> Optional[Dict[str, int]]:
+        """
+        Splits a group into new groups in a single pass over its file.
+
+        ----------------------------------------
+
+        Args:
+            group_name (str): The group to split
+            by (str): 'gpa' to split by GPA band, 'name' by alphabetical range
+            bounds (Dict[str, object]): New group name to the lowest GPA or the
+                first name of its part; students below every bound stay in
+                group_name
+
+        Returns:
+            Optional[Dict[str, int]]: Students per group, None if the split failed
+
+        Examples:
+            >>> file_manager.split_group("121", "gpa", {"121-honors": 90})
+            {'121': 40, '121-honors': 7}
+            >>> file_manager.split_group("121", "name", {"121-b": "n"})
+            {'121': 25, '121-b': 22}
+        """
+        if not self._reorganizable([group_name]):
+            return None
+        if by not in ('gpa', 'name'):
+            self.log.print(f"Unknown split '{by}', expected 'gpa' or 'name'", "err")
+            return None
+        paths = {self.group_path(name): name for name in bounds}
+        try:
+            if by == 'gpa':
+                assign = reorganize.by_gpa({self.group_path(name): float(lowest) for name, lowest in bounds.items()})
+            else:
+                assign = reorganize.by_name({self.group_path(name): str(start) for name, start in bounds.items()})
+            counts = reorganize.split_group(self.group_path(group_name), assign)
+        except (OSError, ValueError) as e:
+            self.log.print(f"Error splitting group: {str(e)}", "err")
+            return None
+        finally:
+            self._forget([group_name] + list(bounds))
+        counts = {paths.get(path, group_name): count for path, count in counts.items()}
+        self.log.print(f"Split group '{group_name}' into {len(counts)} group(s)", "succ")
+        return counts
+
+    def rebalance_groups(self, group_names: List[str]) -> Optional[dict]:
+        """
+        Evens out the sizes of groups.
+
+        Students are dealt out in GPA order, so the groups end up within one
+        student of each other in size and with a similar spread of GPAs.
+
+        ----------------------------------------
+
+        Args:
+            group_names (List[str]): The groups to rebalance
+
+        Returns:
+            Optional[dict]: {'students': count per group, 'duplicates': dropped rows},
+            None if rebalancing failed
+        """
+        if not self._reorganizable(group_names):
+            return None
+        try:
+            summary = reorganize.rebalance_groups([self.group_path(name) for name in group_names])
+        except (OSError, ValueError) as e:
+            self.log.print(f"Error rebalancing groups: {str(e)}", "err")
+            return None
+        finally:
+            self._forget(group_names)
+        summary['students'] = {group_name: summary['students'][self.group_path(group_name)]
+                               for group_name in group_names}
+        self.log.print(f"Rebalanced {len(group_names)} group(s)", "succ")
+        return summary
@@ -0,0 +1,174 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+from utils.group_store import GroupStore
+from utils.metrics import metrics
+
+class GroupCache:
+    """Process-wide LRU cache of loaded group stores, bounded by memory.
+
+    Stores are keyed by the absolute path of their group file. Every get
+    checks the store against the inode, size and modification time of the
+    group file and its journal (GroupStore.refresh), so a group changed by
+    another process is reloaded, or only has its new journal records
+    replayed, before it is handed out. When the estimated memory of all
+    cached stores (GroupStore.nbytes) exceeds max_bytes, the least recently
+    used stores are dropped; the store being returned is never dropped.
+
+    Sizes are re-measured on every get, so growth from adds is accounted
+    for at the next access of the group.
+
+    ----------------------------------------
+
+    Attributes:
+        max_bytes (int): Memory budget for all cached stores
+        hits (int): Gets answered by a cached, unchanged store
+        misses (int): Gets that had to load the group file
+        reloads (int): Gets whose cached store had changed on disk
+        evictions (int): Stores dropped to stay within max_bytes
+
+    Methods:
+        get(path, load): Cached store of path, loaded with load(path) on a miss
+        discard(path): Drops the store of path, e.g. after the file was replaced
+        clear(): Drops every store
+        stats(): Counters and current size
+        hit_ratio(): Share of gets served without reading the group file
+        prometheus(): Counters in the Prometheus text exposition format
+
+    Examples:
+        >>> from utils.group_cache import group_cache
+        >>> store = group_cache.get("groups/121.txt", GroupStore)
+        >>> group_cache.stats()['hits']
+        0
+    """
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+        self._stores: "OrderedDict[str, GroupStore]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        # Guards the bookkeeping only; loading and refreshing run outside
+        # of it, so a large group loading doesn't hold up other groups
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._stores)
+
+    def get(self, path: str, load: Callable[[str], GroupStore]) -> GroupStore:
+        """
+        Return the store of a group file, loading it on a miss.
+
+        ----------------------------------------
+
+        Args:
+            path (str): Path to the group file
+            load (Callable[[str], GroupStore]): Builds the store of a path,
+                usually the store class itself
+
+        Returns:
+            GroupStore: Store that is up to date with the file
+
+        Raises:
+            OSError: If the group file cannot be read; a cached store of a
+                     file that is gone is dropped
+        """
+        key = os.path.abspath(path)
+        with self._lock:
+            store = self._stores.get(key)
+            if store is not None:
+                self._stores.move_to_end(key)
+
+        if store is None:
+            store = load(path)
+            with self._lock:
+                self.misses += 1
+                # Another thread may have loaded the group in the meantime
+                store = self._stores.setdefault(key, store)
+        else:
+            try:
+                changed = store.refresh()
+            except OSError:
+                self.discard(path)
+                raise
+            with self._lock:
+                if changed:
+                    self.reloads += 1
+                else:
+                    self.hits += 1
+
+        self._account(key, store)
+        return store
+
+    def _account(self, key: str, store: GroupStore):
+        """Re-measure one store and evict the least recently used ones above max_bytes."""
+        size = store.nbytes()
+        with self._lock:
+            if key not in self._stores:  # Discarded by another thread meanwhile
+                return
+            self._bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+            while self._bytes > self.max_bytes and len(self._stores) > 1:
+                oldest = next(iter(self._stores))
+                if oldest == key:
+                    self._stores.move_to_end(key)
+                    continue
+                self._drop(oldest)
+                self.evictions += 1
+
+    def _drop(self, key: str):
+        # Callers holding the store keep using it; its lock file closes
+        # once the last reference is gone
+        self._stores.pop(key, None)
+        self._bytes -= self._sizes.pop(key, 0)
+
+    def discard(self, path: str):
+        """Drop the store of a group file, e.g. after it was removed or rewritten elsewhere."""
+        with self._lock:
+            self._drop(os.path.abspath(path))
+
+    def clear(self):
+        """Drop every store; the counters are kept."""
+        with self._lock:
+            self._stores.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return the counters together with the number of cached stores and their estimated bytes."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'reloads': self.reloads,
+                    'evictions': self.evictions, 'entries': len(self._stores),
+                    'bytes': self._bytes, 'max_bytes': self.max_bytes}
+
+    def hit_ratio(self) -> Optional[float]:
+        """Share of gets answered without loading or reloading, None before the first get."""
+        stats = self.stats()
+        total = stats['hits'] + stats['misses'] + stats['reloads']
+        return stats['hits'] / total if total else None
+
+    def prometheus(self) -> str:
+        """Format the counters in the Prometheus text exposition format."""
+        stats = self.stats()
+        lines = []
+        for field, help_text in (('hits', "Gets answered by an unchanged cached group."),
+                                 ('misses', "Gets that loaded the group file."),
+                                 ('reloads', "Gets whose cached group had changed on disk."),
+                                 ('evictions', "Groups dropped to stay within the memory budget.")):
+            name = f"lab3_group_cache_{field}_total"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter", f"{name} {stats[field]}"]
+        for field, help_text in (('entries', "Groups in the cache."),
+                                 ('bytes', "Estimated memory of the cached groups."),
+                                 ('max_bytes', "Memory budget of the cache.")):
+            name = f"lab3_group_cache_{field}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {stats[field]}"]
+        return '\n'.join(lines) + '\n'
+
+# Shared by every FileManager in the process
+group_cache = GroupCache()
+metrics.add_collector(group_cache.prometheus)
@@ -0,0 +1,496 @@
+import math
+import os
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+from models.student_table import StudentTable
+from utils.journal import Journal
+from utils.metrics import metrics
+from utils.trigram_index import TrigramIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows: no inter-process locking, one process per directory
+    fcntl = None
+
+# Approximate bytes per student of the indexes built on demand, measured
+# with tracemalloc: a (-gpa, id) tuple in the ranking, and the slot, key
+# and postings of a name in the trigram index plus a few bytes per character
+RANKING_ENTRY_BYTES = 120
+NAME_INDEX_ENTRY_BYTES = 160
+NAME_INDEX_CHAR_BYTES = 6
+
+def format_student_line(student_id: int, gpa: float, name: str) -> str:
+    """Format a student entry the way group files store it: "ID. | GPA | Name"."""
+    return f"{student_id}. \t |{gpa} \t | {name}\n"
+
+def is_name_pattern(pattern: str) -> bool:
+    """
+    True if pattern can only match inside the name part of a student line.
+
+    That holds for letters with single inner spaces: IDs and GPAs are
+    digits, and the separators around the name are not letters.
+    """
+    return bool(pattern) and pattern == pattern.strip() and pattern.replace(' ', '').isalpha()
+
+def parse_student_line(line: str) -> Optional[Tuple[int, float, str]]:
+    """
+    Parse a student entry of a group file.
+
+    ----------------------------------------
+
+    Args:
+        line (str): Line in format "1. \\t |85.5 \\t | John Smith"
+
+    Returns:
+        Optional[Tuple[int, float, str]]: (id, gpa, name), or None if the line
+        is not a well-formed student entry
+    """
+    if not line.strip() or not line[0].isdigit():
+        return None
+    try:
+        id_part, rest = line.split('.', 1)
+        _, gpa_part, name = rest.split('|', 2)
+        return int(id_part), float(gpa_part), name.strip()
+    except ValueError:
+        return None
+
+class GroupStore:
+    """Class holding one group file in memory.
+
+    The group file is parsed once; afterwards students are kept in a
+    StudentTable (typed arrays plus a name pool, with lookups by ID and by
+    case-insensitive name) together with the next free ID, so adding,
+    deleting and duplicate checks don't rescan the file.
+    A GPA ranking is built on the first ranked query and then kept sorted
+    with bisect on every add and delete; a trigram index over names is
+    built on the first name search and kept up to date the same way.
+
+    Adds and deletes are appended to a write-ahead journal next to the
+    group file (<path>.wal) instead of rewriting it. Loading replays the
+    journal over the group file; once the journal holds more than
+    COMPACT_AFTER records (or a quarter of the group) it is compacted into
+    the group file, which is written to a temporary file, fsynced and
+    moved into place with os.replace. A crash at any point leaves either
+    the old or the new group file, plus a journal that replays cleanly.
+
+    Several processes can share a group: every change runs under an
+    exclusive fcntl lock on <path>.lock and first reloads the group if
+    another process changed it, so IDs stay unique; loading takes a shared
+    lock, so nobody reads a half-compacted group. transaction() holds the
+    exclusive lock across several calls, e.g. a duplicate check and an add.
+
+    ----------------------------------------
+
+    Attributes:
+        path (str): Path to the group file
+        journal (Journal): Write-ahead journal of the group file
+        header (List[str]): Non-student lines (title, group line, blanks)
+        students (StudentTable): Student ID to (name, gpa), in file order
+        next_id (int): ID given to the next added student
+
+    Methods:
+        refresh(): Reloads the file if it was changed by someone else
+        has_name(name): Case-insensitive duplicate check
+        find(identifier): Looks a student up by ID or name
+        add(name, gpa): Appends a student and returns the new ID
+        add_many(students): Appends a batch of students with a single write
+        delete(identifier): Removes students by ID or name
+        ranked(): Yields students by GPA, highest first
+        top(count): Returns the students with the highest GPA
+        percentile(percent): GPA at a percentile of the group
+        rows_in_gpa_range(min_gpa, max_gpa): Ranked students within a GPA range
+        sort_by_gpa(): Rewrites the group file in ranked order, keeping IDs
+        rows(): Yields (id, name, gpa) entries in file order
+        lines(): Yields the group in text format
+        search(pattern): Returns text lines containing pattern
+        compact(): Folds the journal into the group file
+        nbytes(): Estimated memory held by the group and its indexes
+        transaction(): Holds the exclusive lock, with the group up to date
+
+    Note:
+        - Adding and deleting append a single journal record
+        - Sorting compacts right away, as it reorders the whole file
+        - Until the next compaction other programs reading the .txt file
+          directly don't see the journaled changes
+        - Subclasses for other file formats override _read and _write
+    """
+    COMPACT_AFTER = 1000
+
+    def __init__(self, path: str, sync: bool = False):
+        self.path = path
+        self.journal = Journal(f"{path}.wal", sync)
+        self.header: List[str] = []
+        self.students = StudentTable()
+        self.next_id = 1
+        self._ranking: Optional[List[Tuple[float, int]]] = None
+        self._name_index: Optional[TrigramIndex] = None
+        self._journal_records = 0
+        self._journal_offset = 0
+        self._signature = None
+        self._lock_file = None
+        self._lock_depth = 0
+        self._lock_mode = None
+        with self._locked(exclusive=False):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.students)
+
+    def _stat_signature(self):
+        stat = os.stat(self.path)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size), self.journal.signature()
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        """Hold the inter-process lock of the group; nested calls reuse it."""
+        if fcntl is None:
+            yield
+            return
+        if self._lock_file is None:
+            self._lock_file = open(f"{self.path}.lock", 'a')
+
+        mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        previous = self._lock_mode
+        if previous != fcntl.LOCK_EX and previous != mode:
+            fcntl.flock(self._lock_file, mode)
+            self._lock_mode = mode
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if not self._lock_depth:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                self._lock_mode = None
+            elif self._lock_mode != previous:
+                fcntl.flock(self._lock_file, previous)
+                self._lock_mode = previous
+
+    @contextmanager
+    def transaction(self):
+        """
+        Hold the exclusive lock of the group for a series of calls.
+
+        The group is reloaded first if another process changed it, so checks
+        made inside the block stay true until it ends.
+
+        Examples:
+            >>> with store.transaction():
+            ...     if not store.has_name("John Smith"):
+            ...         store.add("John Smith", 85.5)
+        """
+        with self._locked(exclusive=True):
+            self._refresh()
+            yield self
+
+    def load(self):
+        """Read the group file into memory and replay the journal over it."""
+        self._ranking = None
+        self._name_index = None
+
+        self.header, rows = self._read()
+        self.students = StudentTable((student_id, name, gpa) for student_id, gpa, name in rows)
+        self.next_id = max(self.students.ids, default=0) + 1
+
+        self._journal_records = 0
+        self._journal_offset = 0
+        self._replay()
+
+    def _replay(self):
+        """Apply the journal records written since the last replay."""
+        # Replaying is idempotent: a crash between compaction and clearing
+        # the journal leaves records that are already in the group file
+        records, self._journal_offset = self.journal.replay(self._journal_offset)
+        for record in records:
+            if record[0] == '+' and record[1] not in self.students:
+                self._insert(record[1], record[2], record[3])
+            elif record[0] == '-' and record[1] in self.students:
+                self._remove(record[1])
+        self._journal_records += len(records)
+        self._signature = self._stat_signature()
+
+    def _read(self) -> Tuple[List[str], Iterable[Tuple[int, float, str]]]:
+        """Parse the text file into header lines and (id, gpa, name) rows."""
+        with open(self.path, 'r') as file:
+            content = file.read()
+        metrics.record_io(read=len(content), opened=1)
+
+        header, rows = [], []
+        for line in content.splitlines(keepends=True):
+            parsed = parse_student_line(line)
+            if parsed is None:
+                header.append(line if line.endswith('\n') else line + '\n')
+            else:
+                rows.append(parsed)
+        return header, rows
+
+    def refresh(self) -> bool:
+        """
+        Reload the group if the size or modification time of its file or journal changed.
+
+        Returns:
+            bool: True if the group was reloaded or new journal records were replayed
+        """
+        with self._locked(exclusive=False):
+            return self._refresh()
+
+    def _refresh(self) -> bool:
+        current = self._stat_signature()
+        if current == self._signature:
+            return False
+        group_file, journal = current
+        # The journal is only cleared together with a rewrite of the group
+        # file, so an unchanged group file means the journal only grew
+        if group_file == self._signature[0] and journal is not None and journal[1] >= self._journal_offset:
+            self._replay()
+        else:
+            self.load()
+        return True
+
+    def nbytes(self) -> int:
+        """Estimated memory of the group: the student table plus the indexes built so far."""
+        size = self.students.nbytes()
+        if self._ranking is not None:
+            size += len(self._ranking) * RANKING_ENTRY_BYTES
+        if self._name_index is not None:
+            size += len(self._name_index) * NAME_INDEX_ENTRY_BYTES + NAME_INDEX_CHAR_BYTES * len(self.students.pool)
+        return size
+
+    def _insert(self, student_id: int, name: str, gpa: float):
+        self.students.add(student_id, name, gpa)
+        self.next_id = max(self.next_id, student_id + 1)
+        if self._ranking is not None:
+            insort(self._ranking, (-gpa, student_id))
+        if self._name_index is not None:
+            self._name_index.add(student_id, name)
+
+    def _remove(self, student_id: int) -> Tuple[str, float]:
+        name, gpa = self.students.pop(student_id)
+        if self._ranking is not None:
+            del self._ranking[bisect_left(self._ranking, (-gpa, student_id))]
+        if self._name_index is not None:
+            self._name_index.discard(student_id)
+        return name, gpa
+
+    def _ranked_keys(self) -> List[Tuple[float, int]]:
+        # (-gpa, id) pairs, highest GPA first; built on first use, then kept
+        # sorted by _insert and _remove
+        if self._ranking is None:
+            self._ranking = sorted((-gpa, student_id) for student_id, _, gpa in self.students.rows())
+        return self._ranking
+
+    def _indexed_names(self) -> TrigramIndex:
+        # Trigram index over names in file order; built on the first name
+        # search, then kept up to date by _insert and _remove
+        if self._name_index is None or self._name_index.stale:
+            self._name_index = TrigramIndex()
+            for student_id, name, _ in self.students.rows():
+                self._name_index.add(student_id, name)
+        return self._name_index
+
+    def has_name(self, name: str) -> bool:
+        """Return True if a student with this name (any case) is in the group."""
+        return self.students.has_name(name.strip())
+
+    def find(self, identifier: str) -> List[int]:
+        """
+        Find students by ID or by name.
+
+        ----------------------------------------
+
+        Args:
+            identifier (str): Student ID (e.g. "3") or full name (any case)
+
+        Returns:
+            List[int]: Matching student IDs
+        """
+        identifier = identifier.strip()
+        if identifier.isdigit() and int(identifier) in self.students:
+            return [int(identifier)]
+        return self.students.ids_named(identifier)
+
+    def add(self, name: str, gpa: float) -> int:
+        """
+        Add a student and append it to the journal.
+
+        ----------------------------------------
+
+        Args:
+            name (str): Student name
+            gpa (float): Student GPA
+
+        Returns:
+            int: ID assigned to the student
+        """
+        return self.add_many([(name, gpa)])[0]
+
+    def add_many(self, students: Iterable[Tuple[str, float]]) -> List[int]:
+        """
+        Add a batch of students and append them to the journal at once.
+
+        IDs are assigned consecutively from next_id. The caller is expected
+        to have validated the batch and removed duplicates.
+
+        ----------------------------------------
+
+        Args:
+            students (Iterable[Tuple[str, float]]): (name, gpa) pairs
+
+        Returns:
+            List[int]: IDs assigned to the students, in input order
+        """
+        students = list(students)
+        if not students:
+            return []
+
+        with self.transaction():
+            batch = [(student_id, name, gpa)
+                     for student_id, (name, gpa) in enumerate(students, self.next_id)]
+            for student_id, name, gpa in batch:
+                self._insert(student_id, name, gpa)
+            self._log([('+', student_id, name, gpa) for student_id, name, gpa in batch])
+        return [student_id for student_id, _, _ in batch]
+
+    def _log(self, records: List[tuple]):
+        """Append records to the journal, compacting it when it grew too long."""
+        self.journal.append(records)
+        self._journal_records += len(records)
+        if self._journal_records > max(self.COMPACT_AFTER, len(self.students) // 4):
+            self.compact()
+        else:
+            self._signature = self._stat_signature()
+            self._journal_offset = self._signature[1][1]
+
+    def delete(self, identifier: str) -> List[Tuple[int, str, float]]:
+        """
+        Delete students by ID or name, recording the deletes in the journal.
+
+        ----------------------------------------
+
+        Args:
+            identifier (str): Student ID or full name
+
+        Returns:
+            List[Tuple[int, str, float]]: Deleted (id, name, gpa) entries
+        """
+        deleted = []
+        with self.transaction():
+            for student_id in self.find(identifier):
+                name, gpa = self._remove(student_id)
+                deleted.append((student_id, name, gpa))
+
+            if deleted:
+                self._log([('-', student_id) for student_id, _, _ in deleted])
+        return deleted
+
+    def ranked(self) -> Iterator[Tuple[int, str, float]]:
+        """Yield (id, name, gpa) entries by GPA, highest first; equal GPAs by ID."""
+        students = self.students
+        for _, student_id in self._ranked_keys():
+            name, gpa = students[student_id]
+            yield student_id, name, gpa
+
+    def top(self, count: int) -> List[Tuple[int, str, float]]:
+        """Return the count students with the highest GPA."""
+        students = self.students
+        return [(student_id, *students[student_id]) for _, student_id in self._ranked_keys()[:count]]
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        GPA at the given percentile, nearest-rank method.
+
+        ----------------------------------------
+
+        Args:
+            percent (float): Percentile between 0 and 100
+
+        Returns:
+            Optional[float]: Lowest GPA such that percent % of the group is at
+            or below it, None for an empty group
+
+        Raises:
+            ValueError: If percent is outside 0..100
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        ranking = self._ranked_keys()
+        if not ranking:
+            return None
+        rank = max(math.ceil(percent / 100 * len(ranking)), 1)
+        return -ranking[len(ranking) - rank][0]
+
+    def rows_in_gpa_range(self, min_gpa: float = None, max_gpa: float = None) -> Iterator[Tuple[int, str, float]]:
+        """Yield ranked (id, name, gpa) entries with min_gpa <= gpa <= max_gpa."""
+        ranking = self._ranked_keys()
+        start = 0 if max_gpa is None else bisect_left(ranking, (-max_gpa,))
+        end = len(ranking) if min_gpa is None else bisect_right(ranking, (-min_gpa, math.inf))
+        students = self.students
+        for _, student_id in ranking[start:end]:
+            name, gpa = students[student_id]
+            yield student_id, name, gpa
+
+    def sort_by_gpa(self):
+        """Rewrite the group in ranked order; student IDs stay the same."""
+        with self.transaction():
+            self.students = StudentTable(self.ranked())
+            self._name_index = None  # Results follow file order, which just changed
+            self.save()
+
+    def rows(self) -> Iterator[Tuple[int, str, float]]:
+        """Yield (id, name, gpa) entries in file order."""
+        return self.students.rows()
+
+    def lines(self) -> Iterator[str]:
+        """Yield the group as text lines: header first, then one line per student."""
+        yield from self.header
+        for student_id, name, gpa in self.students.rows():
+            yield format_student_line(student_id, gpa, name)
+
+    def search(self, pattern: str) -> List[str]:
+        """
+        Return the text lines of the group that contain pattern (any case).
+
+        Name patterns (see is_name_pattern) are answered by the trigram
+        index over student names; other patterns scan the formatted lines.
+        """
+        pattern = pattern.lower()
+        if not is_name_pattern(pattern):
+            return [line.strip() for line in self.lines() if pattern in line.lower()]
+
+        lines = [line.strip() for line in self.header if pattern in line.lower()]
+        students = self.students
+        for student_id in self._indexed_names().search(pattern):
+            name, gpa = students[student_id]
+            lines.append(format_student_line(student_id, gpa, name).strip())
+        return lines
+
+    def save(self):
+        """
+        Write the whole group to a temporary file and move it into place.
+
+        The temporary file is fsynced before os.replace, so the group file
+        is always either the complete old or the complete new version. The
+        journal is cleared afterwards, as its records are now in the file.
+        """
+        with self._locked(exclusive=True):
+            temp_path = f"{self.path}.tmp"
+            self._write(temp_path)
+            with open(temp_path, 'r+b') as file:
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.path)
+            self.journal.clear()
+            self._journal_records = 0
+            self._journal_offset = 0
+            self._signature = self._stat_signature()
+
+    def compact(self):
+        """Fold the journal into the group file."""
+        self.save()
+
+    def _write(self, path: str):
+        """Write the group in text format to path."""
+        with open(path, 'w') as file:
+            file.writelines(self.lines())
+            if metrics.enabled:
+                metrics.record_io(written=file.tell(), opened=1)
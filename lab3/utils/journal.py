@@ -0,0 +1,100 @@
+import os
+from typing import Iterable, List, Optional, Tuple
+from utils.metrics import metrics
+
+# ('+', id, name, gpa) adds a student, ('-', id) deletes one
+Record = Tuple
+
+class Journal:
+    """Append-only write-ahead log of changes to one group file.
+
+    Every change is one text line: "+\\t<id>\\t<gpa>\\t<name>" for an added
+    student and "-\\t<id>" for a deleted one. A record only counts once its
+    trailing newline is on disk; a torn last line left by a crash is cut
+    off on the next replay, so later appends start on a clean line.
+
+    ----------------------------------------
+
+    Attributes:
+        path (str): Path to the journal file
+        sync (bool): fsync after every append, for durability against
+                     power loss and not only against process crashes
+
+    Methods:
+        append(records): Appends records with a single write
+        replay(start): Returns the committed records after byte offset start
+        clear(): Removes the journal after a compaction
+        signature(): (mtime, size) of the journal, None if it doesn't exist
+    """
+    def __init__(self, path: str, sync: bool = False):
+        self.path = path
+        self.sync = sync
+
+    def append(self, records: Iterable[Record]):
+        """Append records to the journal."""
+        lines = []
+        for record in records:
+            if record[0] == '+':
+                _, student_id, name, gpa = record
+                lines.append(f"+\t{student_id}\t{gpa!r}\t{name}\n")
+            else:
+                lines.append(f"-\t{record[1]}\n")
+        data = ''.join(lines).encode('utf-8')
+        with open(self.path, 'ab') as file:
+            file.write(data)
+            if self.sync:
+                file.flush()
+                os.fsync(file.fileno())
+        metrics.record_io(written=len(data), opened=1)
+
+    def replay(self, start: int = 0) -> Tuple[List[Record], int]:
+        """
+        Read the committed records, dropping a torn last line if there is one.
+
+        ----------------------------------------
+
+        Args:
+            start (int): Byte offset to read from, the end returned by the
+                         previous replay to pick up only new records
+
+        Returns:
+            Tuple[List[Record], int]: Records in the order they were appended,
+            and the offset just past the last one
+        """
+        try:
+            with open(self.path, 'rb+') as file:
+                file.seek(start)
+                data = file.read()
+                committed = data.rfind(b'\n') + 1
+                if committed < len(data):
+                    file.truncate(start + committed)
+        except FileNotFoundError:
+            return [], 0
+        metrics.record_io(read=len(data), opened=1)
+
+        records = []
+        for line in data[:committed].decode('utf-8').splitlines():
+            fields = line.split('\t', 3)
+            try:
+                if fields[0] == '+' and len(fields) == 4:
+                    records.append(('+', int(fields[1]), fields[3], float(fields[2])))
+                elif fields[0] == '-' and len(fields) == 2:
+                    records.append(('-', int(fields[1])))
+            except ValueError:
+                continue  # Skip damaged records, the rest is still usable
+        return records, start + committed
+
+    def clear(self):
+        """Remove the journal once its records are part of the group file."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def signature(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the journal, or None if it doesn't exist."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
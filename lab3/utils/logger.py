@@ -7,6 +7,9 @@ class Logger:
 
     ----------------------------------------
 
+    Attributes:
+        quiet (bool): Only print errors and warnings, e.g. for scripted use
+
     Methods:
         print(message: str, emoji_type: str = None): Prints a message with optional emoji
 
@@ -34,14 +37,15 @@ class Logger:
     Note:
         Messages are printed to stdout with emoji prefixes when emoji_type is specified
     """
-    def __init__(self):
+    def __init__(self, quiet: bool = False):
         """Initialize Logger instance.
 
         ----------------------------------------
 
-        Sets up the emoji dictionary for message formatting.
+        Args:
+            quiet (bool, optional): Only print errors and warnings. Defaults to False.
         """
-        pass
+        self.quiet = quiet
 
     def print(self, message: str, emoji_type: str = None) -> None:
         """
@@ -64,7 +68,8 @@ class Logger:
             - Prints formatted message to console
 
         Note:
-            If emoji_type is not recognized, message is printed without emoji
+            - If emoji_type is not recognized, message is printed without emoji
+            - A quiet logger drops everything but 'err' and 'warn' messages
 
         Examples:
             >>> logger = Logger()
@@ -75,6 +80,8 @@ class Logger:
             >>> logger.print("Regular message")
             Regular message
         """
+        if self.quiet and emoji_type not in ('err', 'warn'):
+            return
 
         emojis = {
             'succ': '✅',
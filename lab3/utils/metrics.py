@@ -0,0 +1,235 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+# Upper bounds of the latency histogram buckets in seconds; +Inf is implied
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class OperationStats:
+    """Counters of one instrumented operation."""
+    __slots__ = ('calls', 'errors', 'seconds', 'buckets', 'bytes_read', 'bytes_written', 'file_opens')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.file_opens = 0
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound of the bucket holding the given percentile of calls, inf for the last bucket."""
+        rank = self.calls * percent / 100
+        seen = 0
+        for bound, count in zip(BUCKETS + (float('inf'),), self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return bound
+        return 0.0
+
+class Metrics:
+    """Opt-in registry of call counts, latency histograms and file I/O per operation.
+
+    Operations are measured with the timed decorator or the measure context
+    manager. File I/O reported through record_io while operations are
+    running is added to each of them, so the figures of an operation
+    include everything it called. Disabled (the default), a timed call
+    costs one attribute check and record_io returns right away.
+
+    ----------------------------------------
+
+    Attributes:
+        enabled (bool): Whether measurements are recorded
+
+    Methods:
+        enable() / disable(): Turns recording on or off
+        reset(): Drops everything recorded so far
+        timed(operation): Decorator measuring every call of a function
+        measure(operation): Context manager measuring a block
+        record_io(read, written, opened): Adds file I/O to the running operations
+        stats(): Copy of the counters per operation
+        report(): Human-readable table
+        add_collector(collector): Adds more exposition text to prometheus()
+        prometheus(): Prometheus text exposition format
+        write_prometheus(path): Writes prometheus() atomically, e.g. for the
+                                node_exporter textfile collector
+
+    Examples:
+        >>> from utils.metrics import metrics
+        >>> metrics.enable()
+        >>> manager.add_student("121", "John Smith", 85.5)
+        >>> print(metrics.report())
+        >>> metrics.write_prometheus("lab3.prom")
+    """
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._stats: Dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._collectors: List[Callable[[], str]] = []
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def _active(self) -> List[OperationStats]:
+        active = getattr(self._local, 'active', None)
+        if active is None:
+            active = self._local.active = []
+        return active
+
+    def _operation(self, operation: str) -> OperationStats:
+        stats = self._stats.get(operation)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(operation, OperationStats())
+        return stats
+
+    def _start(self, operation: str):
+        stats = self._operation(operation)
+        active = self._active()
+        active.append(stats)
+        return stats, active, time.perf_counter()
+
+    def _finish(self, stats: OperationStats, active: List[OperationStats], start: float, failed: bool):
+        seconds = time.perf_counter() - start
+        active.pop()
+        with self._lock:
+            stats.calls += 1
+            stats.errors += failed
+            stats.seconds += seconds
+            stats.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    @contextmanager
+    def measure(self, operation: str):
+        """Count and time the block as one call of operation."""
+        if not self.enabled:
+            yield
+            return
+        stats, active, start = self._start(operation)
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._finish(stats, active, start, failed)
+
+    def timed(self, operation: str = None) -> Callable:
+        """
+        Decorator measuring every call of the function.
+
+        Args:
+            operation (str, optional): Name in the reports, the function name by default
+        """
+        def decorator(func):
+            name = operation or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                # Same as measure(), without the cost of a generator per call
+                stats, active, start = self._start(name)
+                failed = False
+                try:
+                    return func(*args, **kwargs)
+                except BaseException:
+                    failed = True
+                    raise
+                finally:
+                    self._finish(stats, active, start, failed)
+            return wrapper
+        return decorator
+
+    def record_io(self, read: int = 0, written: int = 0, opened: int = 0):
+        """Add bytes read, bytes written and opened files to every running operation."""
+        if not self.enabled:
+            return
+        active = self._active()
+        if not active:
+            return
+        with self._lock:
+            for stats in active:
+                stats.bytes_read += read
+                stats.bytes_written += written
+                stats.file_opens += opened
+
+    def stats(self) -> Dict[str, OperationStats]:
+        """Return a copy of the counters, keyed by operation name."""
+        with self._lock:
+            copies = {}
+            for operation, stats in self._stats.items():
+                copy = copies[operation] = OperationStats()
+                for field in OperationStats.__slots__:
+                    value = getattr(stats, field)
+                    setattr(copy, field, list(value) if field == 'buckets' else value)
+            return copies
+
+    def report(self) -> str:
+        """Format the counters as a table, one row per operation."""
+        lines = [f"{'Operation':<20} {'Calls':>8} {'Errors':>7} {'Mean, ms':>9} {'p50, ms':>8} "
+                 f"{'p99, ms':>8} {'Read, KiB':>10} {'Written, KiB':>13} {'Opens':>7}"]
+        for operation, stats in sorted(self.stats().items()):
+            mean = stats.seconds / stats.calls * 1000 if stats.calls else 0.0
+            lines.append(f"{operation:<20} {stats.calls:>8} {stats.errors:>7} {mean:>9.3f} "
+                         f"{stats.percentile(50) * 1000:>8.2f} {stats.percentile(99) * 1000:>8.2f} "
+                         f"{stats.bytes_read / 1024:>10.1f} {stats.bytes_written / 1024:>13.1f} "
+                         f"{stats.file_opens:>7}")
+        return '\n'.join(lines)
+
+    def add_collector(self, collector: Callable[[], str]):
+        """Append the exposition text returned by collector to every prometheus() output."""
+        self._collectors.append(collector)
+
+    def prometheus(self) -> str:
+        """Format the counters in the Prometheus text exposition format."""
+        stats = sorted(self.stats().items())
+        lines = []
+
+        def counter(name, help_text, field):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for operation, entry in stats:
+                lines.append(f'{name}{{operation="{operation}"}} {getattr(entry, field)}')
+
+        counter("lab3_operation_calls_total", "Calls of the operation.", 'calls')
+        counter("lab3_operation_errors_total", "Calls that raised an exception.", 'errors')
+        counter("lab3_operation_read_bytes_total", "Bytes read from files during the operation.", 'bytes_read')
+        counter("lab3_operation_written_bytes_total", "Bytes written to files during the operation.", 'bytes_written')
+        counter("lab3_operation_file_opens_total", "Files opened during the operation.", 'file_opens')
+
+        name = "lab3_operation_duration_seconds"
+        lines.append(f"# HELP {name} Duration of the operation.")
+        lines.append(f"# TYPE {name} histogram")
+        for operation, entry in stats:
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (float('inf'),), entry.buckets):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{{operation="{operation}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{operation="{operation}"}} {entry.seconds!r}')
+            lines.append(f'{name}_count{{operation="{operation}"}} {entry.calls}')
+        return '\n'.join(lines) + '\n' + ''.join(collector() for collector in self._collectors)
+
+    def write_prometheus(self, path: str):
+        """Write prometheus() to path through a temporary file, so scrapers never see half a file."""
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'w') as file:
+            file.write(self.prometheus())
+        os.replace(temp_path, path)
+
+# Registry used by the instrumented StudentManager, FileManager and stores
+metrics = Metrics()
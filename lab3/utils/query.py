@@ -0,0 +1,142 @@
+import heapq
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple
+from utils.file_manager import FileManager
+
+# (group name, student ID, name, GPA)
+QueryResult = Tuple[str, int, str, float]
+
+class StudentQuery:
+    """Filter describing which students a query returns.
+
+    All given conditions must hold; conditions left as None are ignored.
+
+    ----------------------------------------
+
+    Attributes:
+        name (str): Case-insensitive substring of the student name
+        regex (re.Pattern): Pattern searched in the name, case-insensitive
+        min_gpa (float): Lowest GPA, inclusive
+        max_gpa (float): Highest GPA, inclusive
+        groups (List[str]): Groups to scan, all groups if None
+        top (int): Return only the top N students by GPA
+
+    Raises:
+        ValueError: If regex does not compile or top is not positive
+
+    Examples:
+        >>> StudentQuery(name="smith", min_gpa=80)
+        >>> StudentQuery(regex=r"^a", groups=["121", "122"], top=5)
+    """
+    def __init__(self, name: str = None, regex: str = None, min_gpa: float = None,
+                 max_gpa: float = None, groups: Iterable[str] = None, top: int = None):
+        self.name = name.lower() if name else None
+        try:
+            self.regex = re.compile(regex, re.IGNORECASE) if regex else None
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression: {e}") from e
+        self.min_gpa = min_gpa
+        self.max_gpa = max_gpa
+        self.groups = list(groups) if groups is not None else None
+        if top is not None and top < 1:
+            raise ValueError("top must be positive")
+        self.top = top
+
+    def matches(self, name: str, gpa: float) -> bool:
+        """Return True if a student satisfies every condition."""
+        if self.min_gpa is not None and gpa < self.min_gpa:
+            return False
+        if self.max_gpa is not None and gpa > self.max_gpa:
+            return False
+        if self.name is not None and self.name not in name.lower():
+            return False
+        if self.regex is not None and not self.regex.search(name):
+            return False
+        return True
+
+class QueryEngine:
+    """Class running student queries over all groups of a FileManager.
+
+    Groups are scanned in parallel by a thread pool. Results are streamed
+    group by group in the order the groups were given (sorted by name when
+    all groups are scanned), so the first results arrive before the last
+    group is read.
+
+    GPA bounds and top-N queries read the store's GPA ranking
+    (rows_in_gpa_range), so only students inside the range are visited and
+    a top-N scan stops after the first N matches of each group; the
+    per-group winners are then merged.
+
+    ----------------------------------------
+
+    Attributes:
+        file_manager (FileManager): Source of the group stores
+        max_workers (int): Size of the thread pool
+
+    Methods:
+        run(query): Streams (group, id, name, gpa) results
+        search(**conditions): Builds a StudentQuery and returns all results
+
+    Examples:
+        >>> engine = QueryEngine(manager.file_manager)
+        >>> for group, student_id, name, gpa in engine.run(StudentQuery(name="smith")):
+        ...     print(group, name, gpa)
+        >>> engine.search(top=3)  # Best three students of all groups
+    """
+    def __init__(self, file_manager: FileManager, max_workers: int = None):
+        self.file_manager = file_manager
+        self.max_workers = max_workers
+
+    def _scan_group(self, group_name: str, query: StudentQuery) -> List[QueryResult]:
+        store = self.file_manager.group_store(group_name)
+        if query.min_gpa is None and query.max_gpa is None and query.top is None:
+            rows = store.rows()
+        else:
+            # Ranked rows, limited to the GPA range by the store's GPA index
+            rows = store.rows_in_gpa_range(query.min_gpa, query.max_gpa)
+
+        matches = ((group_name, student_id, name, gpa)
+                   for student_id, name, gpa in rows if query.matches(name, gpa))
+        return list(islice(matches, query.top))
+
+    def _group_names(self, query: StudentQuery) -> List[str]:
+        if query.groups is None:
+            return sorted(self.file_manager.group_names())
+        return [group for group in query.groups if self.file_manager.group_exists(group)]
+
+    def run(self, query: StudentQuery) -> Iterator[QueryResult]:
+        """
+        Stream the students matching a query.
+
+        ----------------------------------------
+
+        Args:
+            query (StudentQuery): Conditions to apply
+
+        Yields:
+            QueryResult: (group name, student ID, name, GPA); for a top-N
+                         query the N best students, highest GPA first
+        """
+        groups = self._group_names(query)
+        if not groups:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            results = executor.map(self._scan_group, groups, [query] * len(groups))
+            if query.top is None:
+                for matches in results:
+                    yield from matches
+            else:
+                best = heapq.nlargest(query.top, (result for matches in results for result in matches),
+                                      key=lambda result: result[3])
+                yield from best
+        finally:
+            # Stops pending scans if the caller does not consume everything
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def search(self, **conditions) -> List[QueryResult]:
+        """Run StudentQuery(**conditions) and collect the results."""
+        return list(self.run(StudentQuery(**conditions)))
@@ -0,0 +1,353 @@
+import heapq
+import os
+import tempfile
+from contextlib import ExitStack, contextmanager
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from utils.group_store import format_student_line, parse_student_line
+from utils.journal import Journal
+
+try:
+    import fcntl
+except ImportError:  # Windows: no inter-process locking, one process per directory
+    fcntl = None
+
+# (name, gpa); IDs are reassigned when the rows are written out
+Row = Tuple[str, float]
+
+CHUNK_ROWS = 200_000
+
+def group_name_of(path: str) -> str:
+    """Group name of a group file path: the file name without extension."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+@contextmanager
+def locked_groups(paths: Iterable[str]):
+    """Hold the exclusive GroupStore lock of every group, taken in path order to avoid deadlocks."""
+    with ExitStack() as stack:
+        if fcntl is not None:
+            for path in sorted(set(paths)):
+                lock_file = stack.enter_context(open(f"{path}.lock", 'a'))
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+def read_rows(path: str) -> Iterator[Row]:
+    """
+    Stream the students of a text group file with its journal applied.
+
+    Only the journal is held in memory (it is compacted once it reaches a
+    quarter of the group); the group file itself is read line by line.
+
+    ----------------------------------------
+
+    Args:
+        path (str): Path to the group file
+
+    Yields:
+        Row: (name, gpa) in file order, journaled adds last
+    """
+    records, _ = Journal(f"{path}.wal").replay()
+    added: Dict[int, Row] = {}
+    deleted = set()
+    for record in records:
+        if record[0] == '+':
+            added[record[1]] = (record[2], record[3])
+        elif record[1] in added:
+            del added[record[1]]
+        else:
+            deleted.add(record[1])
+
+    with open(path, 'r') as file:
+        for line in file:
+            parsed = parse_student_line(line)
+            if parsed is None:
+                continue
+            student_id, gpa, name = parsed
+            # A journaled add already in the file was compacted, see GroupStore._replay
+            added.pop(student_id, None)
+            if student_id not in deleted:
+                yield name, gpa
+    yield from added.values()
+
+def _spill(rows: List[Row], directory: str) -> Iterator[Row]:
+    """Write a sorted run to a temporary file and stream it back, removing the file afterwards."""
+    fd, path = tempfile.mkstemp(suffix='.run.tmp', dir=directory)
+    with os.fdopen(fd, 'w') as file:
+        file.writelines(f"{gpa!r}\t{name}\n" for name, gpa in rows)
+
+    def stream():
+        try:
+            with open(path, 'r') as file:
+                for line in file:
+                    gpa, name = line.rstrip('\n').split('\t', 1)
+                    yield name, float(gpa)
+        finally:
+            os.remove(path)
+    return stream()
+
+def sorted_by_gpa(rows: Iterable[Row], directory: str) -> Iterator[Row]:
+    """
+    Sort rows by GPA, highest first, keeping at most CHUNK_ROWS in memory.
+
+    Rows are cut into chunks that are sorted and spilled to temporary
+    files in directory, then the sorted runs are k-way merged with
+    heapq.merge. Equal GPAs keep their input order.
+    """
+    runs = []
+    chunk: List[Row] = []
+    key = lambda row: -row[1]
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_ROWS:
+            chunk.sort(key=key)
+            runs.append(_spill(chunk, directory))
+            chunk = []
+    chunk.sort(key=key)
+    runs.append(iter(chunk))
+    return heapq.merge(*runs, key=key)
+
+def read_header(path: str) -> Optional[List[str]]:
+    """
+    Read the header of a group file: the lines before its first student.
+
+    Returns:
+        Optional[List[str]]: Header lines, None if the file doesn't exist
+    """
+    header = []
+    try:
+        with open(path, 'r') as file:
+            for line in file:
+                if parse_student_line(line) is not None:
+                    break
+                header.append(line if line.endswith('\n') else line + '\n')
+    except FileNotFoundError:
+        return None
+    return header
+
+class GroupWriter:
+    """Writes a group file to <path>.tmp, assigning IDs 1, 2, ... in write order.
+
+    The header lines are written first; a new group gets the default
+    "Students / Group: <name>" header. commit() fsyncs the temporary file,
+    moves it over the group file with os.replace and removes the journal
+    of the old file; discard() drops it.
+    """
+    def __init__(self, path: str, header: Optional[List[str]] = None):
+        self.path = path
+        self.temp_path = f"{path}.tmp"
+        self.count = 0
+        self._file = open(self.temp_path, 'w')
+        if header is None:
+            header = ["Students\n", f"Group: {group_name_of(path)}\n", "\n"]
+        self._file.writelines(header)
+
+    def write(self, name: str, gpa: float):
+        self.count += 1
+        self._file.write(format_student_line(self.count, gpa, name))
+
+    def commit(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.temp_path, self.path)
+        Journal(f"{self.path}.wal").clear()
+
+    def discard(self):
+        self._file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+def _commit(writers: List[GroupWriter], removed: Iterable[str] = ()):
+    """Move every output into place, then remove the merged-away groups."""
+    for writer in writers:
+        writer.commit()
+    for path in removed:
+        os.remove(path)
+        Journal(f"{path}.wal").clear()
+
+@contextmanager
+def _writing(paths: Iterable[str]):
+    """Open a GroupWriter per path, keeping the header of existing groups; all outputs are discarded if the block fails."""
+    writers = {}
+    try:
+        for path in paths:
+            writers[path] = GroupWriter(path, read_header(path))
+        yield writers
+    except BaseException:
+        for writer in writers.values():
+            writer.discard()
+        raise
+
+def _unique(rows: Iterable[Row], duplicates: List[Row]) -> Iterator[Row]:
+    """Drop rows whose name (any case) was seen before, collecting them in duplicates."""
+    seen = set()
+    for name, gpa in rows:
+        key = name.lower()
+        if key in seen:
+            duplicates.append((name, gpa))
+            continue
+        seen.add(key)
+        yield name, gpa
+
+def _merged_rows(sources: List[str], order: str, directory: str) -> Iterator[Row]:
+    rows = chain.from_iterable(read_rows(path) for path in sources)
+    return sorted_by_gpa(rows, directory) if order == 'gpa' else rows
+
+def merge_groups(sources: List[str], target: str, order: str = 'gpa') -> Dict[str, object]:
+    """
+    Merge group files into one with a streaming k-way merge.
+
+    Students are renumbered 1, 2, ... in output order. When a name
+    appears more than once (any case) only the first occurrence is kept:
+    with order='gpa' that is the one with the highest GPA, with
+    order='source' the one from the earliest source.
+
+    ----------------------------------------
+
+    Args:
+        sources (List[str]): Group file paths to merge; target may be one of them
+        target (str): Path of the merged group file
+        order (str): 'gpa' for highest GPA first, 'source' to keep the
+                     sources' order one after another
+
+    Returns:
+        Dict[str, object]: {'students': rows written, 'duplicates': dropped (name, gpa) rows}
+
+    Raises:
+        ValueError: If order is unknown or no sources are given
+        FileExistsError: If target exists and is not one of the sources
+        OSError: If a source cannot be read
+
+    Note:
+        - Memory holds one sort chunk (CHUNK_ROWS rows) plus the set of
+          names already written, which duplicate resolution needs
+        - Sources other than target are removed after the target is in place
+        - An existing target keeps its header lines, a new one gets the
+          default header
+    """
+    if not sources:
+        raise ValueError("No groups to merge")
+    if order not in ('gpa', 'source'):
+        raise ValueError(f"Unknown order '{order}', expected 'gpa' or 'source'")
+    if target not in sources and os.path.exists(target):
+        raise FileExistsError(f"Group file {target} already exists")
+    directory = os.path.dirname(os.path.abspath(target))
+    duplicates: List[Row] = []
+    with locked_groups(list(sources) + [target]):
+        with _writing([target]) as writers:
+            writer = writers[target]
+            for name, gpa in _unique(_merged_rows(sources, order, directory), duplicates):
+                writer.write(name, gpa)
+        _commit([writer], [path for path in dict.fromkeys(sources) if path != target])
+    return {'students': writer.count, 'duplicates': duplicates}
+
+def split_group(source: str, assign: Callable[[str, float], Optional[str]]) -> Dict[str, int]:
+    """
+    Partition a group file in a single pass.
+
+    Every student goes to the group file assign returns for it; students
+    assigned None (or source itself) stay in the source group. Each output
+    is renumbered 1, 2, ... in source order.
+
+    ----------------------------------------
+
+    Args:
+        source (str): Path of the group file to split
+        assign (Callable[[str, float], Optional[str]]): Maps (name, gpa) to
+            the path of the target group file, see by_gpa and by_name
+
+    Returns:
+        Dict[str, int]: Number of students written per group file path,
+        including the source
+
+    Raises:
+        FileExistsError: If a target other than source already exists;
+                         use merge_groups to add students to a group
+
+    Examples:
+        >>> split_group("groups/121.txt", by_gpa({"groups/121a.txt": 90.0}))
+        {'groups/121a.txt': 14, 'groups/121.txt': 30}
+    """
+    directory = os.path.dirname(os.path.abspath(source))
+    with locked_groups([source]), ExitStack() as stack:
+        writers = stack.enter_context(_writing([source]))
+        for name, gpa in read_rows(source):
+            path = assign(name, gpa) or source
+            writer = writers.get(path)
+            if writer is None:
+                if os.path.exists(path):
+                    raise FileExistsError(f"Group file {path} already exists")
+                # The lock of a new group is only needed while it's written
+                stack.enter_context(locked_groups([path]))
+                writer = writers[path] = GroupWriter(path)
+            writer.write(name, gpa)
+        # Targets first: a crash before the source is rewritten duplicates
+        # students instead of losing them
+        _commit([writer for path, writer in writers.items() if path != source] + [writers[source]])
+    return {path: writer.count for path, writer in writers.items()}
+
+def by_gpa(bands: Dict[str, float]) -> Callable[[str, float], Optional[str]]:
+    """
+    Assign students to GPA bands for split_group.
+
+    Args:
+        bands (Dict[str, float]): Target path to the lowest GPA of its band;
+            a student goes to the band with the highest lower bound not above
+            their GPA, or stays in the source if below every bound
+    """
+    bounds = sorted(bands.items(), key=lambda band: band[1], reverse=True)
+    def assign(name: str, gpa: float) -> Optional[str]:
+        for path, lowest in bounds:
+            if gpa >= lowest:
+                return path
+        return None
+    return assign
+
+def by_name(ranges: Dict[str, str]) -> Callable[[str, float], Optional[str]]:
+    """
+    Assign students to alphabetical name ranges for split_group.
+
+    Args:
+        ranges (Dict[str, str]): Target path to the first name (prefix) of its
+            range, compared case-insensitively; a student goes to the range
+            with the last start not after their name, or stays in the source
+            if the name sorts before every start
+    """
+    starts = sorted(((start.lower(), path) for path, start in ranges.items()), reverse=True)
+    def assign(name: str, gpa: float) -> Optional[str]:
+        key = name.lower()
+        for start, path in starts:
+            if key >= start:
+                return path
+        return None
+    return assign
+
+def rebalance_groups(paths: List[str]) -> Dict[str, object]:
+    """
+    Redistribute the students of several groups evenly among them.
+
+    The groups are merged in GPA order and dealt out round-robin, so group
+    sizes differ by at most one and every group gets a similar spread of
+    GPAs. Duplicate names across the groups are resolved as in
+    merge_groups, keeping the highest GPA.
+
+    ----------------------------------------
+
+    Args:
+        paths (List[str]): Group file paths to rebalance
+
+    Returns:
+        Dict[str, object]: {'students': rows per path, 'duplicates': dropped (name, gpa) rows}
+    """
+    paths = list(dict.fromkeys(paths))
+    if not paths:
+        raise ValueError("No groups to rebalance")
+    directory = os.path.dirname(os.path.abspath(paths[0]))
+    duplicates: List[Row] = []
+    with locked_groups(paths):
+        with _writing(paths) as writers:
+            outputs = [writers[path] for path in paths]
+            for index, (name, gpa) in enumerate(_unique(_merged_rows(paths, 'gpa', directory), duplicates)):
+                outputs[index % len(outputs)].write(name, gpa)
+        _commit(outputs)
+    return {'students': {path: writers[path].count for path in paths}, 'duplicates': duplicates}
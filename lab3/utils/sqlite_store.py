@@ -0,0 +1,375 @@
+import math
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+from utils.group_store import GroupStore, format_student_line, is_name_pattern
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS groups (
+    name TEXT PRIMARY KEY,
+    header TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS students (
+    group_name TEXT NOT NULL REFERENCES groups (name) ON DELETE CASCADE,
+    student_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    gpa REAL NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (group_name, student_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS students_by_name ON students (group_name, name_key);
+CREATE INDEX IF NOT EXISTS students_by_gpa ON students (group_name, gpa);
+CREATE INDEX IF NOT EXISTS students_by_position ON students (group_name, position);
+"""
+
+# New students get position = student_id: IDs only grow, so they end up
+# last, the same as a line appended to a text group file
+INSERT_STUDENT = ("INSERT INTO students (group_name, student_id, name, name_key, gpa, position) "
+                  "VALUES (?, ?, ?, ?, ?, ?)")
+
+def default_header(group_name: str) -> str:
+    """Header lines of a new group, the same as in text group files."""
+    return f"Students\nGroup: {group_name}\n\n"
+
+class SqliteDatabase:
+    """Class holding the SQLite database with all student groups.
+
+    Every group is a row in the groups table; students live in one table
+    with indexes on (group, lower-case name) and (group, GPA), so duplicate
+    checks, deletes by name and GPA ordering don't scan the group.
+
+    ----------------------------------------
+
+    Attributes:
+        path (str): Path to the database file
+        connection (sqlite3.Connection): Connection of the calling thread
+
+    Methods:
+        transaction(): Runs a block in one write transaction
+        group_names(): Lists all groups
+        has_group(group_name): Checks if a group exists
+        create_group(group_name, header): Adds an empty group
+        import_text_group(path): Copies a .txt group file into the database
+        group(group_name): Returns a SqliteGroupStore for the group
+
+    Examples:
+        >>> database = SqliteDatabase("groups/groups.db")
+        >>> database.import_text_group("groups/121.txt")
+        >>> database.group("121").has_name("John Smith")
+        True
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared between threads, so every
+        # thread (e.g. the query engine workers) opens its own
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # Autocommit mode: transactions are opened by transaction() only
+            connection = self._local.connection = sqlite3.connect(self.path, timeout=30,
+                                                                  isolation_level=None)
+            self._local.depth = 0
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the block in one write transaction (BEGIN IMMEDIATE).
+
+        The write lock is taken at the start, so other processes can still
+        read but not write until the block ends; nested calls join the
+        outer transaction.
+        """
+        connection = self.connection
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield connection
+            finally:
+                self._local.depth -= 1
+            return
+
+        connection.execute("BEGIN IMMEDIATE")
+        self._local.depth = 1
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
+        finally:
+            self._local.depth = 0
+
+    def close(self):
+        """Close the connection of the calling thread."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def group_names(self) -> List[str]:
+        """Return the names of all groups, sorted."""
+        return [name for name, in self.connection.execute("SELECT name FROM groups ORDER BY name")]
+
+    def has_group(self, group_name: str) -> bool:
+        """Return True if the group exists."""
+        row = self.connection.execute("SELECT 1 FROM groups WHERE name = ?", (group_name,)).fetchone()
+        return row is not None
+
+    def create_group(self, group_name: str, header: str = None) -> bool:
+        """
+        Add an empty group unless it already exists.
+
+        Returns:
+            bool: True if the group was created
+        """
+        with self.transaction():
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO groups (name, header) VALUES (?, ?)",
+                (group_name, default_header(group_name) if header is None else header))
+        return cursor.rowcount == 1
+
+    def import_text_group(self, path: str) -> str:
+        """
+        Copy a text group file into the database, replacing a group of the same name.
+
+        The group is loaded through GroupStore, so students still in its
+        journal (<path>.wal) are imported too.
+
+        ----------------------------------------
+
+        Args:
+            path (str): Path to a .txt group file; the file name is the group name
+
+        Returns:
+            str: Name of the imported group
+        """
+        group_name = os.path.splitext(os.path.basename(path))[0]
+        store = GroupStore(path)
+        header, students = store.header, list(store.rows())
+
+        with self.transaction():
+            self.connection.execute("DELETE FROM groups WHERE name = ?", (group_name,))
+            self.connection.execute("INSERT INTO groups (name, header) VALUES (?, ?)",
+                                    (group_name, ''.join(header)))
+            self.connection.executemany(
+                INSERT_STUDENT,
+                ((group_name, student_id, name, name.lower(), gpa, position)
+                 for position, (student_id, name, gpa) in enumerate(students, 1)))
+        return group_name
+
+    def group(self, group_name: str) -> 'SqliteGroupStore':
+        """Return the store of an existing group."""
+        return SqliteGroupStore(self, group_name)
+
+class SqliteGroupStore:
+    """One group of a SqliteDatabase, with the interface of GroupStore.
+
+    Nothing is cached in memory: every call is a query, so several
+    managers can share the database file.
+
+    ----------------------------------------
+
+    Attributes:
+        database (SqliteDatabase): Database holding the group
+        group_name (str): Name of the group
+
+    Methods:
+        has_name(name): Case-insensitive duplicate check
+        find(identifier): Looks a student up by ID or name
+        add(name, gpa): Inserts a student and returns the new ID
+        add_many(students): Inserts a batch of students in one transaction
+        delete(identifier): Removes students by ID or name
+        transaction(): Holds the database write lock for a series of calls
+        sort_by_gpa(): Stores the students in ranked order, keeping IDs
+        rows(): Yields (id, name, gpa) entries in stored order
+        ranked(): Yields students by GPA through the GPA index
+        top(count): Returns the students with the highest GPA
+        percentile(percent): GPA at a percentile of the group
+        rows_in_gpa_range(min_gpa, max_gpa): Ranked students within a GPA range
+        lines(): Yields the group in text format
+        search(pattern): Returns text lines containing pattern
+    """
+    def __init__(self, database: SqliteDatabase, group_name: str):
+        self.database = database
+        self.group_name = group_name
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self.database.connection
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM students WHERE group_name = ?",
+                                       (self.group_name,)).fetchone()[0]
+
+    def refresh(self) -> bool:
+        """Nothing to reload, queries always see the current data."""
+        return False
+
+    def transaction(self):
+        """Hold the database write lock for a series of calls, see SqliteDatabase.transaction."""
+        return self.database.transaction()
+
+    @property
+    def header(self) -> List[str]:
+        row = self.connection.execute("SELECT header FROM groups WHERE name = ?",
+                                      (self.group_name,)).fetchone()
+        return row[0].splitlines(keepends=True) if row else []
+
+    @property
+    def next_id(self) -> int:
+        row = self.connection.execute("SELECT MAX(student_id) FROM students WHERE group_name = ?",
+                                      (self.group_name,)).fetchone()
+        return (row[0] or 0) + 1
+
+    def has_name(self, name: str) -> bool:
+        """Return True if a student with this name (any case) is in the group."""
+        row = self.connection.execute("SELECT 1 FROM students WHERE group_name = ? AND name_key = ?",
+                                      (self.group_name, name.strip().lower())).fetchone()
+        return row is not None
+
+    def find(self, identifier: str) -> List[int]:
+        """
+        Find students by ID or by name.
+
+        ----------------------------------------
+
+        Args:
+            identifier (str): Student ID (e.g. "3") or full name (any case)
+
+        Returns:
+            List[int]: Matching student IDs
+        """
+        identifier = identifier.strip()
+        if identifier.isdigit():
+            row = self.connection.execute(
+                "SELECT student_id FROM students WHERE group_name = ? AND student_id = ?",
+                (self.group_name, int(identifier))).fetchone()
+            if row:
+                return [row[0]]
+        return [student_id for student_id, in self.connection.execute(
+            "SELECT student_id FROM students WHERE group_name = ? AND name_key = ? ORDER BY student_id",
+            (self.group_name, identifier.lower()))]
+
+    def add(self, name: str, gpa: float) -> int:
+        """Insert a student and return the assigned ID."""
+        return self.add_many([(name, gpa)])[0]
+
+    def add_many(self, students: Iterable[Tuple[str, float]]) -> List[int]:
+        """
+        Insert a batch of students in a single transaction.
+
+        IDs are assigned consecutively from next_id. The caller is expected
+        to have validated the batch and removed duplicates.
+
+        ----------------------------------------
+
+        Args:
+            students (Iterable[Tuple[str, float]]): (name, gpa) pairs
+
+        Returns:
+            List[int]: IDs assigned to the students, in input order
+        """
+        with self.transaction():
+            batch = [(self.group_name, student_id, name, name.lower(), gpa, student_id)
+                     for student_id, (name, gpa) in enumerate(students, self.next_id)]
+            self.connection.executemany(INSERT_STUDENT, batch)
+        return [row[1] for row in batch]
+
+    def delete(self, identifier: str) -> List[Tuple[int, str, float]]:
+        """
+        Delete students by ID or name.
+
+        Returns:
+            List[Tuple[int, str, float]]: Deleted (id, name, gpa) entries
+        """
+        deleted = []
+        with self.transaction():
+            for student_id in self.find(identifier):
+                name, gpa = self.connection.execute(
+                    "SELECT name, gpa FROM students WHERE group_name = ? AND student_id = ?",
+                    (self.group_name, student_id)).fetchone()
+                self.connection.execute("DELETE FROM students WHERE group_name = ? AND student_id = ?",
+                                        (self.group_name, student_id))
+                deleted.append((student_id, name, gpa))
+        return deleted
+
+    def sort_by_gpa(self):
+        """Store the students in ranked order; student IDs stay the same."""
+        with self.transaction():
+            self.connection.execute(
+                "UPDATE students SET position = ranked.position "
+                "FROM (SELECT student_id, ROW_NUMBER() OVER (ORDER BY gpa DESC, student_id) AS position "
+                "      FROM students WHERE group_name = ?) AS ranked "
+                "WHERE students.group_name = ? AND students.student_id = ranked.student_id",
+                (self.group_name, self.group_name))
+
+    def rows(self) -> Iterator[Tuple[int, str, float]]:
+        """Yield (id, name, gpa) entries in stored order."""
+        return self.connection.execute(
+            "SELECT student_id, name, gpa FROM students WHERE group_name = ? ORDER BY position",
+            (self.group_name,))
+
+    def ranked(self, limit: int = -1, offset: int = 0) -> Iterator[Tuple[int, str, float]]:
+        """Yield (id, name, gpa) entries by GPA, highest first; equal GPAs by ID."""
+        return self.connection.execute(
+            "SELECT student_id, name, gpa FROM students WHERE group_name = ? "
+            "ORDER BY gpa DESC, student_id LIMIT ? OFFSET ?", (self.group_name, limit, offset))
+
+    def top(self, count: int) -> List[Tuple[int, str, float]]:
+        """Return the count students with the highest GPA."""
+        return self.ranked(count).fetchall()
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """GPA at the given percentile (nearest rank), see GroupStore.percentile."""
+        if not 0 <= percent <= 100:
+            raise ValueError("Percentile must be between 0 and 100")
+        count = len(self)
+        if not count:
+            return None
+        rank = max(math.ceil(percent / 100 * count), 1)
+        return self.ranked(1, count - rank).fetchone()[2]
+
+    def rows_in_gpa_range(self, min_gpa: float = None, max_gpa: float = None) -> Iterator[Tuple[int, str, float]]:
+        """Yield ranked (id, name, gpa) entries with min_gpa <= gpa <= max_gpa, using the GPA index."""
+        return self.connection.execute(
+            "SELECT student_id, name, gpa FROM students WHERE group_name = ? AND gpa >= ? AND gpa <= ? "
+            "ORDER BY gpa DESC, student_id",
+            (self.group_name, -math.inf if min_gpa is None else min_gpa,
+             math.inf if max_gpa is None else max_gpa))
+
+    def lines(self) -> Iterator[str]:
+        """Yield the group as text lines: header first, then one line per student."""
+        yield from self.header
+        for student_id, name, gpa in self.rows():
+            yield format_student_line(student_id, gpa, name)
+
+    def search(self, pattern: str) -> List[str]:
+        """
+        Return the text lines of the group that contain pattern (any case).
+
+        Name patterns (see is_name_pattern) are filtered by SQLite; anything
+        else is matched against the formatted lines.
+        """
+        pattern = pattern.lower()
+        if not is_name_pattern(pattern):
+            return [line.strip() for line in self.lines() if pattern in line.lower()]
+
+        lines = [line.strip() for line in self.header if pattern in line.lower()]
+        lines.extend(format_student_line(student_id, gpa, name).strip()
+                     for student_id, name, gpa in self.connection.execute(
+                         "SELECT student_id, name, gpa FROM students "
+                         "WHERE group_name = ? AND instr(name_key, ?) > 0 ORDER BY position",
+                         (self.group_name, pattern)))
+        return lines
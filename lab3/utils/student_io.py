@@ -0,0 +1,119 @@
+import csv
+import json
+import os
+from typing import Iterable, Iterator, TextIO, Tuple
+
+def read_csv(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Read students from a CSV file.
+
+    The file must have a header row with "name" and "gpa" columns; other
+    columns are ignored.
+
+    ----------------------------------------
+
+    Args:
+        path (str): Path to the CSV file
+
+    Yields:
+        Tuple[str, str]: (name, gpa) pairs, GPA not yet converted
+
+    Raises:
+        ValueError: If the header has no "name" or "gpa" column
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as file:
+        reader = csv.reader(file)
+        header = [column.strip().lower() for column in next(reader, [])]
+        if 'name' not in header or 'gpa' not in header:
+            raise ValueError("CSV file must have 'name' and 'gpa' columns")
+        name_column, gpa_column = header.index('name'), header.index('gpa')
+        width = max(name_column, gpa_column) + 1
+        for row in reader:
+            if len(row) >= width:
+                yield row[name_column], row[gpa_column]
+            elif row:
+                yield '', ''  # Short rows are reported as invalid
+
+def read_jsonl(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Read students from a JSON Lines file.
+
+    Every non-empty line must be an object with "name" and "gpa" keys,
+    e.g. {"name": "John Smith", "gpa": 85.5}.
+
+    ----------------------------------------
+
+    Args:
+        path (str): Path to the JSONL file
+
+    Yields:
+        Tuple[str, str]: (name, gpa) pairs
+
+    Raises:
+        ValueError: If a line is not valid JSON or misses a key
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                yield record['name'], record['gpa']
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                raise ValueError(f"Line {line_number}: {e}") from e
+
+def read_students(path: str) -> Iterator[Tuple[str, str]]:
+    """
+    Read students from a .csv or .jsonl file, chosen by extension.
+
+    ----------------------------------------
+
+    Args:
+        path (str): Path to the import file
+
+    Raises:
+        ValueError: If the extension is not supported
+    """
+    return read_csv(path) if file_format_of(path) == 'csv' else read_jsonl(path)
+
+def write_students(file: TextIO, rows: Iterable[Tuple[int, str, float]], file_format: str) -> int:
+    """
+    Write students to an open text file as CSV or JSON Lines.
+
+    The output has "id", "name" and "gpa" fields, so it can be imported
+    again with read_students (which ignores the IDs).
+
+    ----------------------------------------
+
+    Args:
+        file (TextIO): File to write to, opened with newline=''
+        rows (Iterable[Tuple[int, str, float]]): (id, name, gpa) entries
+        file_format (str): 'csv' or 'jsonl'
+
+    Returns:
+        int: Number of students written
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    count = 0
+    if file_format == 'csv':
+        writer = csv.writer(file)
+        writer.writerow(['id', 'name', 'gpa'])
+        for count, row in enumerate(rows, 1):
+            writer.writerow(row)
+    elif file_format == 'jsonl':
+        for count, (student_id, name, gpa) in enumerate(rows, 1):
+            file.write(json.dumps({'id': student_id, 'name': name, 'gpa': gpa}) + '\n')
+    else:
+        raise ValueError(f"Unsupported export format '{file_format}', use csv or jsonl")
+    return count
+
+def file_format_of(path: str) -> str:
+    """Return 'csv' or 'jsonl' for an import or export path, chosen by extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ValueError(f"Unsupported file format '{extension}', use .csv or .jsonl")
@@ -0,0 +1,91 @@
+from array import array
+from typing import Dict, Hashable, List, Optional
+
+def trigrams(text: str) -> set:
+    """Return the distinct three-character substrings of text."""
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+class TrigramIndex:
+    """Inverted index answering case-insensitive substring queries.
+
+    Every indexed text gets a slot number in insertion order, and every
+    trigram of the text maps to a compact array of slots. A query with
+    three or more characters only checks the slots of its rarest trigram;
+    shorter queries check every text. Results come back in insertion order.
+
+    Removed entries leave an empty slot behind; once more than half of
+    the slots are empty the owner should rebuild the index (see stale).
+
+    ----------------------------------------
+
+    Methods:
+        add(key, text): Indexes text under key
+        discard(key): Removes the entry of key
+        search(pattern): Keys whose text contains pattern
+
+    Examples:
+        >>> index = TrigramIndex()
+        >>> index.add(1, "John Smith")
+        >>> index.add(2, "Emma Davis")
+        >>> index.search("smi")
+        [1]
+    """
+    def __init__(self):
+        self._keys: List[Optional[Hashable]] = []
+        self._texts: List[Optional[str]] = []
+        self._slots: Dict[Hashable, int] = {}
+        self._postings: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def stale(self) -> bool:
+        """True when more than half of the slots belong to removed entries."""
+        return len(self._keys) > 2 * len(self._slots) + 64
+
+    def add(self, key: Hashable, text: str):
+        """Index text under key; a key that is already indexed is replaced."""
+        self.discard(key)
+        slot = len(self._keys)
+        text = text.lower()
+        self._keys.append(key)
+        self._texts.append(text)
+        self._slots[key] = slot
+        postings = self._postings
+        for gram in trigrams(text):
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array('I')
+            posting.append(slot)
+
+    def discard(self, key: Hashable):
+        """Remove the entry of key if it is indexed."""
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            self._keys[slot] = None
+            self._texts[slot] = None
+
+    def search(self, pattern: str) -> List[Hashable]:
+        """
+        Return the keys whose text contains pattern, ignoring case.
+
+        ----------------------------------------
+
+        Args:
+            pattern (str): Substring to look for
+
+        Returns:
+            List[Hashable]: Matching keys in insertion order
+        """
+        pattern = pattern.lower()
+        keys, texts = self._keys, self._texts
+        if len(pattern) < 3:
+            slots = range(len(texts))
+        else:
+            postings = [self._postings.get(gram) for gram in trigrams(pattern)]
+            if any(posting is None for posting in postings):
+                return []
+            slots = min(postings, key=len)
+        return [keys[slot] for slot in slots
+                if texts[slot] is not None and pattern in texts[slot]]
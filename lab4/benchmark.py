@@ -0,0 +1,329 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from mmap_tokenizer import MmapTokenizer
+from parallel_analyzer import analyze_corpus
+from text_analyzer import (PUNCTUATION, analyze_text, find_sequences, find_sequences_naive,
+                           normalize, read_lines, tokenize)
+
+
+def load_scaled_text(file_path, scale):
+    """
+    Read a text file and repeat its contents scale times.
+
+    Args:
+        file_path (str): Path to the source text
+        scale (int): How many copies of the text to join
+
+    Returns:
+        str: Scaled text
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        text = file.read()
+    return '\n'.join([text] * scale)
+
+def time_call(func, *args, **kwargs):
+    """
+    Call func once and measure its wall-clock time.
+
+    Returns:
+        tuple: (result, seconds)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def benchmark_sequences(file_path, scales, naive_scales):
+    """
+    Compare find_sequences against find_sequences_naive on scaled copies of a text.
+
+    The naive engine is quadratic, so it only runs for scales listed in
+    naive_scales; for those the results of both engines are also compared.
+
+    Args:
+        file_path (str): Path to the source text
+        scales (list): Scale factors to benchmark
+        naive_scales (list): Scale factors the naive engine should run on
+    """
+    print("find_sequences benchmark")
+    print("-" * 50)
+    print(f"{'Scale':>6} {'Words':>10} {'Fast, s':>10} {'Naive, s':>10} {'Same':>6}")
+
+    for scale in scales:
+        text = load_scaled_text(file_path, scale)
+        fast, fast_time = time_call(find_sequences, text)
+
+        naive_time, same = '-', '-'
+        if scale in naive_scales:
+            naive, elapsed = time_call(find_sequences_naive, text)
+            naive_time, same = f"{elapsed:.3f}", str(naive == fast)
+
+        print(f"{scale:>6} {len(text.split()):>10} {fast_time:>10.3f} {naive_time:>10} {same:>6}")
+
+def write_scaled_file(file_path, scale, shuffle=False):
+    """
+    Write scale copies of a text file into a temporary file.
+
+    With shuffle, the lines of the copies are shuffled (with a fixed seed),
+    so that far fewer sequences repeat than in plain copies.
+
+    Returns:
+        str: Path to the temporary file; the caller removes it
+    """
+    text = load_scaled_text(file_path, scale)
+    if shuffle:
+        lines = text.splitlines(keepends=True)
+        random.Random(0).shuffle(lines)
+        text = ''.join(lines)
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as file:
+        file.write(text)
+    return file.name
+
+def peak_memory(func, *args, **kwargs):
+    """
+    Call func once and measure the peak memory it allocated.
+
+    Returns:
+        tuple: (result, seconds, peak bytes)
+    """
+    tracemalloc.start()
+    try:
+        result, elapsed = time_call(func, *args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+def benchmark_streaming(file_path, scales, shuffle=False):
+    """
+    Compare the default and streaming modes of analyze_text.
+
+    Args:
+        file_path (str): Path to the source text
+        scales (list): Scale factors to benchmark
+        shuffle (bool): Shuffle the lines of the scaled text
+    """
+    print("analyze_text streaming benchmark")
+    print("-" * 50)
+    print(f"{'Scale':>6} {'Mode':>10} {'Time, s':>10} {'Peak, MB':>10} {'Same':>6}")
+
+    for scale in scales:
+        scaled_path = write_scaled_file(file_path, scale, shuffle)
+        try:
+            expected, elapsed, peak = peak_memory(analyze_text, scaled_path)
+            print(f"{scale:>6} {'default':>10} {elapsed:>10.3f} {peak / 2**20:>10.1f} {'-':>6}")
+            result, elapsed, peak = peak_memory(analyze_text, scaled_path, streaming=True)
+            print(f"{scale:>6} {'streaming':>10} {elapsed:>10.3f} {peak / 2**20:>10.1f} "
+                  f"{str(result == expected):>6}")
+        finally:
+            os.remove(scaled_path)
+
+def benchmark_parallel(file_path, scales, max_workers):
+    """
+    Measure how analyze_corpus scales from 1 to max_workers processes.
+
+    Args:
+        file_path (str): Path to the source text
+        scales (list): Scale factors to benchmark
+        max_workers (int): Largest number of worker processes to try
+    """
+    print("analyze_corpus scaling benchmark")
+    print("-" * 50)
+    print(f"{'Scale':>6} {'Workers':>8} {'Time, s':>10} {'Speedup':>8}")
+
+    for scale in scales:
+        scaled_path = write_scaled_file(file_path, scale)
+        try:
+            shard_size = max(os.path.getsize(scaled_path) // (max_workers * 4), 1)
+            baseline = None
+            for workers in range(1, max_workers + 1):
+                _, elapsed = time_call(analyze_corpus, scaled_path, workers, shard_size)
+                baseline = baseline or elapsed
+                print(f"{scale:>6} {workers:>8} {elapsed:>10.3f} {baseline / elapsed:>8.2f}")
+        finally:
+            os.remove(scaled_path)
+
+def tokenize_text_loop(file_path):
+    stats = {'chars_with_spaces': 0, 'chars_without_spaces': 0}
+    return list(normalize(tokenize(read_lines(file_path, stats))))
+
+def tokenize_mmap(file_path):
+    return MmapTokenizer(PUNCTUATION).word_ids(file_path)
+
+def benchmark_tokenizer(file_path, scales):
+    """
+    Compare the line-by-line text tokenizer against MmapTokenizer.
+
+    Both the tokenizing step alone and the full analyze_text call are timed.
+
+    Args:
+        file_path (str): Path to the source text
+        scales (list): Scale factors to benchmark
+    """
+    print("tokenizer benchmark")
+    print("-" * 50)
+    print(f"{'Scale':>6} {'Step':>10} {'Text, s':>10} {'Mmap, s':>10} {'Text, MB':>10} "
+          f"{'Mmap, MB':>10} {'Same':>6}")
+
+    for scale in scales:
+        scaled_path = write_scaled_file(file_path, scale)
+        try:
+            words, text_time, text_peak = peak_memory(tokenize_text_loop, scaled_path)
+            word_ids, mmap_time, mmap_peak = peak_memory(tokenize_mmap, scaled_path)
+            same = len(words) == len(word_ids)
+            print(f"{scale:>6} {'tokenize':>10} {text_time:>10.3f} {mmap_time:>10.3f} "
+                  f"{text_peak / 2**20:>10.1f} {mmap_peak / 2**20:>10.1f} {str(same):>6}")
+            del words, word_ids
+
+            expected, text_time = time_call(analyze_text, scaled_path)
+            result, mmap_time = time_call(analyze_text, scaled_path, tokenizer='mmap')
+            print(f"{scale:>6} {'analyze':>10} {text_time:>10.3f} {mmap_time:>10.3f} "
+                  f"{'-':>10} {'-':>10} {str(result == expected):>6}")
+        finally:
+            os.remove(scaled_path)
+
+def benchmark_top_k(file_path, scales, top_k, capacity):
+    """
+    Compare top-K mode of analyze_text against exact streaming counts.
+
+    Args:
+        file_path (str): Path to the source text
+        scales (list): Scale factors to benchmark
+        top_k (int): Number of sequences to report
+        capacity (int): Size of the SpaceSaving summary
+    """
+    print("analyze_text top-K benchmark")
+    print("-" * 50)
+    print(f"{'Scale':>6} {'Mode':>10} {'Time, s':>10} {'Peak, MB':>10} {'Error':>6}")
+
+    for scale in scales:
+        scaled_path = write_scaled_file(file_path, scale)
+        try:
+            _, elapsed, peak = peak_memory(analyze_text, scaled_path, streaming=True)
+            print(f"{scale:>6} {'exact':>10} {elapsed:>10.3f} {peak / 2**20:>10.1f} {0:>6}")
+            result, elapsed, peak = peak_memory(analyze_text, scaled_path,
+                                                top_k=top_k, capacity=capacity)
+            print(f"{scale:>6} {'top-k':>10} {elapsed:>10.3f} {peak / 2**20:>10.1f} "
+                  f"{result['sequence_error_bound']:>6}")
+        finally:
+            os.remove(scaled_path)
+
+def benchmark_numpy(file_path, scales):
+    """
+    Compare the python and numpy backends of analyze_text.
+
+    Both use MmapTokenizer, so the difference is in the word and sequence
+    statistics.
+
+    Args:
+        file_path (str): Path to the source text
+        scales (list): Scale factors to benchmark
+    """
+    print("analyze_text numpy backend benchmark")
+    print("-" * 50)
+    print(f"{'Scale':>6} {'Python, s':>10} {'NumPy, s':>10} {'Speedup':>8} {'Same':>6}")
+
+    for scale in scales:
+        scaled_path = write_scaled_file(file_path, scale)
+        try:
+            expected, python_time = time_call(analyze_text, scaled_path, tokenizer='mmap')
+            result, numpy_time = time_call(analyze_text, scaled_path, backend='numpy')
+            print(f"{scale:>6} {python_time:>10.3f} {numpy_time:>10.3f} "
+                  f"{python_time / numpy_time:>8.2f} {str(result == expected):>6}")
+        finally:
+            os.remove(scaled_path)
+
+def benchmark_index(file_path, scales, append_lines):
+    """
+    Compare the default mode of analyze_text against an NgramIndex.
+
+    The index is built, reused on the unchanged file and updated after
+    append_lines lines of the source text are appended; each step is
+    timed against a full default run on the same file.
+
+    Args:
+        file_path (str): Path to the source text
+        scales (list): Scale factors to benchmark
+        append_lines (int): Lines appended before the last step
+    """
+    print("analyze_text index benchmark")
+    print("-" * 50)
+    print(f"{'Scale':>6} {'Step':>10} {'Default, s':>10} {'Index, s':>10} {'Text, MB':>10} "
+          f"{'Index, MB':>10} {'Same':>6}")
+
+    with open(file_path, 'r', encoding='utf-8') as file:
+        appended = ''.join(file.readlines()[:append_lines])
+    for scale in scales:
+        scaled_path = write_scaled_file(file_path, scale)
+        index_path = f"{scaled_path}.idx"
+        try:
+            for step in ('build', 'unchanged', 'append'):
+                if step == 'append':
+                    with open(scaled_path, 'a', encoding='utf-8') as file:
+                        file.write(appended)
+                expected, default_time = time_call(analyze_text, scaled_path)
+                result, index_time = time_call(analyze_text, scaled_path, index_path=index_path)
+                print(f"{scale:>6} {step:>10} {default_time:>10.3f} {index_time:>10.3f} "
+                      f"{os.path.getsize(scaled_path) / 2**20:>10.2f} "
+                      f"{os.path.getsize(index_path) / 2**20:>10.2f} {str(result == expected):>6}")
+        finally:
+            os.remove(scaled_path)
+            if os.path.exists(index_path):
+                os.remove(index_path)
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--file', default='book.txt', help="Text file to analyze")
+    common.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help="How many copies of the file to analyze")
+
+    parser = argparse.ArgumentParser(description="Benchmarks for the lab4 text analyzer")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sequences = commands.add_parser('sequences', parents=[common],
+                                    help="find_sequences against the naive engine")
+    sequences.add_argument('--naive-scales', type=int, nargs='*', default=[1],
+                           help="Scales the quadratic reference engine should also run on")
+    streaming = commands.add_parser('streaming', parents=[common],
+                                    help="analyze_text default against streaming mode")
+    streaming.add_argument('--shuffle', action='store_true',
+                           help="Shuffle the lines of the scaled text")
+    parallel = commands.add_parser('parallel', parents=[common],
+                                   help="analyze_corpus with 1..N worker processes")
+    parallel.add_argument('--max-workers', type=int, default=os.cpu_count(),
+                          help="Largest number of worker processes to try")
+    commands.add_parser('tokenizer', parents=[common],
+                        help="line-by-line text tokenizer against MmapTokenizer")
+    top_k = commands.add_parser('topk', parents=[common],
+                                help="top-K mode against exact streaming counts")
+    top_k.add_argument('--top-k', type=int, default=20, help="Number of sequences to report")
+    top_k.add_argument('--capacity', type=int, default=None, help="SpaceSaving summary size")
+    commands.add_parser('numpy', parents=[common],
+                        help="python against numpy backend of analyze_text")
+    index = commands.add_parser('index', parents=[common],
+                                help="default mode against building, reusing and updating an index")
+    index.add_argument('--append-lines', type=int, default=100,
+                       help="Lines of the source text appended before the update step")
+    args = parser.parse_args()
+
+    if args.command == 'sequences':
+        benchmark_sequences(args.file, args.scales, args.naive_scales)
+    elif args.command == 'streaming':
+        benchmark_streaming(args.file, args.scales, args.shuffle)
+    elif args.command == 'parallel':
+        benchmark_parallel(args.file, args.scales, args.max_workers)
+    elif args.command == 'tokenizer':
+        benchmark_tokenizer(args.file, args.scales)
+    elif args.command == 'topk':
+        benchmark_top_k(args.file, args.scales, args.top_k, args.capacity)
+    elif args.command == 'numpy':
+        benchmark_numpy(args.file, args.scales)
+    elif args.command == 'index':
+        benchmark_index(args.file, args.scales, args.append_lines)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+class SpaceSaving:
+    """
+    Approximate counter that keeps at most capacity items (Space-Saving).
+
+    When a new item arrives and the summary is full, the item with the
+    smallest count is evicted and the newcomer inherits that count plus one.
+    Every reported count therefore overestimates the true count by at most
+    the item's recorded error, which never exceeds total / capacity, and
+    any item seen more than total / capacity times is guaranteed to be kept.
+
+    Items are bucketed by count, so offering an item costs O(1).
+
+    Attributes:
+        capacity (int): Maximum number of tracked items
+        total (int): Number of items offered so far
+
+    Examples:
+        >>> summary = SpaceSaving(2)
+        >>> for item in "aabac":
+        ...     summary.offer(item)
+        >>> summary.top(1)
+        [('a', 3, 0)]
+    """
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("Capacity must be positive")
+        self.capacity = capacity
+        self.total = 0
+        self._counts = {}
+        self._errors = {}
+        self._buckets = {}
+        self._min_count = 0
+
+    def __len__(self):
+        return len(self._counts)
+
+    def _move(self, item, old_count, new_count):
+        if old_count:
+            bucket = self._buckets[old_count]
+            del bucket[item]
+            if not bucket:
+                del self._buckets[old_count]
+                if self._min_count == old_count:
+                    self._min_count = new_count
+        self._buckets.setdefault(new_count, {})[item] = None
+        self._counts[item] = new_count
+
+    def offer(self, item):
+        """Count one occurrence of item."""
+        self.total += 1
+        count = self._counts.get(item)
+        if count is not None:
+            self._move(item, count, count + 1)
+            return
+
+        if len(self._counts) < self.capacity:
+            self._errors[item] = 0
+            self._move(item, 0, 1)
+            self._min_count = 1
+            return
+
+        # The newcomer takes over the slot of an item with the smallest count
+        count = self._min_count
+        bucket = self._buckets[count]
+        victim = next(iter(bucket))
+        del bucket[victim], self._counts[victim], self._errors[victim]
+        bucket[item] = None
+        self._errors[item] = count
+        self._move(item, count, count + 1)
+
+    @property
+    def error_bound(self):
+        """Largest possible overestimation of any reported count."""
+        return self._min_count if len(self._counts) >= self.capacity else 0
+
+    def top(self, k):
+        """
+        Return the k items with the highest estimated counts.
+
+        Returns:
+            list: (item, estimated count, maximum overestimation) tuples,
+                  highest count first
+        """
+        ranked = sorted(self._counts.items(), key=lambda pair: -pair[1])[:k]
+        return [(item, count, self._errors[item]) for item, count in ranked]
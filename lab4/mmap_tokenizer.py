@@ -0,0 +1,109 @@
+import mmap
+import re
+from itertools import chain
+
+DEFAULT_CHUNK_SIZE = 2**20
+
+# Everything str.isspace() accepts, spelled as UTF-8 byte sequences
+WHITESPACE = (rb'(?:[\t\n\x0b\x0c\r\x1c-\x1f ]|\xc2[\x85\xa0]|\xe1\x9a\x80'
+              rb'|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80)')
+# Whitespace removed by line.strip(): runs at the start or end of a chunk and
+# every run that contains a line break
+STRIPPED_RUN = re.compile(rb'\A%s+|%s*[\r\n]%s*|%s+\Z' % ((WHITESPACE,) * 4))
+NOT_CONTINUATION = bytes(range(0x80)) + bytes(range(0xC0, 0x100))
+# Whitespace that bytes.split() and bytes.strip() do not know about
+EXOTIC_WHITESPACE = tuple(bytes([byte]) for byte in range(0x1c, 0x20)) + tuple(
+    char.encode('utf-8') for char in '\x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005'
+                                     '\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000')
+
+
+def count_code_points(data):
+    """Count the characters encoded in a UTF-8 byte string."""
+    return len(data) - len(data.translate(None, NOT_CONTINUATION))
+
+def line_aligned_chunks(buffer, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield byte chunks of a buffer, each ending right after a b'\\n'.
+
+    Args:
+        buffer (mmap.mmap): Memory-mapped file
+        chunk_size (int): Approximate chunk size in bytes
+    """
+    start = 0
+    size = len(buffer)
+    while start < size:
+        end = buffer.find(b'\n', min(start + chunk_size, size) - 1)
+        end = size if end == -1 else end + 1
+        yield buffer[start:end]
+        start = end
+
+def count_chars(chunk):
+    """
+    Count characters of a line-aligned chunk the way text mode reading does.
+
+    Args:
+        chunk (bytes): UTF-8 bytes starting at a line boundary
+
+    Returns:
+        tuple: (chars with spaces, chars without leading/trailing line whitespace)
+    """
+    code_points = count_code_points(chunk)
+    chars_with_spaces = code_points - chunk.count(b'\r\n')
+    if any(space in chunk for space in EXOTIC_WHITESPACE):
+        stripped = b''.join(STRIPPED_RUN.findall(chunk))
+        return chars_with_spaces, code_points - count_code_points(stripped)
+    return chars_with_spaces, count_code_points(b''.join(map(bytes.strip, chunk.splitlines())))
+
+class MmapTokenizer:
+    """
+    Tokenizer that scans the UTF-8 bytes of a memory-mapped file.
+
+    Tokens are split on ASCII whitespace straight from the byte chunks. The
+    costly part of the text pipeline (decoding, lowercasing, splitting on
+    Unicode whitespace and stripping punctuation) runs once per distinct raw
+    token and is cached as a tuple of word IDs, so repeated tokens cost one
+    dictionary lookup.
+
+    Attributes:
+        vocabulary (dict): Word to ID mapping
+        chars_with_spaces (int): Characters read so far
+        chars_without_spaces (int): Characters without line-edge whitespace
+    """
+    def __init__(self, punctuation, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.punctuation = punctuation
+        self.chunk_size = chunk_size
+        self.vocabulary = {}
+        self.chars_with_spaces = 0
+        self.chars_without_spaces = 0
+        self._token_ids = {}
+
+    def _resolve(self, raw):
+        words = (word.strip(self.punctuation) for word in raw.decode('utf-8').lower().split())
+        return tuple(self.vocabulary.setdefault(word, len(self.vocabulary))
+                     for word in words if word)
+
+    def iter_chunk_ids(self, file_path):
+        """
+        Yield the word IDs of a file, one list per chunk.
+
+        Args:
+            file_path (str): Path to a UTF-8 text file
+        """
+        token_ids = self._token_ids
+        with open(file_path, 'rb') as file:
+            if not file.seek(0, 2):
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                for chunk in line_aligned_chunks(buffer, self.chunk_size):
+                    with_spaces, without_spaces = count_chars(chunk)
+                    self.chars_with_spaces += with_spaces
+                    self.chars_without_spaces += without_spaces
+
+                    tokens = chunk.split()
+                    for raw in set(tokens).difference(token_ids):
+                        token_ids[raw] = self._resolve(raw)
+                    yield list(chain.from_iterable(map(token_ids.__getitem__, tokens)))
+
+    def word_ids(self, file_path):
+        """Return the word IDs of a whole file as one list."""
+        return list(chain.from_iterable(self.iter_chunk_ids(file_path)))
@@ -0,0 +1,212 @@
+import hashlib
+import io
+import os
+import pickle
+from array import array
+from bisect import bisect_left, bisect_right
+
+INDEX_VERSION = 2
+HASH_CHUNK_SIZE = 2**20
+
+
+def prefix_digest(file_path, offset):
+    """
+    Hash the first offset bytes of a file with SHA-256.
+
+    Args:
+        file_path (str): Path to the indexed file
+        offset (int): Length of the prefix
+
+    Returns:
+        hashlib object that can be updated with the bytes that follow, or
+        None if the file is shorter than offset
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        remaining = offset
+        while remaining:
+            chunk = file.read(min(remaining, HASH_CHUNK_SIZE))
+            if not chunk:
+                return None
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest
+
+class NgramIndex:
+    """
+    On-disk word statistics and repeated sequences of a text file that only grows.
+
+    Instead of counts of every sequence, the index keeps the word IDs of
+    the text, the set of sequences that are already repeated min_repeats
+    times, and the start positions of all sequences sorted by their next
+    max_words word IDs. A sequence that is not repeated yet is counted
+    with two binary searches per run of sorted positions, so appended text
+    only needs its own sequences looked up. New positions are sorted into
+    a small run that is merged with the previous one once it grows to half
+    its size, keeping the number of runs logarithmic.
+
+    The index remembers how many bytes of the file it has consumed. Only
+    complete lines are committed, so an unfinished last line is re-read on
+    the next update instead of being split in two.
+
+    Attributes:
+        offset (int): Bytes of the file already counted
+        fingerprint (str): SHA-256 of those bytes
+        chars_with_spaces (int): Characters counted so far
+        chars_without_spaces (int): Characters without line-edge whitespace
+        word_frequency (dict): Word to count mapping
+        vocabulary (dict): Word to ID mapping used by word_ids
+        word_ids (array): ID of every word counted so far
+        runs (list): Arrays of start positions, each sorted by the
+            max_words word IDs from there; positions closer than max_words
+            to the end are not sorted yet
+        frequent (set): Tuples of word IDs repeated at least min_repeats
+            times, min_words..max_words long
+        pending (str): Unfinished last line found by the latest update,
+            not stored on disk
+    """
+    FIELDS = ('min_words', 'min_repeats', 'max_words', 'offset', 'fingerprint',
+              'chars_with_spaces', 'chars_without_spaces', 'word_frequency', 'vocabulary',
+              'word_ids', 'runs', 'frequent')
+
+    def __init__(self, min_words=3, min_repeats=5, max_words=7):
+        self.min_words = min_words
+        self.min_repeats = min_repeats
+        self.max_words = max_words
+        self.offset = 0
+        self.fingerprint = None
+        self.chars_with_spaces = 0
+        self.chars_without_spaces = 0
+        self.word_frequency = {}
+        self.vocabulary = {}
+        self.word_ids = array('I')
+        self.runs = []
+        self.frequent = set()
+        self.pending = ''
+        self._digest = hashlib.sha256()
+
+    @classmethod
+    def load(cls, index_path, file_path, min_words=3, min_repeats=5, max_words=7):
+        """
+        Load the index for file_path, or start a new one.
+
+        A new index is returned when index_path cannot be loaded for any
+        reason, was built with other parameters, or no longer matches the
+        beginning of the file (the file was edited rather than appended to).
+
+        Returns:
+            NgramIndex: Index ready for appended_lines()
+        """
+        try:
+            with open(index_path, 'rb') as file:
+                state = pickle.load(file)
+            if (state['version'] != INDEX_VERSION
+                    or (state['min_words'], state['min_repeats'], state['max_words'])
+                    != (min_words, min_repeats, max_words)):
+                return cls(min_words, min_repeats, max_words)
+            digest = prefix_digest(file_path, state['offset'])
+            if digest is None or digest.hexdigest() != state['fingerprint']:
+                return cls(min_words, min_repeats, max_words)
+
+            index = cls(min_words, min_repeats, max_words)
+            for field in cls.FIELDS:
+                setattr(index, field, state[field])
+            index._digest = digest
+            index._check()
+            return index
+        except Exception:  # Missing, damaged or foreign files are rebuilt
+            return cls(min_words, min_repeats, max_words)
+
+    def _check(self):
+        """Raise ValueError if the loaded fields don't fit together."""
+        if (not isinstance(self.word_ids, array) or self.word_ids.typecode != 'I'
+                or sum(self.word_frequency.values()) != len(self.word_ids)
+                or len(self.word_frequency) != len(self.vocabulary)
+                or sum(map(len, self.runs)) != self._sorted_end()
+                or not all(isinstance(gram, tuple) for gram in self.frequent)):
+            raise ValueError("Inconsistent n-gram index")
+
+    def save(self, index_path):
+        """Write the index next to a temporary file and move it into place."""
+        state = {field: getattr(self, field) for field in self.FIELDS}
+        state['version'] = INDEX_VERSION
+        temp_path = f"{index_path}.tmp"
+        with open(temp_path, 'wb') as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, index_path)
+
+    def appended_lines(self, file_path):
+        """
+        Yield complete lines written after offset, advancing offset.
+
+        Lines are decoded the way text mode reading does. Whatever follows
+        the last b'\\n' is left in pending.
+
+        Args:
+            file_path (str): Path to the indexed file
+        """
+        self.pending = ''
+        with open(file_path, 'rb') as file:
+            file.seek(self.offset)
+            for raw in file:
+                if not raw.endswith(b'\n'):
+                    self.pending = raw.decode('utf-8')
+                    break
+                line = raw.decode('utf-8')
+                if '\r' in line:
+                    yield from io.StringIO(line, newline=None)
+                else:
+                    yield line
+                self.offset += len(raw)
+                self._digest.update(raw)
+        self.fingerprint = self._digest.hexdigest()
+
+    def _sorted_end(self):
+        """Number of start positions followed by at least max_words words."""
+        return max(len(self.word_ids) - self.max_words + 1, 0)
+
+    def count(self, gram):
+        """
+        Count the occurrences of a sequence in word_ids.
+
+        Args:
+            gram (tuple): Word IDs, at most max_words of them
+
+        Returns:
+            int: Exact number of occurrences
+        """
+        word_ids = self.word_ids
+        length = len(gram)
+        gram = array('I', gram)
+
+        def key(i):
+            return word_ids[i:i + length]
+
+        total = sum(bisect_right(run, gram, key=key) - bisect_left(run, gram, key=key)
+                    for run in self.runs)
+        return total + sum(1 for i in range(self._sorted_end(), len(word_ids))
+                           if word_ids[i:i + length] == gram)
+
+    def append(self, word_ids):
+        """
+        Add word IDs to the end of the text and sort the new start positions.
+
+        Args:
+            word_ids (iterable): IDs of the appended words
+        """
+        start = self._sorted_end()
+        self.word_ids.extend(word_ids)
+        all_ids = self.word_ids
+        max_words = self.max_words
+
+        def key(i):
+            return all_ids[i:i + max_words]
+
+        runs = self.runs
+        if start == self._sorted_end():
+            return
+        runs.append(array('I', sorted(range(start, self._sorted_end()), key=key)))
+        # Sorting two sorted runs is a linear merge for Timsort
+        while len(runs) > 1 and 2 * len(runs[-1]) > len(runs[-2]):
+            newest = runs.pop()
+            runs[-1] = array('I', sorted(runs[-1] + newest, key=key))
@@ -0,0 +1,86 @@
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:
+    np = None
+
+
+def require_numpy():
+    """Raise ImportError if NumPy is not installed."""
+    if np is None:
+        raise ImportError("The numpy backend requires NumPy: pip install numpy")
+
+def as_word_array(word_ids):
+    """Convert a list of word IDs into an int64 array."""
+    require_numpy()
+    return np.asarray(word_ids, dtype=np.int64)
+
+def word_statistics(word_ids):
+    """
+    Count total, unique and single-occurrence words with np.bincount.
+
+    Args:
+        word_ids (np.ndarray): Word IDs as returned by as_word_array
+
+    Returns:
+        dict: 'total_words', 'unique_words' and 'single_occurrence'
+    """
+    frequency = np.bincount(word_ids)
+    return {
+        'total_words': int(word_ids.size),
+        'unique_words': int(np.count_nonzero(frequency)),
+        'single_occurrence': int(np.count_nonzero(frequency == 1)),
+    }
+
+def count_sequences(word_ids, min_words=3, min_repeats=5, max_words=7):
+    """
+    Vectorized version of text_analyzer.count_sequences.
+
+    Every level packs (ID of the first L words, next word ID) into one
+    int64 key and ranks the keys with np.unique, which gives dense IDs for
+    the sequences of length L + 1 together with their counts. Start
+    positions whose sequence is not repeated enough are dropped before the
+    next level.
+
+    Args:
+        word_ids (np.ndarray): Word IDs as returned by as_word_array
+        min_words (int): Minimum words in sequence
+        min_repeats (int): Minimum repetitions required
+        max_words (int): Maximum words in sequence
+
+    Returns:
+        dict: Tuples of word IDs and their exact counts, ordered by length
+              and then by first occurrence
+    """
+    total_words = word_ids.size
+    found = {}
+    if total_words == 0:
+        return found
+
+    vocabulary_size = int(word_ids.max()) + 1
+    starts = np.arange(total_words)
+    keys = word_ids
+
+    for length in range(1, min(max_words + 1, total_words)):
+        if length > 1:
+            keep = np.searchsorted(starts, total_words - length, side='right')
+            starts = starts[:keep]
+            keys = gram_ids[:keep] * vocabulary_size + word_ids[starts + length - 1]
+
+        _, first, gram_ids, counts = np.unique(keys, return_index=True,
+                                               return_inverse=True, return_counts=True)
+        frequent = counts[gram_ids] >= min_repeats
+        if not frequent.any():
+            break
+
+        if length >= min_words:
+            repeated = np.flatnonzero(counts >= min_repeats)
+            repeated = repeated[np.argsort(first[repeated], kind='stable')]
+            windows = sliding_window_view(word_ids, length)[starts[first[repeated]]]
+            for gram, count in zip(windows.tolist(), counts[repeated].tolist()):
+                found[tuple(gram)] = count
+
+        starts = starts[frequent]
+        gram_ids = gram_ids[frequent]
+
+    return found
@@ -0,0 +1,217 @@
+import argparse
+import io
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from text_analyzer import (count_chars, count_ngrams, count_words, normalize, print_results,
+                           tokenize)
+
+DEFAULT_SHARD_SIZE = 4 * 2**20
+
+
+def collect_files(path):
+    """
+    List the text files that make up a corpus.
+
+    Args:
+        path (str): A single file or a directory of .txt files
+
+    Returns:
+        list: Sorted file paths
+    """
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path)
+                      if name.endswith('.txt'))
+    return [path]
+
+def plan_shards(file_paths, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Split files into byte ranges that start and end on line boundaries.
+
+    Args:
+        file_paths (list): Files to split
+        shard_size (int): Approximate shard size in bytes
+
+    Returns:
+        list: (file_path, start, end) tuples in file order
+    """
+    shards = []
+    for file_path in file_paths:
+        size = os.path.getsize(file_path)
+        start = 0
+        with open(file_path, 'rb') as file:
+            while start < size:
+                file.seek(min(start + shard_size, size))
+                file.readline()
+                end = min(file.tell(), size)
+                shards.append((file_path, start, end))
+                start = end
+        if size == 0:
+            shards.append((file_path, 0, 0))
+    return shards
+
+def analyze_shard(shard, min_words=3, max_words=7):
+    """
+    Count characters, words and sequences inside one shard.
+
+    Sequences are keyed by tuples of words so that counts from different
+    shards can be merged. The first and last max_words - 1 words are
+    returned as well, for sequences that straddle shard boundaries.
+
+    Args:
+        shard (tuple): (file_path, start, end) as returned by plan_shards
+
+    Returns:
+        dict: Partial statistics for the shard
+    """
+    file_path, start, end = shard
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        data = file.read(end - start)
+
+    stats = {'chars_with_spaces': 0, 'chars_without_spaces': 0}
+    lines = count_chars(io.StringIO(data.decode('utf-8'), newline=None), stats)
+
+    word_frequency = {}
+    vocabulary = {}
+    ngram_counts = defaultdict(Counter)
+    edge = max_words - 1
+    head = []
+    tail = []
+
+    def track_edges(words):
+        for word in words:
+            if len(head) < edge:
+                head.append(word)
+            tail.append(word)
+            if len(tail) > edge:
+                del tail[0]
+            yield word
+
+    words = track_edges(count_words(normalize(tokenize(lines)), word_frequency))
+    count_ngrams(words, vocabulary, ngram_counts, min_words, max_words)
+
+    words_by_id = list(vocabulary)
+    return {
+        'file_path': file_path,
+        'chars_with_spaces': stats['chars_with_spaces'],
+        'chars_without_spaces': stats['chars_without_spaces'],
+        'word_frequency': word_frequency,
+        'ngram_counts': {length: {tuple(words_by_id[i] for i in gram): count
+                                  for gram, count in counts.items()}
+                         for length, counts in ngram_counts.items()},
+        'head': head,
+        'tail': tail,
+    }
+
+def count_boundary_ngrams(tail, head, ngram_counts, min_words=3, max_words=7):
+    """
+    Count sequences that start in tail and end in head.
+
+    Args:
+        tail (list): Last words before a shard boundary
+        head (list): First words after the boundary
+        ngram_counts (dict): Length to Counter mapping, extended in place
+    """
+    joined = tail + head
+    for length in range(min_words, max_words + 1):
+        for i in range(max(0, len(tail) - length + 1), len(tail)):
+            if i + length <= len(joined):
+                ngram_counts[length][tuple(joined[i:i + length])] += 1
+
+def merge_shards(partials, min_words=3, min_repeats=5, max_words=7):
+    """
+    Merge shard statistics into an analyze_text result dict.
+
+    Shards must be given in plan_shards order. Sequences never cross file
+    boundaries, only shard boundaries within the same file.
+
+    Args:
+        partials (iterable): analyze_shard results in shard order
+
+    Returns:
+        dict: Combined analysis results
+    """
+    chars_with_spaces = 0
+    chars_without_spaces = 0
+    word_frequency = Counter()
+    ngram_counts = defaultdict(Counter)
+    current_file = None
+    tail = []
+
+    for partial in partials:
+        if partial['file_path'] != current_file:
+            current_file = partial['file_path']
+            tail = []
+
+        chars_with_spaces += partial['chars_with_spaces']
+        chars_without_spaces += partial['chars_without_spaces']
+        word_frequency.update(partial['word_frequency'])
+
+        # Boundary sequences start before every sequence counted inside the
+        # shard, so merging them first keeps first-occurrence order.
+        count_boundary_ngrams(tail, partial['head'], ngram_counts, min_words, max_words)
+        for length, counts in partial['ngram_counts'].items():
+            ngram_counts[length].update(counts)
+        tail = (tail + partial['tail'])[-(max_words - 1):] if max_words > 1 else []
+
+    total_words = sum(word_frequency.values())
+    saturated = max(min_repeats, 1)
+    repeated_sequences = {}
+    for length in range(min_words, min(max_words + 1, total_words)):
+        for gram, count in ngram_counts[length].items():
+            if count >= saturated:
+                repeated_sequences[' '.join(gram)] = saturated
+
+    return {
+        'chars_with_spaces': chars_with_spaces,
+        'chars_without_spaces': chars_without_spaces,
+        'total_words': total_words,
+        'unique_words': len(word_frequency),
+        'single_occurrence': sum(1 for count in word_frequency.values() if count == 1),
+        'repeated_sequences': repeated_sequences
+    }
+
+def analyze_corpus(path, workers=None, shard_size=DEFAULT_SHARD_SIZE):
+    """
+    Analyze a file or a directory of .txt files on several processes.
+
+    Args:
+        path (str): A single file or a directory of .txt files
+        workers (int, optional): Number of processes. Defaults to the CPU count.
+        shard_size (int): Approximate shard size in bytes
+
+    Returns:
+        dict: Analysis results in the analyze_text format, or None on errors
+    """
+    try:
+        shards = plan_shards(collect_files(path), shard_size)
+        if workers == 1:
+            partials = map(analyze_shard, shards)
+            return merge_shards(partials)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return merge_shards(executor.map(analyze_shard, shards))
+    except FileNotFoundError:
+        print(f"Error: File '{path}' not found")
+        return None
+    except Exception as e:
+        print(f"Error reading file: {e}")
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a text corpus on several processes")
+    parser.add_argument('path', nargs='?', default='book.txt',
+                        help="Text file or directory of .txt files")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument('--shard-size', type=float, default=DEFAULT_SHARD_SIZE / 2**20,
+                        help="Approximate shard size in MB")
+    args = parser.parse_args()
+
+    results = analyze_corpus(args.path, args.workers, int(args.shard_size * 2**20))
+    if results:
+        print_results(results)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,24 @@
-def find_sequences(text, min_words=3, min_repeats=5, max_words=7):
+import io
+import mmap
+import os
+import tempfile
+from array import array
+from bisect import bisect_right
+from collections import Counter, defaultdict, deque
+from itertools import compress
+
+import numpy_backend
+from heavy_hitters import SpaceSaving
+from mmap_tokenizer import MmapTokenizer
+from ngram_index import NgramIndex
+
+
+def find_sequences_naive(text, min_words=3, min_repeats=5, max_words=7):
     """
-    Find repeated sequences of words in text with memory optimization.
+    Find repeated sequences of words in text by rescanning the word list.
+
+    Reference implementation kept for benchmarking: every candidate
+    sequence is compared against every window, which is O(N^2 * L).
 
     Args:
         text (str): Input text to analyze
@@ -35,8 +53,545 @@ def find_sequences(text, min_words=3, min_repeats=5, max_words=7):
 
     return {seq: count for seq, count in sequences.items() if count > 0}
 
-def analyze_text(file_path):
+def intern_words(words):
+    """
+    Map every word to a small integer ID.
+
+    Args:
+        words (list): Sequence of words
+
+    Returns:
+        tuple: (list of word IDs, list of words indexed by ID)
+    """
+    vocabulary = {}
+    word_ids = [vocabulary.setdefault(word, len(vocabulary)) for word in words]
+    return word_ids, list(vocabulary)
+
+def count_sequences(word_ids, min_words=3, min_repeats=5, max_words=7):
+    """
+    Count every sequence of word IDs repeated at least min_repeats times.
+
+    Sequences are grown one word at a time: the sequence starting at
+    position i with length L + 1 gets a new integer ID interned from the
+    ID of its first L words and the next word ID. A sequence can only repeat
+    min_repeats times if its first L words do, so every level only extends
+    the start positions that survived the previous one.
+
+    Args:
+        word_ids (list): Word IDs as returned by intern_words
+        min_words (int): Minimum words in sequence
+        min_repeats (int): Minimum repetitions required
+        max_words (int): Maximum words in sequence
+
+    Returns:
+        dict: Tuples of word IDs and their exact counts, ordered by length
+              and then by first occurrence
+    """
+    total_words = len(word_ids)
+    vocabulary_size = max(word_ids, default=0) + 1
+    found = {}
+    starts = list(range(total_words))
+    gram_ids = list(word_ids)
+
+    for length in range(1, min(max_words + 1, total_words)):
+        if length > 1:
+            starts = starts[:bisect_right(starts, total_words - length)]
+            extended = {}
+            gram_ids = [extended.setdefault(gram_id * vocabulary_size + word_ids[i + length - 1],
+                                            len(extended))
+                        for i, gram_id in zip(starts, gram_ids)]
+
+        counts = Counter(gram_ids)
+        frequent = [counts[gram_id] >= min_repeats for gram_id in gram_ids]
+        starts = list(compress(starts, frequent))
+        gram_ids = list(compress(gram_ids, frequent))
+        if not starts:
+            break
+
+        if length >= min_words:
+            first_seen = {}
+            for i, gram_id in zip(starts, gram_ids):
+                first_seen.setdefault(gram_id, i)
+            for gram_id, i in first_seen.items():
+                found[tuple(word_ids[i:i + length])] = counts[gram_id]
+
+    return found
+
+def find_sequences(text, min_words=3, min_repeats=5, max_words=7):
+    """
+    Find repeated sequences of words in text.
+
+    Uses interned word IDs and level-wise pruning (see count_sequences),
+    which runs in near-linear time. Results match find_sequences_naive,
+    including its saturated counts: every reported sequence maps to
+    min_repeats, not to its total number of occurrences.
+
+    Args:
+        text (str): Input text to analyze
+        min_words (int): Minimum words in sequence
+        min_repeats (int): Minimum repetitions required
+        max_words (int): Maximum words in sequence to limit memory usage
+
+    Returns:
+        dict: Sequences and their counts
+    """
+    word_ids, vocabulary = intern_words(text.lower().split())
+    saturated = max(min_repeats, 1)
+    sequences = count_sequences(word_ids, min_words, saturated, max_words)
+    return {' '.join(vocabulary[i] for i in gram): saturated for gram in sequences}
+
+PUNCTUATION = '.,!?:;()[]{}«»—-"\''
+DEFAULT_SUMMARY_CAPACITY = 100_000
+# Sequences reported by analyze_text: MIN_WORDS..MAX_WORDS words repeated at
+# least MIN_REPEATS times. Every mode reports them saturated at MIN_REPEATS.
+MIN_WORDS = 3
+MIN_REPEATS = 5
+MAX_WORDS = 7
+TOKENIZERS = ('text', 'mmap')
+BACKENDS = ('python', 'numpy')
+# Word positions handled at once by count_spilled_sequences
+SPILL_CHUNK_SIZE = 2**16
+
+def count_chars(lines, stats):
+    """
+    Yield lines unchanged, accumulating character counts into stats.
+
+    Args:
+        lines (iterable): Lines of text
+        stats (dict): Receives 'chars_with_spaces' and 'chars_without_spaces'
+    """
+    for line in lines:
+        stats['chars_with_spaces'] += len(line)
+        stats['chars_without_spaces'] += len(line.strip())
+        yield line
+
+def read_lines(file_path, stats):
+    """
+    Yield lines of a text file, accumulating character counts into stats.
+
+    Args:
+        file_path (str): Path to the text file
+        stats (dict): Receives 'chars_with_spaces' and 'chars_without_spaces'
+    """
+    with open(file_path, 'r', encoding='utf-8') as file:
+        yield from count_chars(file, stats)
+
+def tokenize(lines):
+    """Yield lowercased whitespace-separated tokens from lines."""
+    for line in lines:
+        yield from line.lower().split()
+
+def normalize(tokens):
+    """Yield tokens with surrounding punctuation stripped, skipping empty ones."""
+    for token in tokens:
+        word = token.strip(PUNCTUATION)
+        if word:
+            yield word
+
+def count_words(words, word_frequency):
+    """Yield words unchanged while counting them into word_frequency."""
+    for word in words:
+        word_frequency[word] = word_frequency.get(word, 0) + 1
+        yield word
+
+def iter_ngrams(words, vocabulary, window, min_words=3):
+    """
+    Yield every sequence of at least min_words word IDs ending at each word.
+
+    Args:
+        words (iterable): Stream of normalized words
+        vocabulary (dict): Word to ID mapping, extended in place
+        window (deque): Preceding word IDs; its maxlen caps the sequence
+            length and it is left holding the last word IDs of the stream
+        min_words (int): Minimum words in sequence
+    """
+    for word in words:
+        window.append(vocabulary.setdefault(word, len(vocabulary)))
+        gram = tuple(window)
+        for length in range(min_words, len(gram) + 1):
+            yield gram[-length:]
+
+def count_ngrams(words, vocabulary, ngram_counts, min_words=3, max_words=7, window=None):
+    """
+    Count every min_words..max_words sequence in a stream of words.
+
+    Only the last max_words word IDs are kept in memory; sequences are
+    counted into one Counter per length, keyed by tuples of word IDs.
+
+    Args:
+        words (iterable): Stream of normalized words
+        vocabulary (dict): Word to ID mapping, extended in place
+        ngram_counts (dict): Length to Counter mapping, extended in place
+        min_words (int): Minimum words in sequence
+        max_words (int): Maximum words in sequence
+        window (iterable, optional): Word IDs preceding the stream, so that
+            counting can continue where an earlier call stopped
+
+    Returns:
+        deque: The last max_words word IDs
+    """
+    window = deque(window or (), maxlen=max_words)
+    for gram in iter_ngrams(words, vocabulary, window, min_words):
+        ngram_counts[len(gram)][gram] += 1
+    return window
+
+def write_word_ids(words, vocabulary, file, chunk_size=SPILL_CHUNK_SIZE):
+    """
+    Intern a stream of words and write their IDs to a binary file.
+
+    IDs are written as native unsigned ints (array typecode 'I'), chunk_size
+    at a time, so only one chunk is held in memory.
+
+    Args:
+        words (iterable): Stream of normalized words
+        vocabulary (dict): Word to ID mapping, extended in place
+        file: Binary file opened for writing
+
+    Returns:
+        int: Number of words written
+    """
+    total_words = 0
+    chunk = array('I')
+    for word in words:
+        chunk.append(vocabulary.setdefault(word, len(vocabulary)))
+        if len(chunk) == chunk_size:
+            chunk.tofile(file)
+            total_words += chunk_size
+            chunk = array('I')
+    chunk.tofile(file)
+    return total_words + len(chunk)
+
+def _write_pairs(file, starts, gram_ids):
+    pairs = starts * 2
+    pairs[0::2] = starts
+    pairs[1::2] = gram_ids
+    pairs.tofile(file)
+
+def _read_pairs(path, chunk_size):
+    with open(path, 'rb') as file:
+        while True:
+            pairs = array('I')
+            try:
+                pairs.fromfile(file, 2 * chunk_size)
+            except EOFError:  # Last chunk; the items that were there are read
+                pass
+            if not pairs:
+                return
+            yield pairs[0::2], pairs[1::2]
+
+def count_spilled_sequences(id_path, min_words=3, min_repeats=5, max_words=7,
+                            vocabulary_size=None, chunk_size=SPILL_CHUNK_SIZE):
+    """
+    Version of count_sequences for word IDs in a file written by write_word_ids.
+
+    The word IDs are read through a memory map. Every level runs over
+    (start position, sequence ID) pairs that are spilled to temporary files
+    next to id_path and read back chunk_size pairs at a time: one pass
+    interns and counts the sequences, a second one keeps the pairs whose
+    sequence is repeated min_repeats times. Memory thus depends on the
+    number of distinct sequences counted at a level, not on the number of
+    words.
+
+    Args:
+        id_path (str): File of word IDs
+        min_words (int): Minimum words in sequence
+        min_repeats (int): Minimum repetitions required
+        max_words (int): Maximum words in sequence
+        vocabulary_size (int, optional): Upper bound of the word IDs; the
+            file is scanned for it if not given
+        chunk_size (int): Pairs handled at once
+
+    Returns:
+        dict: Tuples of word IDs and their exact counts, ordered by length
+              and then by first occurrence
+    """
+    found = {}
+    if os.path.getsize(id_path) == 0:
+        return found
+
+    candidate_path = f"{id_path}.candidates"
+    survivor_path = f"{id_path}.survivors"
+    with open(id_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        word_ids = memoryview(buffer).cast('I')
+        try:
+            total_words = len(word_ids)
+            if vocabulary_size is None:
+                vocabulary_size = max(max(word_ids[start:start + chunk_size])
+                                      for start in range(0, total_words, chunk_size)) + 1
+
+            for length in range(1, min(max_words + 1, total_words)):
+                counts = Counter()
+                with open(candidate_path, 'wb') as candidates:
+                    if length == 1:
+                        for start in range(0, total_words, chunk_size):
+                            gram_ids = array('I')
+                            gram_ids.frombytes(word_ids[start:start + chunk_size].cast('B'))
+                            counts.update(gram_ids)
+                            _write_pairs(candidates, array('I', range(start, start + len(gram_ids))),
+                                         gram_ids)
+                    else:
+                        extended = {}
+                        last_start = total_words - length
+                        for starts, gram_ids in _read_pairs(survivor_path, chunk_size):
+                            if starts[-1] > last_start:
+                                keep = bisect_right(starts, last_start)
+                                starts, gram_ids = starts[:keep], gram_ids[:keep]
+                            gram_ids = array('I', [extended.setdefault(
+                                gram_id * vocabulary_size + word_ids[i + length - 1], len(extended))
+                                for i, gram_id in zip(starts, gram_ids)])
+                            counts.update(gram_ids)
+                            _write_pairs(candidates, starts, gram_ids)
+                        del extended
+
+                first_seen = {}
+                survivors = 0
+                with open(survivor_path, 'wb') as kept:
+                    for starts, gram_ids in _read_pairs(candidate_path, chunk_size):
+                        frequent = [counts[gram_id] >= min_repeats for gram_id in gram_ids]
+                        starts = array('I', compress(starts, frequent))
+                        gram_ids = array('I', compress(gram_ids, frequent))
+                        if length >= min_words:
+                            for i, gram_id in zip(starts, gram_ids):
+                                first_seen.setdefault(gram_id, i)
+                        survivors += len(starts)
+                        _write_pairs(kept, starts, gram_ids)
+                if not survivors:
+                    break
+
+                for gram_id, i in first_seen.items():
+                    found[tuple(word_ids[i:i + length])] = counts[gram_id]
+        finally:
+            word_ids.release()
+            for path in (candidate_path, survivor_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    return found
+
+def _analyze_stream(file_path):
+    stats = {'chars_with_spaces': 0, 'chars_without_spaces': 0}
+    word_frequency = {}
+    vocabulary = {}
+
+    words = count_words(normalize(tokenize(read_lines(file_path, stats))), word_frequency)
+    with tempfile.TemporaryDirectory() as spill_dir:
+        id_path = os.path.join(spill_dir, 'word_ids')
+        with open(id_path, 'wb') as file:
+            total_words = write_word_ids(words, vocabulary, file)
+        sequences = count_spilled_sequences(id_path, MIN_WORDS, MIN_REPEATS, MAX_WORDS,
+                                            len(vocabulary))
+
+    words_by_id = list(vocabulary)
+    return {
+        'chars_with_spaces': stats['chars_with_spaces'],
+        'chars_without_spaces': stats['chars_without_spaces'],
+        'total_words': total_words,
+        'unique_words': len(word_frequency),
+        'single_occurrence': sum(1 for count in word_frequency.values() if count == 1),
+        'repeated_sequences': {' '.join(words_by_id[i] for i in gram): MIN_REPEATS
+                               for gram in sequences}
+    }
+
+def _analyze_top_k(file_path, top_k, capacity=None):
+    stats = {'chars_with_spaces': 0, 'chars_without_spaces': 0}
+    word_frequency = {}
+    vocabulary = {}
+    summary = SpaceSaving(capacity or DEFAULT_SUMMARY_CAPACITY)
+
+    words = count_words(normalize(tokenize(read_lines(file_path, stats))), word_frequency)
+    for gram in iter_ngrams(words, vocabulary, deque(maxlen=MAX_WORDS), MIN_WORDS):
+        summary.offer(gram)
+
+    words_by_id = list(vocabulary)
+    total_words = sum(word_frequency.values())
+    return {
+        'chars_with_spaces': stats['chars_with_spaces'],
+        'chars_without_spaces': stats['chars_without_spaces'],
+        'total_words': total_words,
+        'unique_words': len(word_frequency),
+        'single_occurrence': sum(1 for count in word_frequency.values() if count == 1),
+        'repeated_sequences': {' '.join(words_by_id[i] for i in gram): count
+                               for gram, count, _ in summary.top(top_k)
+                               if count >= MIN_REPEATS and len(gram) < total_words},
+        'sequence_error_bound': summary.error_bound
+    }
+
+def _analyze_numpy(file_path):
+    tokenizer = MmapTokenizer(PUNCTUATION)
+    word_ids = numpy_backend.as_word_array(tokenizer.word_ids(file_path))
+    statistics = numpy_backend.word_statistics(word_ids)
+    words_by_id = list(tokenizer.vocabulary)
+    sequences = numpy_backend.count_sequences(word_ids, MIN_WORDS, MIN_REPEATS, MAX_WORDS)
+
+    return {
+        'chars_with_spaces': tokenizer.chars_with_spaces,
+        'chars_without_spaces': tokenizer.chars_without_spaces,
+        'total_words': statistics['total_words'],
+        'unique_words': statistics['unique_words'],
+        'single_occurrence': statistics['single_occurrence'],
+        'repeated_sequences': {' '.join(words_by_id[i] for i in gram): MIN_REPEATS
+                               for gram in sequences}
+    }
+
+def _analyze_mmap(file_path):
+    tokenizer = MmapTokenizer(PUNCTUATION)
+    word_ids = tokenizer.word_ids(file_path)
+    word_frequency = Counter(word_ids)
+    words_by_id = list(tokenizer.vocabulary)
+    sequences = count_sequences(word_ids, MIN_WORDS, MIN_REPEATS, MAX_WORDS)
+
+    return {
+        'chars_with_spaces': tokenizer.chars_with_spaces,
+        'chars_without_spaces': tokenizer.chars_without_spaces,
+        'total_words': len(word_ids),
+        'unique_words': len(word_frequency),
+        'single_occurrence': sum(1 for count in word_frequency.values() if count == 1),
+        'repeated_sequences': {' '.join(words_by_id[i] for i in gram): MIN_REPEATS
+                               for gram in sequences}
+    }
+
+def _count_into_index(index, lines):
+    stats = {'chars_with_spaces': 0, 'chars_without_spaces': 0}
+    words = list(count_words(normalize(tokenize(count_chars(lines, stats))), index.word_frequency))
+    index.chars_with_spaces += stats['chars_with_spaces']
+    index.chars_without_spaces += stats['chars_without_spaces']
+    vocabulary = index.vocabulary
+
+    if len(words) >= len(index.word_ids):
+        # Starting out, or the text more than doubled: counting from scratch is cheaper
+        index.append(vocabulary.setdefault(word, len(vocabulary)) for word in words)
+        index.frequent = set(count_sequences(index.word_ids.tolist(), index.min_words,
+                                             index.min_repeats, index.max_words))
+        return
+
+    # Only sequences ending in the new words change their counts
+    ngram_counts = defaultdict(Counter)
+    count_ngrams(words, vocabulary, ngram_counts, index.min_words, index.max_words,
+                 index.word_ids[max(len(index.word_ids) - index.max_words + 1, 0):])
+    frequent = index.frequent
+    rare_words = {vocabulary[word] for word, count in index.word_frequency.items()
+                  if count < index.min_repeats}
+    for length in range(index.min_words, index.max_words + 1):
+        for gram, count in ngram_counts[length].items():
+            if gram in frequent:
+                continue
+            # gram can only be repeated if its words, or both sequences one word shorter, are
+            if length == index.min_words:
+                if not rare_words.isdisjoint(gram):
+                    continue
+            elif gram[:-1] not in frequent or gram[1:] not in frequent:
+                continue
+            if count + index.count(gram) >= index.min_repeats:
+                frequent.add(gram)
+    index.append(vocabulary[word] for word in words)
+
+def _analyze_indexed(file_path, index_path):
+    index = NgramIndex.load(index_path, file_path, MIN_WORDS, MIN_REPEATS, MAX_WORDS)
+    _count_into_index(index, index.appended_lines(file_path))
+    index.save(index_path)
+    # An unfinished last line counts towards this report but is not committed
+    _count_into_index(index, io.StringIO(index.pending, newline=None))
+
+    word_frequency = index.word_frequency
+    total_words = len(index.word_ids)
+    words_by_id = list(index.vocabulary)
+    return {
+        'chars_with_spaces': index.chars_with_spaces,
+        'chars_without_spaces': index.chars_without_spaces,
+        'total_words': total_words,
+        'unique_words': len(word_frequency),
+        'single_occurrence': sum(1 for count in word_frequency.values() if count == 1),
+        'repeated_sequences': {' '.join(words_by_id[i] for i in gram): MIN_REPEATS
+                               for gram in index.frequent if len(gram) < total_words}
+    }
+
+def _check_options(streaming=False, tokenizer=None, index_path=None, top_k=None,
+                   capacity=None, backend='python'):
+    """
+    Reject unknown values and combinations of analyze_text options.
+
+    streaming, index_path, top_k and backend='numpy' each select their own
+    way of reading the file, so at most one of them can be given.
+    tokenizer='mmap' only applies to the default mode and the numpy
+    backend, which always tokenizes with MmapTokenizer.
+
+    Raises:
+        ValueError: If an option is unknown or cannot be combined with another
+    """
+    if tokenizer is not None and tokenizer not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer {tokenizer!r}, expected one of {TOKENIZERS}")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    if top_k is not None and top_k < 1:
+        raise ValueError(f"top_k must be positive, got {top_k}")
+    if capacity is not None and top_k is None:
+        raise ValueError("capacity only applies together with top_k")
+
+    modes = [name for name, selected in (('streaming', streaming),
+                                          ('index_path', index_path is not None),
+                                          ('top_k', top_k is not None),
+                                          ("backend='numpy'", backend == 'numpy'))
+             if selected]
+    if len(modes) > 1:
+        raise ValueError(f"{' and '.join(modes)} cannot be combined")
+    if backend == 'numpy' and tokenizer == 'text':
+        raise ValueError("backend='numpy' always uses tokenizer='mmap'")
+    if tokenizer == 'mmap' and modes and backend != 'numpy':
+        raise ValueError(f"tokenizer='mmap' cannot be combined with {modes[0]}")
+
+def analyze_text(file_path, streaming=False, tokenizer=None, index_path=None,
+                 top_k=None, capacity=None, backend='python'):
+    """
+    Collect character, word and repeated-sequence statistics for a text file.
+
+    Args:
+        file_path (str): Path to the text file
+        streaming (bool): Consume the file line by line through a generator
+            pipeline and spill the word IDs to a temporary file instead of
+            keeping every word in memory; repeated sequences are then counted
+            level by level over the spilled IDs (count_spilled_sequences).
+            Memory depends on the number of distinct words and of sequences
+            counted at one level, not on the size of the file.
+        tokenizer (str, optional): 'text' (the default) decodes and splits
+            the file line by line; 'mmap' scans the memory-mapped UTF-8 bytes
+            with MmapTokenizer.
+        index_path (str, optional): Keep word statistics and repeated
+            sequences in an NgramIndex at this path. Later calls only count
+            text appended to the file since the previous call; a file that
+            was edited otherwise is indexed again.
+        top_k (int, optional): Stream the file and report only the top_k
+            most frequent sequences, tracked with a fixed-size SpaceSaving
+            summary. Their counts are estimates that may be too high by at
+            most the 'sequence_error_bound' added to the result.
+        capacity (int, optional): Number of sequences the summary keeps.
+            Defaults to DEFAULT_SUMMARY_CAPACITY.
+        backend (str): 'python', or 'numpy' to tokenize with MmapTokenizer
+            and compute word and sequence statistics with numpy_backend.
+
+    Raises:
+        ValueError: If an option is unknown, or options selecting different
+            modes are combined
+        ImportError: If backend is 'numpy' and NumPy is not installed
+
+    Returns:
+        dict: Analysis results, or None if the file could not be read
+    """
+    _check_options(streaming, tokenizer, index_path, top_k, capacity, backend)
+    if backend == 'numpy':
+        numpy_backend.require_numpy()
+
     try:
+        if backend == 'numpy':
+            return _analyze_numpy(file_path)
+        if top_k is not None:
+            return _analyze_top_k(file_path, top_k, capacity)
+        if index_path is not None:
+            return _analyze_indexed(file_path, index_path)
+        if streaming:
+            return _analyze_stream(file_path)
+        if tokenizer == 'mmap':
+            return _analyze_mmap(file_path)
+
         chars_with_spaces = 0
         chars_without_spaces = 0
         words = []
@@ -46,7 +601,7 @@ def analyze_text(file_path):
                 chars_with_spaces += len(line)
                 chars_without_spaces += len(line.strip())
 
-                line_words = [word.strip('.,!?:;()[]{}«»—-"\'') 
+                line_words = [word.strip(PUNCTUATION) 
                             for word in line.lower().split()]
                 words.extend([w for w in line_words if w])
 
@@ -55,7 +610,7 @@ def analyze_text(file_path):
             word_frequency[word] = word_frequency.get(word, 0) + 1
 
         text = ' '.join(words)
-        repeated_sequences = find_sequences(text, max_words=7)
+        repeated_sequences = find_sequences(text, MIN_WORDS, MIN_REPEATS, MAX_WORDS)
         
         return {
             'chars_with_spaces': chars_with_spaces,
@@ -73,33 +628,40 @@ def analyze_text(file_path):
         print(f"Error reading file: {e}")
         return None
 
+def print_results(results):
+    """Print an analyze_text result dict with the top 20 repeated sequences."""
+    print("Text Analysis Results:")
+    print("-" * 50)
+    print(f"Characters (with spaces): {results['chars_with_spaces']}")
+    print(f"Characters (without spaces): {results['chars_without_spaces']}")
+    print(f"Total words: {results['total_words']}")
+    print(f"Unique words: {results['unique_words']}")
+    print(f"Words occurring once: {results['single_occurrence']}")
+    
+    print("\nRepeated sequences (>3 words, >5 times):")
+    print("-" * 50)
+    
+    if results.get('sequence_error_bound'):
+        print(f"Counts are estimates, at most {results['sequence_error_bound']} too high")
+
+    sequences = results['repeated_sequences']
+    if sequences:
+        # Show only top 20 most frequent sequences
+        sorted_sequences = sorted(sequences.items(),
+                               key=lambda x: (-x[1], x[0]))[:20]
+        for sequence, count in sorted_sequences:
+            print(f"Occurrences: {count}")
+            print(f"Sequence: {sequence}")
+            print("-" * 30)
+    else:
+        print("No sequences matching the criteria found")
+
 def main():
     file_path = 'book.txt'
     
-    results = analyze_text(file_path)
+    results = analyze_text(file_path, index_path=f"{file_path}.idx")
     if results:
-        print("Text Analysis Results:")
-        print("-" * 50)
-        print(f"Characters (with spaces): {results['chars_with_spaces']}")
-        print(f"Characters (without spaces): {results['chars_without_spaces']}")
-        print(f"Total words: {results['total_words']}")
-        print(f"Unique words: {results['unique_words']}")
-        print(f"Words occurring once: {results['single_occurrence']}")
-        
-        print("\nRepeated sequences (>3 words, >5 times):")
-        print("-" * 50)
-        
-        sequences = results['repeated_sequences']
-        if sequences:
-            # Show only top 20 most frequent sequences
-            sorted_sequences = sorted(sequences.items(),
-                                   key=lambda x: (-x[1], x[0]))[:20]
-            for sequence, count in sorted_sequences:
-                print(f"Occurrences: {count}")
-                print(f"Sequence: {sequence}")
-                print("-" * 30)
-        else:
-            print("No sequences matching the criteria found")
+        print_results(results)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file